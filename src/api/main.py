@@ -1,17 +1,37 @@
 """FastAPI application main file."""
 
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from src.api.routes.generator import router as generator_router
 from src.api.routes.chatbot import router as chatbot_router
 from src.api.routes.player_search import router as player_search_router
+from src.api.routes.predictions import router as predictions_router
+from src.api.routes.squads import router as squads_router
+from src.llm.clients.cascade import cascade_stats
+from src.llm.clients.http_pool import get_client_registry
+from src.llm.clients.response_cache import get_response_cache
+from src.utils.metrics import HTTP_DURATION, render
+from src.utils.request_context import REQUEST_ID, new_request_id
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Close the shared LLM connection pool
+    await get_client_registry().aclose()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Player Report Generation API",
     description="API for generating comprehensive soccer player analysis reports",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware for frontend integration
@@ -21,16 +41,63 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Session-ID", "X-User-ID"],  # Expose custom headers
+    expose_headers=["X-Session-ID", "X-User-ID", "X-Request-ID"],  # Expose custom headers
 )
 
+
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    """Tag the request with an id (echoed as X-Request-ID, stamped on logs) and time it."""
+    request_id = request.headers.get("x-request-id") or new_request_id()
+    token = REQUEST_ID.set(request_id)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        REQUEST_ID.reset(token)
+    route = request.scope.get("route")
+    HTTP_DURATION.observe(
+        time.perf_counter() - start,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=str(response.status_code),
+    )
+    response.headers["X-Request-ID"] = request_id
+    return response
+
 # Include routers
 app.include_router(generator_router)
 app.include_router(chatbot_router)
 app.include_router(player_search_router)
+app.include_router(predictions_router)
+app.include_router(squads_router)
 
 @app.get("/health")
 async def health():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+
+@app.get("/health/llm-pool")
+async def llm_pool_stats():
+    """Shared LLM HTTP pool: open/idle connections and per-model in-flight requests."""
+    return get_client_registry().stats()
+
+
+@app.get("/health/llm-cache")
+async def llm_cache_stats():
+    """LLM response cache hits (memory / SQLite) and misses per model."""
+    cache = get_response_cache()
+    return {"enabled": False} if cache is None else {"enabled": True, **cache.stats()}
+
+
+@app.get("/health/llm-cascade")
+async def llm_cascade_stats():
+    """Model cascade attempts, outcomes and success rate per agent and tier."""
+    return cascade_stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics: per-agent LLM requests, tokens, latency and TTFT; API latency."""
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
@@ -1,8 +1,10 @@
 """Route handler for report generation."""
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any, Optional
 from pydantic import BaseModel, Field
+import json
 import logging
 
 from src.llm.orchestrators.report_orchestrator import ReportOrchestrator
@@ -90,3 +92,48 @@ async def generate_report(request: GenerateReportRequest):
             message=f"Failed to generate report: {str(e)}"
         )
 
+
+
+def _sse(event: str, data: Any) -> str:
+    """One Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/generate/stream")
+async def generate_report_stream(request: GenerateReportRequest):
+    """Generate a player report, streaming sections as Server-Sent Events.
+    
+    Takes the same request body as `/generate`. Events:
+    - `stage`: `{"stage": "analysis" | "news_analysis" | "report"}` as each step starts
+    - `section`: `{"path": "report.executive_summary", "value": ...}` as soon as a report
+      field (or a top-level field such as `player_info` or `news`) is complete
+    - `reset`: a cheaper model's report was rejected; discard the sections received so
+      far, they are streamed again
+    - `report`: the complete report (authoritative; same as `/generate` returns)
+    - `error`: `{"message": ...}` if generation failed
+    """
+    try:
+        logger.info(f"Streaming report for player: {request.player_name or 'unknown'}")
+        events = orchestrator.stream_player_report(
+            player_data=request.player_data,
+            player_name=request.player_name,
+            club=request.club
+        )
+    except ValueError as e:
+        logger.error(f"Validation error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def stream_events():
+        try:
+            async for event, data in events:
+                yield _sse(event, data)
+            logger.info("Report streamed successfully")
+        except Exception as e:
+            logger.error(f"Error streaming report: {e}", exc_info=True)
+            yield _sse("error", {"message": f"Failed to generate report: {str(e)}"})
+    
+    return StreamingResponse(
+        stream_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -2,6 +2,8 @@
 
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import pandas as pd
 import numpy as np
 import json
@@ -13,8 +15,17 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
 
 from src.json_generator.build_player_json import (
     load_all_data,
-    build_player_massive_json
+    build_form_section,
+    build_percentile_section,
+    build_player_massive_json,
+    build_mlr_section,
+    build_shap_section,
+    build_time_series_section
 )
+from src.json_generator.compare_players import SECTIONS, collect_player, combine, flatten_shap
+from src.api.routes.predictions import get_shap_batcher
+from src.models.feature_store import get_feature_store
+from src.models.percentiles import get_percentile_tables
 
 router = APIRouter(prefix="/api/players", tags=["players"])
 
@@ -30,6 +41,10 @@ _mlr_df = None
 _players_df = None
 _available_player_ids = None
 
+# Per-player comparison sections are assembled in parallel
+MAX_COMPARE = 10
+_compare_pool = ThreadPoolExecutor(max_workers=MAX_COMPARE, thread_name_prefix="compare")
+
 
 def get_players_search_df():
     """Load and cache the players.csv for searching."""
@@ -133,6 +148,120 @@ def clean_json_data(obj):
         return obj
 
 
+async def build_on_demand_player_json(row: pd.Series, shap_df: pd.DataFrame,
+                                      scores_df: pd.DataFrame, mlr_df: pd.DataFrame):
+    """
+    Player JSON for a player outside players_intersection_321.jsonl.
+
+    basic_info comes from players.csv. SHAP and MLR come from the precomputed
+    explanations when the player has a transfer there, otherwise shap_summary
+    is computed from the live XGBoost model (on-demand TreeSHAP). Returns None
+    if neither is available.
+    """
+    player_id = int(row['player_id'])
+    shap_summary = build_shap_section(player_id, shap_df)
+    if shap_summary is None:
+        try:
+            shap_summary = await get_shap_batcher().submit((player_id, None))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    basic_info = {
+        "player_id": player_id,
+        "name": row.get('name'),
+        "date_of_birth": str(row.get('date_of_birth', '')),
+        "nationality": row.get('country_of_citizenship'),
+        "primary_position": row.get('position'),
+        "secondary_position": row.get('sub_position'),
+        "preferred_foot": row.get('foot'),
+        "height_cm": row.get('height_in_cm'),
+        "current_club_id": row.get('current_club_id'),
+        "current_club_name": row.get('current_club_name'),
+        "current_club_league_id": row.get('current_club_domestic_competition_id'),
+        "market_value_eur_latest": row.get('market_value_in_eur'),
+        "highest_market_value_eur": row.get('highest_market_value_in_eur'),
+        "contract_expiration_date": row.get('contract_expiration_date'),
+    }
+    return {
+        "player_id": player_id,
+        "name": row.get('name'),
+        "basic_info": basic_info,
+        "shap_summary": shap_summary,
+        "mlr_coefficients": build_mlr_section(player_id, mlr_df),
+        "performance_time_series": build_time_series_section(player_id, scores_df),
+        "current_form": build_form_section(player_id, get_feature_store()),
+        "position_percentiles": build_percentile_section(player_id, get_percentile_tables()),
+    }
+
+
+@router.get("/compare")
+async def compare_players(
+    ids: str = Query(..., description="Comma-separated player IDs, e.g. 8198,28003,68290"),
+    sections: Optional[str] = Query(
+        None, description=f"Comma-separated subset of {', '.join(SECTIONS)} (default: all)"
+    ),
+    freq: str = Query("MS", description="Date grid for the series (pandas frequency: MS, QS, W, ...)"),
+):
+    """
+    Compare players side by side.
+
+    Each section is a table {metric: [value per player]} in the order of ids,
+    and performance series are resampled onto one shared date grid. Sections
+    are assembled for all players concurrently.
+    """
+    try:
+        player_ids = list(dict.fromkeys(int(x) for x in ids.split(",") if x.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if not 2 <= len(player_ids) <= MAX_COMPARE:
+        raise HTTPException(status_code=400, detail=f"Compare between 2 and {MAX_COMPARE} players")
+
+    wanted = SECTIONS if sections is None else [x.strip() for x in sections.split(",") if x.strip()]
+    unknown = [x for x in wanted if x not in SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown sections {unknown}; choose from {SECTIONS}")
+    try:
+        pd.tseries.frequencies.to_offset(freq)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid freq '{freq}'")
+
+    search_df = get_players_search_df().set_index('player_id', drop=False)
+    not_found = [pid for pid in player_ids if pid not in search_df.index]
+    player_ids = [pid for pid in player_ids if pid in search_df.index]
+    if len(player_ids) < 2:
+        raise HTTPException(status_code=404, detail=f"Players not found: {not_found}")
+
+    try:
+        shap_df, scores_df, _, _ = get_model_data()
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=500, detail=f"Model data files not found: {str(e)}")
+    feature_store, percentile_tables = get_feature_store(), get_percentile_tables()
+
+    loop = asyncio.get_running_loop()
+    parts = await asyncio.gather(*[
+        loop.run_in_executor(
+            _compare_pool, collect_player, pid, wanted, search_df.loc[pid], scores_df, shap_df,
+            feature_store, percentile_tables,
+        )
+        for pid in player_ids
+    ])
+
+    # Players without precomputed SHAP: explain the live model (batched together)
+    missing_shap = [p for p in parts if "shap" in wanted and p.get("shap") is None]
+    if missing_shap:
+        summaries = await asyncio.gather(
+            *[get_shap_batcher().submit((p["player_id"], None)) for p in missing_shap],
+            return_exceptions=True,
+        )
+        for p, summary in zip(missing_shap, summaries):
+            if isinstance(summary, dict):
+                p["shap"] = flatten_shap(summary)
+
+    result = combine(parts, wanted, freq)
+    result["not_found"] = not_found
+    return clean_json_data(result)
+
+
 @router.get("/generate/{player_id}")
 async def generate_player_json(player_id: int):
     """
@@ -149,16 +278,32 @@ async def generate_player_json(player_id: int):
             search_df = get_players_search_df()
             player_row = search_df[search_df['player_id'] == player_id]
             player_name = player_row.iloc[0]['name'] if not player_row.empty else f"ID {player_id}"
-            
+
+            # Outside the profiled cohort: precomputed explanations, else the live model
+            if not player_row.empty:
+                result = await build_on_demand_player_json(player_row.iloc[0], shap_df, scores_df, mlr_df)
+                if result is not None:
+                    return clean_json_data(result)
+
             raise HTTPException(
                 status_code=404,
-                detail=f"Player '{player_name}' exists in database but doesn't have ML model data available. Only {len(players_df)} players have complete analysis data."
+                detail=(
+                    f"Player '{player_name}' exists in database but doesn't have ML model data available. "
+                    f"Only {len(players_df)} players have complete analysis data. "
+                    f"A live fee estimate is available at /api/predictions/transfer-fee/{player_id}."
+                )
             )
         
         # Build the massive JSON
         result = build_player_massive_json(
-            player_id, shap_df, scores_df, mlr_df, players_df
+            player_id, shap_df, scores_df, mlr_df, players_df,
+            feature_store=get_feature_store(), percentile_tables=get_percentile_tables()
         )
+        if result.get("shap_summary") is None:
+            try:
+                result["shap_summary"] = await get_shap_batcher().submit((player_id, None))
+            except (FileNotFoundError, ValueError):
+                pass
         
         # Clean NaN values to make it JSON-compliant
         cleaned_result = clean_json_data(result)
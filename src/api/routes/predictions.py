@@ -0,0 +1,152 @@
+"""Route handlers for live transfer-fee predictions."""
+
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+from pydantic import BaseModel, Field
+import asyncio
+import logging
+import threading
+
+from src.models.feature_store import get_feature_store
+from src.models.shap_explanations import ShapExplainer
+from src.models.transfer_fee_inference import TransferFeePredictor, load_booster
+from src.utils.micro_batcher import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/predictions", tags=["predictions"])
+
+# Cache the predictor globally (feature tables and booster are loaded once)
+_predictor = None
+_predictor_lock = threading.Lock()
+_batcher = None
+_explainer = None
+_shap_batcher = None
+
+MAX_BATCH_IDS = 1000
+
+
+def get_predictor() -> TransferFeePredictor:
+    """Load and cache the feature tables and the XGBoost booster; attach the current feature store (if built)."""
+    global _predictor
+    if _predictor is None:
+        with _predictor_lock:
+            if _predictor is None:
+                _predictor = TransferFeePredictor.from_data_dir(booster=load_booster())
+    # A rebuilt store replaces the old one on the next request
+    _predictor.store = get_feature_store()
+    return _predictor
+
+
+def get_batcher() -> MicroBatcher:
+    """Batcher that merges concurrent single-player requests into one predict call."""
+    global _batcher
+    if _batcher is None:
+        def predict_batch(items):
+            player_ids = [player_id for player_id, _ in items]
+            to_club_ids = [to_club_id for _, to_club_id in items]
+            return get_predictor().predict(player_ids, to_club_ids)
+
+        _batcher = MicroBatcher(predict_batch, max_batch_size=512, max_wait_ms=2.0)
+    return _batcher
+
+
+def get_explainer() -> ShapExplainer:
+    """On-demand SHAP explainer sharing the predictor's booster and feature tables."""
+    global _explainer
+    if _explainer is None:
+        _explainer = ShapExplainer(get_predictor())
+    return _explainer
+
+
+def get_shap_batcher() -> MicroBatcher:
+    """Batcher that merges concurrent SHAP requests into one TreeSHAP call."""
+    global _shap_batcher
+    if _shap_batcher is None:
+        def explain_batch(items):
+            player_ids = [player_id for player_id, _ in items]
+            to_club_ids = [to_club_id for _, to_club_id in items]
+            return get_explainer().explain(player_ids, to_club_ids)
+
+        _shap_batcher = MicroBatcher(explain_batch, max_batch_size=256, max_wait_ms=5.0)
+    return _shap_batcher
+
+
+class TransferFeeBatchRequest(BaseModel):
+    """Request model for batched transfer-fee predictions."""
+    player_ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_IDS)
+    to_club_id: Optional[int] = Field(
+        None,
+        description="Destination club for every player (default: each player's current club)"
+    )
+
+
+def _unavailable(e: Exception) -> HTTPException:
+    return HTTPException(status_code=503, detail=f"Transfer-fee model unavailable: {str(e)}")
+
+
+async def _load_predictor() -> TransferFeePredictor:
+    """get_predictor() off the event loop (the first call reads the CSVs and the booster)."""
+    try:
+        return await asyncio.to_thread(get_predictor)
+    except (FileNotFoundError, ValueError) as e:
+        raise _unavailable(e)
+
+
+@router.get("/transfer-fee/{player_id}")
+async def predict_transfer_fee(
+    player_id: int,
+    to_club_id: Optional[int] = Query(None, description="Destination club (default: current club)")
+):
+    """
+    Predicted transfer fee for a hypothetical transfer today.
+
+    Concurrent calls are micro-batched into a single model call.
+    """
+    predictor = await _load_predictor()
+
+    if player_id not in predictor:
+        raise HTTPException(status_code=404, detail=f"Player with ID {player_id} not found")
+
+    return await get_batcher().submit((player_id, to_club_id))
+
+
+@router.post("/transfer-fee")
+async def predict_transfer_fees(request: TransferFeeBatchRequest):
+    """Predicted transfer fees for many players in one call."""
+    predictor = await _load_predictor()
+
+    known = [pid for pid in request.player_ids if pid in predictor]
+    not_found = [pid for pid in request.player_ids if pid not in predictor]
+    predictions = []
+    if known:
+        predictions = await asyncio.to_thread(predictor.predict, known, [request.to_club_id] * len(known))
+
+    return {"predictions": predictions, "not_found": not_found}
+
+
+@router.get("/shap/{player_id}")
+async def explain_transfer_fee(
+    player_id: int,
+    to_club_id: Optional[int] = Query(None, description="Destination club (default: current club)")
+):
+    """
+    SHAP summary (top positive / negative features) for a hypothetical transfer today.
+
+    Same layout as the shap_summary section of /api/players/generate.
+    """
+    predictor = await _load_predictor()
+
+    if player_id not in predictor:
+        raise HTTPException(status_code=404, detail=f"Player with ID {player_id} not found")
+
+    return await get_shap_batcher().submit((player_id, to_club_id))
+
+
+@router.get("/stats")
+async def prediction_stats():
+    """Micro-batching and SHAP cache counters."""
+    stats = {"predictions": get_batcher().stats(), "shap": get_shap_batcher().stats()}
+    if _explainer is not None:
+        stats["shap_cache"] = _explainer.cache.stats()
+    return stats
@@ -0,0 +1,35 @@
+"""Route handlers for club and league summaries."""
+
+from fastapi import APIRouter, HTTPException
+import logging
+
+from src.models.squad_aggregates import get_summary
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["squads"])
+
+
+def _lookup(kind: str, key, label: str):
+    try:
+        summary = get_summary(kind, key)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=503,
+            detail="Squad aggregates not built yet; run python -m src.models.squad_aggregates"
+        )
+    if summary is None:
+        raise HTTPException(status_code=404, detail=f"{label} {key} not found")
+    return summary
+
+
+@router.get("/api/clubs/{club_id}/summary")
+async def club_summary(club_id: int):
+    """Squad size, market value, growth, age profile and breakout candidates of a club."""
+    return _lookup("clubs", club_id, "Club")
+
+
+@router.get("/api/leagues/{league_id}/summary")
+async def league_summary(league_id: str):
+    """Same aggregates over every club of a league (competition id, e.g. GB1)."""
+    return _lookup("leagues", league_id, "League")
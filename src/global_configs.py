@@ -3,14 +3,19 @@ from pathlib import Path
 from dotenv import load_dotenv
 import os
 from src.utils.load_utils import load_yaml, load_txt, load_json
+from src.utils.request_context import install_log_record_factory
 
 load_dotenv(override=True)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# Point the LLM clients at another OpenAI-compatible server, e.g. the local stub
+# (python -m src.llm.stub_server) for offline tests and load runs
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
 
-# Set up logging configurations
+# Set up logging configurations (request_id ties together the log lines of one API request)
+install_log_record_factory()
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    format="%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
 )
 
 
@@ -23,6 +28,10 @@ PROMPT_CONFIGS = load_yaml(CONFIG_DIR / "prompt_configs.yaml")
 
 
 OPENAI_MODEL_CONFIGS = MODEL_CONFIGS["OPENAI_MODEL_CONFIGS"]
+HTTP_CLIENT_CONFIGS = MODEL_CONFIGS.get("HTTP_CLIENT_CONFIGS", {})
+RESPONSE_CACHE_CONFIGS = MODEL_CONFIGS.get("RESPONSE_CACHE_CONFIGS", {})
+RATE_LIMIT_CONFIGS = MODEL_CONFIGS.get("RATE_LIMIT_CONFIGS", {})
+TOKEN_BUDGET_CONFIGS = MODEL_CONFIGS.get("TOKEN_BUDGET_CONFIGS", {})
 REPORT_GENERATOR_CONFIGS = OPENAI_MODEL_CONFIGS["report_generator"]
 ANALYSIS_AGENT_CONFIGS = REPORT_GENERATOR_CONFIGS["analysis_agent"]
 NEWS_AGENT_CONFIGS = REPORT_GENERATOR_CONFIGS["news_agent"]
@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 
@@ -12,18 +13,60 @@ MODEL_DATA_DIR = BASE_DIR / "model_data"
 
 SHAP_PATH = MODEL_DATA_DIR / "player_shap_transfer_fee_321.pkl"
 SCORES_PATH = MODEL_DATA_DIR / "player_game_scores_and_values_321.pkl"
+# Full-population series written by src/models/universal_score.py (preferred if present)
+SCORES_PARQUET_PATH = MODEL_DATA_DIR / "player_game_scores_and_values.parquet"
 MLR_PATH = MODEL_DATA_DIR / "mlr_local_explanations_per_transfer_321.pkl"
 JSONL_PATH = MODEL_DATA_DIR / "players_intersection_321.jsonl"
+# Full-population SHAP/MLR written by src/models/precompute_explanations.py (preferred if present)
+EXPLANATIONS_DIR = MODEL_DATA_DIR / "explanations"
+
+# SHAP features kept per player: top N_POS positive and bottom N_NEG negative
+N_POS = 5
+N_NEG = 5
 
 
 # ---------------------------------------------------------
 # 2. Load all data once
 # ---------------------------------------------------------
+def load_precomputed_explanations(kind: str):
+    """
+    Latest transfer per player from EXPLANATIONS_DIR/<kind> ('shap' or 'mlr'),
+    shaped like the *_321.pkl files (SHAP pruned to top/bottom features).
+    """
+    df = pd.read_parquet(EXPLANATIONS_DIR / kind).drop(columns=["bucket"], errors="ignore")
+    dates = pd.to_datetime(df["transfer_date"], errors="coerce").fillna(pd.Timestamp("1900-01-01"))
+    df = df.loc[dates.groupby(df["player_id"]).idxmax()].reset_index(drop=True)
+
+    if kind == "shap":
+        shap_cols = [c for c in df.columns if c.startswith("shap_")]
+        df[shap_cols] = np.apply_along_axis(keep_top_bottom, 1, df[shap_cols].to_numpy(dtype="float64"))
+    return df
+
+
+def explanations_complete(explanations_dir=EXPLANATIONS_DIR) -> bool:
+    """True once a precompute run has finished every chunk (not while one is running or was interrupted)."""
+    manifest_path = Path(explanations_dir) / "manifest.json"
+    if not manifest_path.exists():
+        return False
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return bool(json.load(f).get("complete"))
+
+
 def load_all_data():
     """Load all model data files into DataFrames."""
-    shap_df = pd.read_pickle(SHAP_PATH)
-    scores_df = pd.read_pickle(SCORES_PATH)
-    mlr_df = pd.read_pickle(MLR_PATH)
+    if explanations_complete():
+        shap_df = load_precomputed_explanations("shap")
+        mlr_df = load_precomputed_explanations("mlr")
+    else:
+        shap_df = pd.read_pickle(SHAP_PATH)
+        mlr_df = pd.read_pickle(MLR_PATH)
+    if SCORES_PARQUET_PATH.exists():
+        scores_df = pd.read_parquet(
+            SCORES_PARQUET_PATH,
+            columns=["player_id", "player_name", "time", "universal_score_100", "market_value"],
+        )
+    else:
+        scores_df = pd.read_pickle(SCORES_PATH)
 
     # JSONL → each line is one player dict
     players_df = pd.read_json(JSONL_PATH, lines=True)
@@ -39,6 +82,28 @@ def load_all_data():
 # ---------------------------------------------------------
 # 3. SHAP summary for one player
 # ---------------------------------------------------------
+def keep_top_bottom(values, n_pos: int = N_POS, n_neg: int = N_NEG):
+    """Zero all but the n_neg smallest and n_pos largest SHAP values (as in xgboost.ipynb)."""
+    values = np.asarray(values, dtype="float64")
+    if values.size == 0:
+        return values
+    order = np.argsort(values)
+    keep = np.unique(np.concatenate([order[:min(n_neg, values.size)], order[-min(n_pos, values.size):]]))
+    pruned = np.zeros_like(values)
+    pruned[keep] = values[keep]
+    return pruned
+
+
+def split_features(named_values: dict):
+    """{feature: shap value} -> (positive, negative) feature lists, largest effects first."""
+    positive = sorted(((f, v) for f, v in named_values.items() if v > 0), key=lambda x: x[1], reverse=True)
+    negative = sorted(((f, v) for f, v in named_values.items() if v < 0), key=lambda x: x[1])
+    return (
+        [{"feature": f, "shap_value": v} for f, v in positive],
+        [{"feature": f, "shap_value": v} for f, v in negative],
+    )
+
+
 def build_shap_section(player_id: int, shap_df: pd.DataFrame):
     """
     For a given player_id, read SHAP values.
@@ -98,30 +163,15 @@ def build_shap_section(player_id: int, shap_df: pd.DataFrame):
             "negative_features": [],
         }
 
-    # Split into positive and negative (no truncation)
-    positive = [(feat, val) for feat, val in non_zero.items() if val > 0]
-    negative = [(feat, val) for feat, val in non_zero.items() if val < 0]
-
-    # Sort for readability
-    positive = sorted(positive, key=lambda x: x[1], reverse=True)
-    negative = sorted(negative, key=lambda x: x[1])  # most negative first
+    # Split into positive and negative (no truncation), sorted for readability
+    positive, negative = split_features(
+        {feature.replace("shap_", ""): value for feature, value in non_zero.items()}
+    )
 
     return {
         "reference_transfer": reference_transfer,
-        "positive_features": [
-            {
-                "feature": feature.replace("shap_", ""),
-                "shap_value": value,
-            }
-            for feature, value in positive
-        ],
-        "negative_features": [
-            {
-                "feature": feature.replace("shap_", ""),
-                "shap_value": value,
-            }
-            for feature, value in negative
-        ],
+        "positive_features": positive,
+        "negative_features": negative,
     }
 
 
@@ -226,7 +276,41 @@ def build_time_series_section(player_id: int, scores_df: pd.DataFrame):
 
 
 # ---------------------------------------------------------
-# 6. Combine everything into one "massive" JSON
+# 6. Current form from the feature store
+# ---------------------------------------------------------
+FORM_COLUMNS = [
+    "age_at_transfer", "contract_years_left", "market_value_in_eur",
+    "minutes_365", "games_365", "goals_365", "assists_365", "yellow_365", "red_365",
+    "goals_per90", "assists_per90", "cards_per90", "minutes_per_game",
+]
+
+
+def build_form_section(player_id: int, feature_store):
+    """
+    Age, contract, market value and 365-day form as of the store's reference date,
+    read from src.models.feature_store (None if no store or player not in it).
+    """
+    if feature_store is None or player_id not in feature_store:
+        return None
+    columns = [c for c in FORM_COLUMNS if c in feature_store.feature_names]
+    values, _ = feature_store.rows([player_id], columns)
+    section = {"as_of": feature_store.reference_date.strftime("%Y-%m-%d")}
+    section.update({col: float(v) for col, v in zip(columns, values[0])})
+    return section
+
+
+def build_percentile_section(player_id: int, percentile_tables):
+    """
+    Percentiles among players of the same position and age band, from
+    src.models.percentiles (None if no tables or player not in them).
+    """
+    if percentile_tables is None:
+        return None
+    return percentile_tables.player_percentiles(player_id)
+
+
+# ---------------------------------------------------------
+# 7. Combine everything into one "massive" JSON
 # ---------------------------------------------------------
 def build_player_massive_json(
     player_id: int,
@@ -234,6 +318,8 @@ def build_player_massive_json(
     scores_df: pd.DataFrame,
     mlr_df: pd.DataFrame,
     players_df: pd.DataFrame,
+    feature_store=None,
+    percentile_tables=None,
 ):
     """
     Combine:
@@ -241,6 +327,8 @@ def build_player_massive_json(
       - SHAP section (non-zero shap_* features only)
       - MLR coefficients section (all coef_* columns)
       - time series of score/value
+      - current form from the feature store (if given)
+      - position / age-band percentiles (if given)
     into one big dictionary.
     """
     # Start with the original JSONL entry if available
@@ -254,12 +342,16 @@ def build_player_massive_json(
     base["shap_summary"] = build_shap_section(player_id, shap_df)
     base["mlr_coefficients"] = build_mlr_section(player_id, mlr_df)
     base["performance_time_series"] = build_time_series_section(player_id, scores_df)
+    if feature_store is not None:
+        base["current_form"] = build_form_section(player_id, feature_store)
+    if percentile_tables is not None:
+        base["position_percentiles"] = build_percentile_section(player_id, percentile_tables)
 
     return base
 
 
 # ---------------------------------------------------------
-# 7. CLI entry point
+# 8. CLI entry point
 # ---------------------------------------------------------
 if __name__ == "__main__":
     import argparse
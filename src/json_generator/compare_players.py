@@ -0,0 +1,137 @@
+"""Side-by-side comparison of a few players.
+
+Instead of one massive JSON per player, a comparison returns compact tables:
+one row per metric with one value per player (in request order), and the
+performance time series of all players resampled onto one date grid.
+
+collect_player() gathers one player's sections (run it per player in a
+worker pool); combine() lines them up.
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.json_generator.build_player_json import (
+    build_form_section,
+    build_percentile_section,
+    build_shap_section,
+)
+
+SECTIONS = ["profile", "form", "percentiles", "shap", "series"]
+
+PROFILE_COLUMNS = {
+    "name": "name",
+    "position": "position",
+    "sub_position": "sub_position",
+    "date_of_birth": "date_of_birth",
+    "current_club_name": "current_club_name",
+    "market_value_in_eur": "market_value_in_eur",
+    "highest_market_value_in_eur": "highest_market_value_in_eur",
+    "contract_expiration_date": "contract_expiration_date",
+    "height_in_cm": "height_in_cm",
+    "nationality": "country_of_citizenship",
+}
+SERIES_COLUMNS = ["universal_score_100", "market_value"]
+
+
+def _value(v):
+    if v is None or (isinstance(v, float) and np.isnan(v)):
+        return None
+    return v.item() if hasattr(v, "item") else v
+
+
+def player_series(player_id: int, scores_df: pd.DataFrame):
+    """(sorted datetime64 days, {column: float array}) for one player."""
+    rows = scores_df[scores_df["player_id"] == player_id]
+    times = pd.to_datetime(rows["time"], errors="coerce")
+    keep = times.notna().to_numpy()
+    order = np.argsort(times.to_numpy()[keep], kind="stable")
+    days = times.to_numpy(dtype="datetime64[D]")[keep][order]
+    return days, {c: rows[c].to_numpy(dtype="float64")[keep][order] for c in SERIES_COLUMNS if c in rows}
+
+
+def collect_player(player_id: int, sections, profile_row=None, scores_df=None, shap_df=None,
+                   feature_store=None, percentile_tables=None):
+    """
+    The requested sections for one player, each as a flat {metric: value} dict
+    (series as raw arrays). Sections without data are None.
+    """
+    parts = {"player_id": player_id}
+    if "profile" in sections:
+        parts["profile"] = None if profile_row is None else {
+            key: _value(profile_row.get(col)) for key, col in PROFILE_COLUMNS.items()
+        }
+    if "form" in sections:
+        parts["form"] = build_form_section(player_id, feature_store)
+    if "percentiles" in sections:
+        section = build_percentile_section(player_id, percentile_tables)
+        parts["percentiles"] = None if section is None else {
+            metric: entry["percentile"] for metric, entry in section["metrics"].items()
+        }
+    if "shap" in sections:
+        section = build_shap_section(player_id, shap_df) if shap_df is not None else None
+        parts["shap"] = None if section is None else flatten_shap(section)
+    if "series" in sections and scores_df is not None:
+        parts["series"] = player_series(player_id, scores_df)
+    return parts
+
+
+def flatten_shap(section):
+    """shap_summary (precomputed or on-demand) -> {feature: shap_value}."""
+    features = section.get("positive_features", []) + section.get("negative_features", [])
+    return {f["feature"]: f["shap_value"] for f in features}
+
+
+def metric_table(dicts):
+    """[{metric: value} or None per player] -> {metric: [value per player]} (union of metrics)."""
+    metrics = list(dict.fromkeys(m for d in dicts if d for m in d))
+    return {m: [None if d is None else _value(d.get(m)) for d in dicts] for m in metrics}
+
+
+def align_series(series, freq="MS"):
+    """
+    Resample each player's series onto one grid covering all of them.
+
+    Each grid date takes the player's latest observation on or before it;
+    dates before a player's first or after their last observation are None.
+
+    Args:
+        series: [(days, {column: values}) or None per player]
+        freq: pandas frequency of the grid (default: month starts)
+    """
+    observed = [s for s in series if s is not None and len(s[0])]
+    if not observed:
+        return {"dates": [], **{c: [] for c in SERIES_COLUMNS}}
+    start = min(days[0] for days, _ in observed)
+    end = max(days[-1] for days, _ in observed)
+    grid = pd.date_range(pd.Timestamp(start), pd.Timestamp(end), freq=freq)
+    if not len(grid) or grid[-1] < pd.Timestamp(end):
+        grid = grid.append(pd.DatetimeIndex([pd.Timestamp(end)]))
+    grid_days = grid.to_numpy(dtype="datetime64[D]")
+
+    aligned = {c: [] for c in SERIES_COLUMNS}
+    for s in series:
+        if s is None or not len(s[0]):
+            for c in SERIES_COLUMNS:
+                aligned[c].append([None] * len(grid_days))
+            continue
+        days, values = s
+        pos = np.searchsorted(days, grid_days, side="right") - 1
+        inside = (pos >= 0) & (grid_days <= days[-1])
+        for c in SERIES_COLUMNS:
+            col = values.get(c)
+            picked = np.full(len(grid_days), np.nan) if col is None else col[np.clip(pos, 0, None)]
+            aligned[c].append([float(v) if ok and not np.isnan(v) else None for v, ok in zip(picked, inside)])
+
+    return {"dates": [d.strftime("%Y-%m-%d") for d in grid], **aligned}
+
+
+def combine(parts, sections, freq="MS"):
+    """collect_player() results (request order) -> comparison payload."""
+    result = {"player_ids": [p["player_id"] for p in parts]}
+    for section in sections:
+        if section == "series":
+            result["series"] = align_series([p.get("series") for p in parts], freq)
+        else:
+            result[section] = metric_table([p.get(section) for p in parts])
+    return result
@@ -30,7 +30,7 @@ class GeneralChatbotAgent:
             session_manager: Optional shared SessionManager instance. If None, creates a new one.
         """
         self.config = config or {}
-        self.client = OpenAIClient(config=self.config)
+        self.client = OpenAIClient(config=self.config, agent="general_chatbot_agent")
         self.session_manager = session_manager if session_manager is not None else SessionManager()
         
         # Load prompts from global_configs
@@ -23,7 +23,7 @@ class QueryRewriterAgent:
             config: Optional config dict. If not provided, uses default from model_configs.
         """
         self.config = config or {}
-        self.client = OpenAIClient(config=self.config)
+        self.client = OpenAIClient(config=self.config, agent="query_rewriter_agent")
         
         # Load prompts from global_configs
         try:
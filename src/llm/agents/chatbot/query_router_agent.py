@@ -23,7 +23,7 @@ class QueryRouterAgent:
             config: Optional config dict. If not provided, uses default from model_configs.
         """
         self.config = config or {}
-        self.client = OpenAIClient(config=self.config)
+        self.client = OpenAIClient(config=self.config, agent="query_router_agent")
         
         # Load prompts and schema from global_configs
         try:
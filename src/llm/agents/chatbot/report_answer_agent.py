@@ -2,8 +2,10 @@
 
 from typing import Dict, Any, Optional, AsyncGenerator
 from src.llm.clients.openai_client import OpenAIClient
+from src.llm.clients.response_cache import cache_key
 from src.utils.message_builder import MessageBuilder
 from src.utils.session_manager import SessionManager
+from src.utils.token_budget import TokenBudgeter, count_tokens
 import logging
 import json
 
@@ -30,7 +32,7 @@ class ReportAnswerAgent:
             session_manager: Optional shared SessionManager instance. If None, creates a new one.
         """
         self.config = config or {}
-        self.client = OpenAIClient(config=self.config)
+        self.client = OpenAIClient(config=self.config, agent="report_answer_agent")
         self.session_manager = session_manager if session_manager is not None else SessionManager()
         
         # Load prompts from global_configs
@@ -41,6 +43,11 @@ class ReportAnswerAgent:
             logger.warning("Report answer agent prompts not found in global_configs, using defaults")
             self.system_prompt = None
         
+        # Trim player_data to max_input_tokens (if configured)
+        from src.global_configs import TOKEN_BUDGET_CONFIGS
+        self.max_input_tokens = self.config.get("max_input_tokens")
+        self.budgeter = TokenBudgeter(TOKEN_BUDGET_CONFIGS.get("player_data", {}), model=self.config.get("model"))
+        
         logger.info(f"ReportAnswerAgent initialized with model: {self.config.get('model', 'default')}")
     
     async def process_message(
@@ -78,6 +85,12 @@ class ReportAnswerAgent:
         
         # Prepare data for system prompt
         report_json = json.dumps(report, indent=2)
+        if player_data and self.max_input_tokens:
+            model = self.config.get("model")
+            overhead = count_tokens(self.system_prompt or "", model) + count_tokens(report_json, model)
+            player_data, _ = self.budgeter.fit(
+                player_data, self.max_input_tokens - overhead, label="report_answer_agent"
+            )
         player_data_json = json.dumps(player_data, indent=2) if player_data else None
         
         # Store report in session for context
@@ -123,9 +136,12 @@ class ReportAnswerAgent:
             nonlocal full_response
             try:
                 # Force streaming
+                # Turns about the same report share the long instructions + data prefix;
+                # route them to the same prompt cache
                 stream = await self.client.chat_completion(
                     messages=messages.build(),
-                    stream=True
+                    stream=True,
+                    prompt_cache_key=f"report_answer_agent:{cache_key(report)[:16]}"
                 )
                 
                 async for chunk in stream:
@@ -1,14 +1,15 @@
 """Analysis Agent for analyzing player statistics and ML model outputs."""
 
 from typing import Dict, Any, Optional
-from src.llm.clients.openai_client import OpenAIClient
+from src.llm.clients.cascade import ModelCascade
 from src.global_configs import (
     ANALYSIS_AGENT_SYSTEM_PROMPT,
     ANALYSIS_AGENT_USER_PROMPT,
-    ANALYSIS_SCHEMA
+    ANALYSIS_SCHEMA,
+    TOKEN_BUDGET_CONFIGS
 )
 from src.utils.message_builder import MessageBuilder
-from src.utils.response_utils import extract_json_from_response
+from src.utils.token_budget import TokenBudgeter, count_tokens
 
 
 class AnalysisAgent:
@@ -21,11 +22,17 @@ class AnalysisAgent:
             config: Optional config dict. If not provided, uses default from model_configs.
         """
         self.config = config or {}
-        self.client = OpenAIClient(config=self.config)
+        # Cheaper tiers from config["cascade"] first, then the configured model
+        self.cascade = ModelCascade(self.config, agent="analysis_agent", schema=ANALYSIS_SCHEMA)
+        self.client = self.cascade.clients[-1]
         
         # Use prompts from global_configs
         self.system_prompt = ANALYSIS_AGENT_SYSTEM_PROMPT
         self.user_prompt_template = ANALYSIS_AGENT_USER_PROMPT
+        
+        # Trim player_data to max_input_tokens (if configured)
+        self.max_input_tokens = self.config.get("max_input_tokens")
+        self.budgeter = TokenBudgeter(TOKEN_BUDGET_CONFIGS.get("player_data", {}), model=self.config.get("model"))
     
     async def analyze(
         self,
@@ -48,6 +55,14 @@ class AnalysisAgent:
             - strengths, weaknesses, recommendations
             - statistics_summary, ml_predictions
         """
+        # Fit player data into the prompt budget (system prompt and template count against it)
+        if self.max_input_tokens:
+            model = self.config.get("model")
+            overhead = count_tokens(self.system_prompt, model) + count_tokens(self.user_prompt_template, model)
+            player_data, _ = self.budgeter.fit(
+                player_data, self.max_input_tokens - overhead, label="analysis_agent"
+            )
+        
         # Prepare user prompt with player data
         if self.user_prompt_template:
             import json
@@ -74,14 +89,9 @@ class AnalysisAgent:
             }
         }
         
-        # Call Chat Completions API with structured output
-        response = await self.client.chat_completion(
-            messages=messages.build(),
-            response_format=response_format
-        )
-        
-        # Extract analysis from response
-        analysis = extract_json_from_response(response)
+        # Call Chat Completions API with structured output, escalating through the
+        # cascade tiers until the output passes the schema and quality checks
+        analysis, response = await self.cascade.run(messages.build(), response_format)
         if isinstance(analysis, dict):
             return analysis
         
@@ -1,15 +1,19 @@
 """Generator Agent for combining all analysis into final report."""
 
-from typing import Dict, Any, Optional, List
+import json
+import logging
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
 from datetime import datetime
-from src.llm.clients.openai_client import OpenAIClient
+from src.llm.clients.cascade import ModelCascade
 from src.global_configs import (
     GENERATOR_AGENT_SYSTEM_PROMPT,
     GENERATOR_AGENT_USER_PROMPT,
     REPORT_SCHEMA
 )
+from src.utils.json_stream import IncrementalJSONParser
 from src.utils.message_builder import MessageBuilder
-from src.utils.response_utils import extract_json_from_response
+
+logger = logging.getLogger(__name__)
 
 
 class GeneratorAgent:
@@ -22,30 +26,22 @@ class GeneratorAgent:
             config: Optional config dict. If not provided, uses default from model_configs.
         """
         self.config = config or {}
-        self.client = OpenAIClient(config=self.config)
+        # Cheaper tiers from config["cascade"] first, then the configured model
+        self.cascade = ModelCascade(self.config, agent="generator_agent", schema=REPORT_SCHEMA)
+        self.client = self.cascade.clients[-1]
         
         # Use prompts from global_configs
         self.system_prompt = GENERATOR_AGENT_SYSTEM_PROMPT
         self.user_prompt_template = GENERATOR_AGENT_USER_PROMPT
     
-    async def generate_report(
+    def _build_request(
         self,
         player_analysis: Dict[str, Any],
         news_articles: List[Dict[str, Any]],
         news_analysis: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Generate final report by combining all analyses.
-        
-        Args:
-            player_analysis: Analysis results from AnalysisAgent
-            news_articles: News articles from NewsAgent
-            news_analysis: News analysis from NewsAnalysisAgent
-        
-        Returns:
-            Dictionary with final report following report_schema.json structure
-        """
+    ) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """Messages and structured-output response format for the report call."""
         # Prepare data as JSON strings
-        import json
         player_analysis_json = json.dumps(player_analysis, indent=2)
         news_articles_json = json.dumps(news_articles, indent=2)
         news_analysis_json = json.dumps(news_analysis, indent=2)
@@ -75,28 +71,85 @@ class GeneratorAgent:
                 "strict": True
             }
         }
+        return messages.build(), response_format
+    
+    async def generate_report(
+        self,
+        player_analysis: Dict[str, Any],
+        news_articles: List[Dict[str, Any]],
+        news_analysis: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Generate final report by combining all analyses.
+        
+        Args:
+            player_analysis: Analysis results from AnalysisAgent
+            news_articles: News articles from NewsAgent
+            news_analysis: News analysis from NewsAnalysisAgent
         
-        # Call Chat Completions API with structured output
-        response = await self.client.chat_completion(
-            messages=messages.build(),
-            response_format=response_format
-        )
+        Returns:
+            Dictionary with final report following report_schema.json structure
+        """
+        messages, response_format = self._build_request(player_analysis, news_articles, news_analysis)
         
-        # Extract report from response
-        report = extract_json_from_response(response)
+        # Call Chat Completions API with structured output, escalating through the
+        # cascade tiers until the output passes the schema and quality checks
+        report, response = await self.cascade.run(messages, response_format)
+        if not isinstance(report, dict) and hasattr(response, 'choices') and len(response.choices) > 0:
+            # Debug: Log raw response if extraction fails
+            content = response.choices[0].message.content
+            logger.warning(f"Failed to extract JSON from response. Raw content: {content[:500] if content else 'None'}")
+        return self._finalize(report, player_analysis, news_articles, news_analysis)
+    
+    async def stream_report(
+        self,
+        player_analysis: Dict[str, Any],
+        news_articles: List[Dict[str, Any]],
+        news_analysis: Dict[str, Any]
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Generate the final report, yielding each section as soon as it is complete.
+        
+        Yields:
+            ("section", {"path": "report.executive_summary", "value": ...}) for every
+                report field and top-level field (player_info, news, ...) as it closes
+            ("reset", {"tier", "outcome", "problems"}) when a cascade tier's output is
+                rejected; sections sent so far are void and are streamed again
+            ("report", final report) once, at the end (same as generate_report)
+        """
+        messages, response_format = self._build_request(player_analysis, news_articles, news_analysis)
+        parser = IncrementalJSONParser(max_depth=2)
+        async for kind, data in self.cascade.stream(messages, response_format):
+            if kind == "delta":
+                try:
+                    closed = parser.feed(data)
+                except ValueError as e:
+                    # Malformed output: stop emitting sections, the cascade judges the whole
+                    logger.warning(f"Unparseable streamed report section: {e}")
+                    parser.done = True
+                    continue
+                for path, value in closed:
+                    # Report fields one by one; other top-level fields whole
+                    if len(path) == (2 if path[0] == "report" else 1):
+                        yield "section", {"path": ".".join(map(str, path)), "value": value}
+            elif kind == "escalate":
+                parser = IncrementalJSONParser(max_depth=2)
+                yield "reset", data
+            else:
+                yield "report", self._finalize(data, player_analysis, news_articles, news_analysis)
+    
+    @staticmethod
+    def _finalize(
+        report: Any,
+        player_analysis: Dict[str, Any],
+        news_articles: List[Dict[str, Any]],
+        news_analysis: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """The parsed report with generated_at set, or the fallback built from the analyses."""
         if isinstance(report, dict):
             # Ensure generated_at is set
             if "generated_at" not in report or not report["generated_at"]:
                 report["generated_at"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
             return report
         
-        # Debug: Log raw response if extraction fails
-        if hasattr(response, 'choices') and len(response.choices) > 0:
-            import logging
-            logger = logging.getLogger(__name__)
-            content = response.choices[0].message.content
-            logger.warning(f"Failed to extract JSON from response. Raw content: {content[:500] if content else 'None'}")
-        
         # Fallback: return empty report structure with timestamp (matching new schema)
         return {
             "player_info": player_analysis.get("player_info", {}),
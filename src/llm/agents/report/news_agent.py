@@ -16,7 +16,7 @@ class NewsAgent:
             config: Optional config dict. If not provided, uses default from model_configs.
         """
         self.config = config or {}
-        self.client = OpenAIClient(config=self.config)
+        self.client = OpenAIClient(config=self.config, agent="news_agent")
         
         # Use prompts from global_configs
         self.user_prompt_template = NEWS_AGENT_USER_PROMPT
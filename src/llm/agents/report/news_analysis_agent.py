@@ -21,7 +21,7 @@ class NewsAnalysisAgent:
             config: Optional config dict. If not provided, uses default from model_configs.
         """
         self.config = config or {}
-        self.client = OpenAIClient(config=self.config)
+        self.client = OpenAIClient(config=self.config, agent="news_analysis_agent")
         
         # Use prompts from global_configs
         self.system_prompt = NEWS_ANALYSIS_AGENT_SYSTEM_PROMPT
@@ -1,6 +1,8 @@
 """Client modules for external API integrations."""
 
+from .http_pool import ClientRegistry, get_client_registry
 from .openai_client import OpenAIClient
+from .response_cache import ResponseCache, get_response_cache
 
-__all__ = ["OpenAIClient"]
+__all__ = ["ClientRegistry", "OpenAIClient", "ResponseCache", "get_client_registry", "get_response_cache"]
 
@@ -0,0 +1,387 @@
+"""Batch mode for LLM calls: requests go into provider batch jobs instead of being sent.
+
+Inside BatchCollector.drive(), every OpenAIClient call made by the driven
+coroutines is queued rather than sent. Once no new request has arrived
+for `settle` seconds, the queue is written as a JSONL file in the batch
+input format ({"custom_id", "method", "url", "body"} per line), one file
+per endpoint, and submitted. The collector then polls the job and resolves
+each waiting call with its parsed result, so the agents and the
+orchestrator run unchanged and each pipeline stage becomes one batch.
+
+    collector = BatchCollector(OpenAIBatchBackend(), "batch_jobs/watchlist")
+    await collector.drive([orchestrator.generate_player_report(p) for p in players])
+
+A custom_id is the hash of the request, so the job directory doubles as a
+resumable store:
+    batches.json   submitted batches (id, endpoint, input file, custom_ids, status)
+    results.jsonl  every successful result, served again on re-runs
+    requests/      the submitted input files
+
+Batches still open when the process stopped are polled again on the next run
+rather than resubmitted. Requests missing from a finished batch (expired,
+cancelled) are resubmitted once. Failed requests raise BatchRequestError in
+the waiting call.
+
+Backends: OpenAIBatchBackend (Files + Batches API, batch pricing, no use of
+the interactive rate limits) and LocalBatchProcessor, which runs the file
+line by line against an OpenAI-compatible server (the stub in tests).
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Dict, Iterable, List, Optional, Tuple
+
+from openai import APIStatusError
+from openai.types.chat import ChatCompletion
+from openai.types.responses import Response
+
+from src.llm.clients.response_cache import cache_key
+
+logger = logging.getLogger(__name__)
+
+CHAT_COMPLETIONS = "/v1/chat/completions"
+RESPONSES = "/v1/responses"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# Batch requests never stream; the result is parsed into the non-stream object
+_STREAM_PARAMS = ("stream", "stream_options")
+
+_current: contextvars.ContextVar = contextvars.ContextVar("llm_batch", default=None)
+
+
+def current_batch() -> Optional["BatchCollector"]:
+    """The collector driving the current task, if any."""
+    return _current.get()
+
+
+class BatchRequestError(RuntimeError):
+    """A request inside a batch job failed (or the job ended without its result)."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, custom_id: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.custom_id = custom_id
+
+
+def parse_response(endpoint: str, body: Dict[str, Any]):
+    """Batch result body -> the object the synchronous API would have returned.
+
+    Built like the SDK builds API responses (construct, no validation), so
+    fields a newer API adds or leaves null do not break parsing.
+    """
+    if endpoint == RESPONSES:
+        return Response.construct(**body)
+    return ChatCompletion.construct(**body)
+
+
+# ---------------------------------------------------------
+# Backends
+# ---------------------------------------------------------
+class OpenAIBatchBackend:
+    """Upload the JSONL with purpose="batch", create the batch, download output and error files."""
+
+    def __init__(self, client=None, completion_window: str = "24h"):
+        self._client = client
+        self.completion_window = completion_window
+
+    @property
+    def client(self):
+        if self._client is not None:
+            return self._client
+        from src.llm.clients.http_pool import get_client_registry
+        return get_client_registry().openai()
+
+    async def submit(self, path: Path, endpoint: str) -> str:
+        with open(path, "rb") as f:
+            uploaded = await self.client.files.create(file=f, purpose="batch")
+        batch = await self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=endpoint,
+            completion_window=self.completion_window,
+            metadata={"source": "player-report-batch", "file": path.name},
+        )
+        return batch.id
+
+    async def poll(self, batch_id: str) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+        """(status, output lines once the batch is terminal, else None)."""
+        batch = await self.client.batches.retrieve(batch_id)
+        if batch.status not in TERMINAL_STATUSES:
+            return batch.status, None
+        lines = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = await self.client.files.content(file_id)
+                lines.extend(json.loads(line) for line in content.text.splitlines() if line.strip())
+        return batch.status, lines
+
+
+class LocalBatchProcessor:
+    """Stand-in for the Batch API: runs each line against an OpenAI-compatible server.
+
+    Produces output lines in the provider's format. Jobs live in memory, so
+    after a restart their ids report "expired" and the requests are resubmitted.
+    """
+
+    def __init__(self, client=None, concurrency: int = 8):
+        self._client = client
+        self.concurrency = concurrency
+        self._jobs: Dict[str, asyncio.Task] = {}
+
+    @property
+    def client(self):
+        if self._client is not None:
+            return self._client
+        from src.llm.clients.http_pool import get_client_registry
+        return get_client_registry().openai()
+
+    async def submit(self, path: Path, endpoint: str) -> str:
+        batch_id = f"batch_local_{uuid.uuid4().hex[:16]}"
+        with open(path, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        self._jobs[batch_id] = asyncio.create_task(self._process(lines, endpoint))
+        return batch_id
+
+    async def poll(self, batch_id: str) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+        task = self._jobs.get(batch_id)
+        if task is None:
+            return "expired", []
+        if not task.done():
+            return "in_progress", None
+        return "completed", task.result()
+
+    async def _process(self, lines: List[Dict[str, Any]], endpoint: str) -> List[Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        resource = self.client.responses if endpoint == RESPONSES else self.client.chat.completions
+
+        async def run(line):
+            async with semaphore:
+                output = {"id": f"batch_req_{uuid.uuid4().hex[:16]}", "custom_id": line["custom_id"],
+                          "response": None, "error": None}
+                try:
+                    result = await resource.create(**line["body"])
+                    output["response"] = {"status_code": 200, "request_id": "", "body": result.model_dump(mode="json", exclude_unset=True)}
+                except APIStatusError as e:
+                    output["response"] = {"status_code": e.status_code, "request_id": "", "body": e.body}
+                except Exception as e:
+                    output["error"] = {"code": type(e).__name__, "message": str(e)}
+                return output
+
+        return await asyncio.gather(*(run(line) for line in lines))
+
+
+# ---------------------------------------------------------
+# Collector
+# ---------------------------------------------------------
+class BatchCollector:
+    """Queues LLM calls of the driven coroutines into batch jobs and resolves them from the results.
+
+    Args:
+        backend: OpenAIBatchBackend or LocalBatchProcessor (anything with submit/poll).
+        job_dir: Directory for request files, batch state and stored results.
+        poll_interval: Seconds between status checks of open batches.
+        settle: Seconds without new requests before the queue is submitted.
+        max_requests_per_file: Requests per batch input file (provider limit 50,000).
+        max_submissions: Times a request is submitted before its callers get an error.
+    """
+
+    def __init__(
+        self,
+        backend,
+        job_dir,
+        poll_interval: float = 30.0,
+        settle: float = 0.2,
+        max_requests_per_file: int = 50000,
+        max_submissions: int = 2,
+    ):
+        self.backend = backend
+        self.job_dir = Path(job_dir)
+        (self.job_dir / "requests").mkdir(parents=True, exist_ok=True)
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self.max_requests_per_file = max_requests_per_file
+        self.max_submissions = max_submissions
+        self.on_request = None  # optional callback(label, custom_id), e.g. to track pipeline stages
+
+        self.results: Dict[str, Dict[str, Any]] = self._load_results()
+        self.batches: Dict[str, Dict[str, Any]] = self._load_json("batches.json")
+        self._requests: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._queue: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        self._submissions: Dict[str, int] = {}
+        self._last_enqueue = 0.0
+        # Requests in batches left open by a previous run
+        self._open: Dict[str, str] = {
+            custom_id: batch_id
+            for batch_id, info in self.batches.items() if info["status"] not in TERMINAL_STATUSES
+            for custom_id in info["custom_ids"]
+        }
+        self.stats = {"submitted_batches": 0, "submitted_requests": 0, "stored_results": 0}
+
+    # ---- persistence
+    def _load_json(self, name: str) -> Dict[str, Any]:
+        path = self.job_dir / name
+        if not path.exists():
+            return {}
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_batches(self):
+        tmp = self.job_dir / "batches.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.batches, f, indent=2)
+        tmp.replace(self.job_dir / "batches.json")
+
+    def _load_results(self) -> Dict[str, Dict[str, Any]]:
+        path = self.job_dir / "results.jsonl"
+        results = {}
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        results[entry["custom_id"]] = entry
+        return results
+
+    def _store_results(self, entries: List[Dict[str, Any]]):
+        with open(self.job_dir / "results.jsonl", "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+
+    # ---- requests from OpenAIClient
+    async def request(self, endpoint: str, params: Dict[str, Any], label: str = ""):
+        """Queue one API call and wait for its result from the batch job."""
+        body = {k: v for k, v in params.items() if k not in _STREAM_PARAMS}
+        custom_id = cache_key({"url": endpoint, "body": body})
+        if self.on_request is not None:
+            self.on_request(label, custom_id)
+
+        stored = self.results.get(custom_id)
+        if stored is not None:
+            self.stats["stored_results"] += 1
+            return parse_response(endpoint, stored["body"])
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(custom_id, []).append(future)
+        self._requests[custom_id] = (endpoint, body)
+        if custom_id not in self._queue and custom_id not in self._open:
+            self._queue[custom_id] = (endpoint, body)
+            self._last_enqueue = time.monotonic()
+        return parse_response(endpoint, await future)
+
+    # ---- driving
+    async def drive(self, aws: Iterable[Awaitable]) -> None:
+        """Run the coroutines to completion, submitting and polling batches for their LLM calls."""
+        token = _current.set(self)
+        try:
+            pending = {asyncio.ensure_future(a) for a in aws}
+        finally:
+            _current.reset(token)
+        next_poll = 0.0
+        try:
+            while pending:
+                _, pending = await asyncio.wait(pending, timeout=self.settle)
+                now = time.monotonic()
+                if self._queue and now - self._last_enqueue >= self.settle:
+                    await self.flush()
+                    next_poll = now + self.poll_interval
+                if self._open and now >= next_poll:
+                    await self.poll()
+                    next_poll = now + self.poll_interval
+        finally:
+            # Interrupted: submitted batches stay in batches.json for the next run
+            for task in pending:
+                task.cancel()
+
+    async def flush(self):
+        """Write queued requests to batch input files (one per endpoint) and submit them."""
+        by_endpoint: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        for custom_id, (endpoint, body) in self._queue.items():
+            by_endpoint.setdefault(endpoint, []).append((custom_id, body))
+        self._queue = {}
+
+        for endpoint, items in by_endpoint.items():
+            for start in range(0, len(items), self.max_requests_per_file):
+                chunk = items[start:start + self.max_requests_per_file]
+                name = f"{len(self.batches) + 1:04d}_{endpoint.strip('/').replace('/', '_')}.jsonl"
+                path = self.job_dir / "requests" / name
+                with open(path, "w", encoding="utf-8") as f:
+                    for custom_id, body in chunk:
+                        f.write(json.dumps({"custom_id": custom_id, "method": "POST", "url": endpoint, "body": body}) + "\n")
+
+                batch_id = await self.backend.submit(path, endpoint)
+                custom_ids = [custom_id for custom_id, _ in chunk]
+                self.batches[batch_id] = {
+                    "endpoint": endpoint, "file": name, "custom_ids": custom_ids,
+                    "status": "submitted", "submitted_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                }
+                for custom_id in custom_ids:
+                    self._open[custom_id] = batch_id
+                    self._submissions[custom_id] = self._submissions.get(custom_id, 0) + 1
+                self.stats["submitted_batches"] += 1
+                self.stats["submitted_requests"] += len(chunk)
+                self._save_batches()
+                logger.info(f"Submitted batch {batch_id}: {len(chunk)} requests to {endpoint} ({name})")
+
+    async def poll(self):
+        """Check open batches; resolve the calls of finished ones."""
+        for batch_id in sorted({b for b in self._open.values()}):
+            info = self.batches[batch_id]
+            status, lines = await self.backend.poll(batch_id)
+            info["status"] = status
+            if status not in TERMINAL_STATUSES:
+                continue
+
+            stored = []
+            for line in lines or []:
+                entry = self._resolve(line)
+                if entry is not None:
+                    stored.append(entry)
+            self._store_results(stored)
+
+            missing = [c for c in info["custom_ids"] if self._open.get(c) == batch_id]
+            for custom_id in missing:
+                del self._open[custom_id]
+                if custom_id not in self._waiters:
+                    continue
+                if self._submissions.get(custom_id, 0) < self.max_submissions and custom_id in self._requests:
+                    self._queue[custom_id] = self._requests[custom_id]
+                    self._last_enqueue = time.monotonic()
+                else:
+                    self._fail(custom_id, BatchRequestError(
+                        f"Batch {batch_id} ended ({status}) without a result", custom_id=custom_id))
+            logger.info(
+                f"Batch {batch_id} {status}: {len(stored)} results, "
+                f"{len(info['custom_ids']) - len(stored) - len(missing)} errors, {len(missing)} missing"
+            )
+        self._save_batches()
+
+    def _resolve(self, line: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        custom_id = line.get("custom_id")
+        if custom_id is None:
+            return None
+        self._open.pop(custom_id, None)
+        response = line.get("response") or {}
+        error = line.get("error")
+        if error or response.get("status_code") != 200:
+            message = (error or {}).get("message") or json.dumps(response.get("body"))[:500]
+            self._fail(custom_id, BatchRequestError(
+                f"Batch request failed ({response.get('status_code')}): {message}",
+                status_code=response.get("status_code"), custom_id=custom_id,
+            ))
+            return None
+        entry = {"custom_id": custom_id, "body": response["body"]}
+        self.results[custom_id] = entry
+        for future in self._waiters.pop(custom_id, []):
+            if not future.done():
+                future.set_result(response["body"])
+        return entry
+
+    def _fail(self, custom_id: str, error: BatchRequestError):
+        for future in self._waiters.pop(custom_id, []):
+            if not future.done():
+                future.set_exception(error)
@@ -0,0 +1,168 @@
+"""Model cascade: try cheaper model settings first, escalate when the output fails checks.
+
+An agent config may carry
+
+    cascade:
+      tiers:                      # tried in order, each merged over the agent config
+        - {model: "gpt-5-nano", reasoning_effort: "low"}
+      text_fields: [executive_summary, player_development]   # narrative sections (dotted paths)
+      min_text_chars: 200         # ...that fail when shorter than this
+      nonempty_fields: [strengths, weaknesses]                # lists that fail when empty
+
+The agent's own config is the last tier. Each tier's structured output is
+validated against the response schema and checked for blank or short
+sections. The first output that passes is returned. The last tier's output
+is returned as is, so the agent keeps its own fallback handling.
+stream() does the same over streamed calls for progressive rendering.
+Every attempt is counted in llm_cascade_attempts_total, and
+cascade_stats() turns that into per-tier success rates.
+"""
+
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from src.llm.clients.openai_client import OpenAIClient
+from src.utils.metrics import LLM_CASCADE
+from src.utils.response_utils import extract_json_from_response, extract_json_from_text
+from src.utils.schema_validation import quality_issues, validate
+
+logger = logging.getLogger(__name__)
+
+OUTCOMES = ("accepted", "invalid", "low_quality", "error")
+
+
+def tier_name(config: Dict[str, Any]) -> str:
+    """Readable tier label, e.g. "gpt-5-nano/low"."""
+    name = config.get("model", "default")
+    effort = config.get("reasoning_effort")
+    return f"{name}/{effort}" if effort else name
+
+
+class ModelCascade:
+    """Structured-output chat calls that escalate through model tiers.
+
+    Args:
+        config: Agent config; its optional "cascade" key defines the cheaper tiers.
+        agent: Agent name for metrics.
+        schema: JSON schema the parsed output must satisfy.
+        **client_kwargs: Passed to each tier's OpenAIClient (registry, cache).
+    """
+
+    def __init__(self, config: Dict[str, Any], agent: str, schema: Dict[str, Any], **client_kwargs):
+        cascade = config.get("cascade") or {}
+        base = {k: v for k, v in config.items() if k != "cascade"}
+        self.tier_configs: List[Dict[str, Any]] = [{**base, **tier} for tier in cascade.get("tiers", [])] + [base]
+        self.clients = [OpenAIClient(config=c, agent=agent, **client_kwargs) for c in self.tier_configs]
+        self.agent = agent
+        self.schema = schema
+        self.text_fields = cascade.get("text_fields", [])
+        self.min_text_chars = cascade.get("min_text_chars", 1)
+        self.nonempty_fields = cascade.get("nonempty_fields", [])
+
+    def check(self, parsed: Any) -> Tuple[Optional[str], List[str]]:
+        """(failed outcome or None, problems) for a parsed output."""
+        problems = validate(parsed, self.schema)
+        if problems:
+            return "invalid", problems
+        problems = quality_issues(parsed, self.text_fields, self.min_text_chars, self.nonempty_fields)
+        if problems:
+            return "low_quality", problems
+        return None, []
+
+    def _labels(self, config: Dict[str, Any]) -> Dict[str, str]:
+        return {"agent": self.agent, "tier": tier_name(config), "model": config.get("model", "")}
+
+    def _failed(self, labels: Dict[str, str], error: Exception, final: bool):
+        """Count a failed call; re-raise it on the last tier."""
+        LLM_CASCADE.inc(outcome="error", **labels)
+        if final:
+            raise error
+        logger.warning(f"{self.agent} tier {labels['tier']} failed ({type(error).__name__}); escalating")
+
+    def _judge(self, labels: Dict[str, str], parsed: Any, final: bool) -> Tuple[bool, Optional[str], List[str]]:
+        """Count an output; (return it?, failed outcome or None, problems)."""
+        outcome, problems = self.check(parsed)
+        LLM_CASCADE.inc(outcome=outcome or "accepted", **labels)
+        if outcome is None:
+            return True, None, []
+        if final:
+            logger.warning(f"{self.agent} final tier {labels['tier']} output {outcome}: {problems[:3]}")
+            return True, outcome, problems
+        logger.info(f"{self.agent} tier {labels['tier']} output {outcome} ({problems[:3]}); escalating")
+        return False, outcome, problems
+
+    async def run(self, messages: List[Dict[str, str]], response_format: Dict[str, Any]):
+        """Return (parsed output, response) from the first tier whose output passes.
+
+        Outputs are validated whole, so calls are never streamed. Errors of
+        cheaper tiers escalate; the last tier's errors propagate.
+        """
+        last = len(self.clients) - 1
+        for i, (client, config) in enumerate(zip(self.clients, self.tier_configs)):
+            labels = self._labels(config)
+            try:
+                response = await client.chat_completion(
+                    messages=messages, response_format=response_format, stream=False
+                )
+            except Exception as e:
+                self._failed(labels, e, i == last)
+                continue
+
+            parsed = extract_json_from_response(response)
+            done, _, _ = self._judge(labels, parsed, i == last)
+            if done:
+                return parsed, response
+
+    async def stream(
+        self, messages: List[Dict[str, str]], response_format: Dict[str, Any]
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream the tiers' output text, escalating like run().
+
+        Yields ("delta", text) while a tier generates, ("escalate", {"tier",
+        "outcome", "problems"}) when its finished output fails the checks or
+        the call errors (text already yielded for that tier is void), and
+        finally ("result", parsed output).
+        """
+        last = len(self.clients) - 1
+        for i, (client, config) in enumerate(zip(self.clients, self.tier_configs)):
+            labels = self._labels(config)
+            content = ""
+            try:
+                stream = await client.chat_completion(
+                    messages=messages, response_format=response_format, stream=True
+                )
+                try:
+                    async for chunk in stream:
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            content += delta
+                            yield "delta", delta
+                finally:
+                    # Releases the model slot if the consumer stops early
+                    await stream.close()
+            except Exception as e:
+                self._failed(labels, e, i == last)
+                yield "escalate", {"tier": labels["tier"], "outcome": "error", "problems": [type(e).__name__]}
+                continue
+
+            parsed = extract_json_from_text(content)
+            done, outcome, problems = self._judge(labels, parsed, i == last)
+            if done:
+                yield "result", parsed
+                return
+            yield "escalate", {"tier": labels["tier"], "outcome": outcome, "problems": problems[:3]}
+
+
+def cascade_stats() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Per agent and tier: attempts, outcome counts and success rate."""
+    stats: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for (agent, tier, model, outcome), n in LLM_CASCADE.samples().items():
+        entry = stats.setdefault(agent, {}).setdefault(
+            tier, {"model": model, "attempts": 0, **{o: 0 for o in OUTCOMES}}
+        )
+        entry[outcome] = entry.get(outcome, 0) + int(n)
+        entry["attempts"] += int(n)
+    for tiers in stats.values():
+        for entry in tiers.values():
+            entry["success_rate"] = round(entry["accepted"] / entry["attempts"], 4) if entry["attempts"] else None
+    return stats
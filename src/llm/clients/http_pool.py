@@ -0,0 +1,254 @@
+"""Process-wide pooled HTTP client shared by all LLM agents.
+
+Every OpenAIClient used to build its own AsyncOpenAI, i.e. its own httpx
+connection pool with default limits: eight agents meant eight pools,
+redundant TLS handshakes and no bound on open sockets. The registry keeps
+one AsyncOpenAI per event loop on one tuned httpx pool (explicit connection
+limits, keep-alive, HTTP/2 when the h2 package is installed) and admits
+requests per model through a priority-ordered ModelLimiter (concurrency,
+RPM and TPM; see rate_limiter.py).
+
+Settings come from HTTP_CLIENT_CONFIGS in configs/model_configs.yaml:
+
+    max_connections, max_keepalive_connections, keepalive_expiry,
+    http2, connect_timeout, read_timeout,
+    model_concurrency: {default: 16, gpt-5-mini: 32, ...}
+
+and RATE_LIMIT_CONFIGS ({default: {rpm, tpm}, <model>: {rpm, tpm}}).
+
+httpx pools are bound to the loop that opened their sockets, so clients are
+kept per running loop (one in the API server; tests that call asyncio.run
+repeatedly get a fresh pool each time).
+"""
+
+import asyncio
+import importlib.util
+import logging
+import weakref
+from collections import defaultdict
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from src.global_configs import HTTP_CLIENT_CONFIGS, OPENAI_API_KEY, OPENAI_BASE_URL, RATE_LIMIT_CONFIGS
+from src.llm.clients.rate_limiter import DEFAULT_PRIORITY, ModelLimiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG = {
+    "max_connections": 100,
+    "max_keepalive_connections": 40,
+    "keepalive_expiry": 30.0,
+    "http2": True,
+    "connect_timeout": 10.0,
+    "read_timeout": 600.0,
+    "model_concurrency": {"default": 16},
+}
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class _LoopClients:
+    """AsyncOpenAI, transport and model limiters owned by one event loop."""
+
+    def __init__(self, openai: AsyncOpenAI, transport: httpx.AsyncHTTPTransport):
+        self.openai = openai
+        self.transport = transport
+        self.limiters: Dict[str, ModelLimiter] = {}
+
+
+class ClientRegistry:
+    """Shared AsyncOpenAI clients plus per-model admission limits and stats."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, api_key: Optional[str] = None,
+                 base_url: Optional[str] = None, rate_limits: Optional[Dict[str, Dict[str, float]]] = None):
+        config = config or {}
+        self.config = {
+            **DEFAULT_CONFIG,
+            **config,
+            "model_concurrency": {**DEFAULT_CONFIG["model_concurrency"], **config.get("model_concurrency", {})},
+        }
+        self.http2 = bool(self.config["http2"]) and HTTP2_AVAILABLE
+        self.api_key = api_key or OPENAI_API_KEY
+        self.base_url = base_url or OPENAI_BASE_URL
+        self.rate_limits = rate_limits if rate_limits is not None else RATE_LIMIT_CONFIGS
+        self._loops: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClients]" = weakref.WeakKeyDictionary()
+        self._calls = defaultdict(lambda: defaultdict(int))
+
+    # ------------------------------------------------------------------
+    # Clients
+    # ------------------------------------------------------------------
+    def _create(self) -> _LoopClients:
+        cfg = self.config
+        limits = httpx.Limits(
+            max_connections=cfg["max_connections"],
+            max_keepalive_connections=cfg["max_keepalive_connections"],
+            keepalive_expiry=cfg["keepalive_expiry"],
+        )
+        transport = httpx.AsyncHTTPTransport(limits=limits, http2=self.http2)
+        http_client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(cfg["read_timeout"], connect=cfg["connect_timeout"]),
+        )
+        # Retries are done by OpenAIClient so that every attempt passes the rate limiter
+        openai = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, http_client=http_client, max_retries=0)
+        return _LoopClients(openai, transport)
+
+    def _clients(self) -> _LoopClients:
+        loop = asyncio.get_running_loop()
+        clients = self._loops.get(loop)
+        if clients is None:
+            clients = self._create()
+            self._loops[loop] = clients
+            logger.info(
+                f"Created shared LLM HTTP pool (max_connections={self.config['max_connections']}, "
+                f"keepalive={self.config['max_keepalive_connections']}, http2={self.http2})"
+            )
+        return clients
+
+    def openai(self) -> AsyncOpenAI:
+        """The AsyncOpenAI client for the running event loop."""
+        return self._clients().openai
+
+    # ------------------------------------------------------------------
+    # Per-model limits
+    # ------------------------------------------------------------------
+    def model_limit(self, model: str) -> int:
+        limits = self.config["model_concurrency"]
+        return int(limits.get(model, limits["default"]))
+
+    def limiter(self, model: str) -> ModelLimiter:
+        """The running loop's limiter for model."""
+        clients = self._clients()
+        limiter = clients.limiters.get(model)
+        if limiter is None:
+            rates = self.rate_limits.get(model, self.rate_limits.get("default", {}))
+            limiter = ModelLimiter(self.model_limit(model), rates.get("rpm"), rates.get("tpm"))
+            clients.limiters[model] = limiter
+        return limiter
+
+    async def acquire(self, model: str, tokens: int = 0, priority: str = DEFAULT_PRIORITY) -> Callable[[], None]:
+        """
+        Wait for model's limiter to admit a request of ~tokens at priority.
+        Returns an idempotent release() that must be called once the request
+        (or its stream) is finished.
+        """
+        limiter = self.limiter(model)
+        await limiter.acquire(tokens, priority)
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                limiter.release()
+
+        return release
+
+    def observe(self, model: str, headers: Mapping[str, str], estimated: int = 0, actual: Optional[int] = None):
+        """Feed rate-limit headers and the actual token usage back to the limiter."""
+        limiter = self.limiter(model)
+        limiter.observe(headers)
+        limiter.settle(estimated, actual)
+
+    def throttle(self, model: str, headers: Mapping[str, str]):
+        """A 429 came back: pause the model's queue for the server's retry-after."""
+        self.limiter(model).throttle(headers)
+
+    def record_call(self, model: str, attempts: int, hedges: int = 0, hedge_wins: int = 0, failed: bool = False):
+        """Count one logical call and the upstream attempts it took."""
+        calls = self._calls[model]
+        calls["calls"] += 1
+        calls["attempts"] += attempts
+        calls[f"calls_with_{attempts}_attempts"] += 1
+        calls["hedges"] += hedges
+        calls["hedge_wins"] += hedge_wins
+        calls["failures"] += int(failed)
+
+    # ------------------------------------------------------------------
+    # Monitoring / shutdown
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        """Connection pool and per-model request counters."""
+        connections = idle = 0
+        limiters = {}
+        for clients in list(self._loops.values()):
+            pool = getattr(clients.transport, "_pool", None)
+            for conn in getattr(pool, "connections", []):
+                connections += 1
+                idle += int(conn.is_idle())
+            limiters.update(clients.limiters)
+        return {
+            "pool": {
+                "event_loops": len(self._loops),
+                "connections": connections,
+                "idle_connections": idle,
+                "active_connections": connections - idle,
+                "max_connections": self.config["max_connections"],
+                "max_keepalive_connections": self.config["max_keepalive_connections"],
+                "keepalive_expiry": self.config["keepalive_expiry"],
+                "http2": self.http2,
+            },
+            "models": {model: limiters[model].stats() for model in sorted(limiters)},
+            "calls": {model: dict(sorted(calls.items())) for model, calls in sorted(self._calls.items())},
+        }
+
+    async def aclose(self):
+        """Close the pool owned by the running loop."""
+        clients = self._loops.pop(asyncio.get_running_loop(), None)
+        if clients is not None:
+            await clients.openai.close()
+
+
+class SlotStream:
+    """
+    Async stream that holds its model slot until it is exhausted or closed.
+
+    on_chunk(chunk) sees every chunk, on_error(exc) a failure mid-stream;
+    release() runs exactly once at the end.
+    """
+
+    def __init__(self, stream, release: Callable[[], None],
+                 on_chunk: Optional[Callable[[Any], None]] = None,
+                 on_error: Optional[Callable[[BaseException], None]] = None):
+        self._stream = stream
+        self._release = release
+        self._on_chunk = on_chunk
+        self._on_error = on_error
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        try:
+            async for chunk in self._stream:
+                if self._on_chunk is not None:
+                    self._on_chunk(chunk)
+                yield chunk
+        except Exception as e:
+            if self._on_error is not None:
+                self._on_error(e)
+            raise
+        finally:
+            self._release()
+
+    async def close(self):
+        try:
+            await self._stream.close()
+        finally:
+            self._release()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+_registry: Optional[ClientRegistry] = None
+
+
+def get_client_registry() -> ClientRegistry:
+    """Process-wide registry configured from model_configs.yaml."""
+    global _registry
+    if _registry is None:
+        _registry = ClientRegistry(HTTP_CLIENT_CONFIGS)
+    return _registry
@@ -1,27 +1,221 @@
 """Async OpenAI client for chat completions."""
 
+import asyncio
+import logging
+import time
 from typing import Optional, List, Dict, Any
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, RateLimitError
+from openai.types.chat import ChatCompletion
 from src.global_configs import OPENAI_API_KEY
+from src.llm.clients.batch import CHAT_COMPLETIONS, RESPONSES, current_batch
+from src.llm.clients.http_pool import ClientRegistry, SlotStream, get_client_registry
+from src.llm.clients.rate_limiter import DEFAULT_PRIORITY, estimate_tokens
+from src.llm.clients.response_cache import ResponseCache, cache_key, get_response_cache
+from src.llm.clients.retry import DEFAULT_HEDGE_AFTER, LatencyTracker, RetryPolicy, hedged, is_retryable
+from src.utils.metrics import LLM_DURATION, LLM_ERRORS, LLM_REQUESTS, LLM_TOKENS, LLM_TTFT
+
+logger = logging.getLogger(__name__)
+
+
+def accepts_temperature(model: str) -> bool:
+    """False for models that reject a non-default temperature with a 400.
+
+    That is the gpt-5 reasoning family apart from gpt-5.1 (which takes it with
+    reasoning_effort "none"), and the mini models.
+    """
+    model = model.lower()
+    if model.startswith("gpt-5") and not model.startswith("gpt-5.1"):
+        return False
+    return "mini" not in model
 
 
 class OpenAIClient:
     """Async OpenAI client wrapper for chat completions."""
     
-    def __init__(self, config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        registry: Optional[ClientRegistry] = None,
+        cache: Optional[ResponseCache] = None,
+        agent: str = "unknown",
+    ):
         """Initialize the async OpenAI client.
         
         Args:
             config: Optional config dict with model parameters. If not provided,
                    uses defaults. Config keys: model, temperature, max_completion_tokens,
-                   top_p, frequency_penalty, presence_penalty, stream.
+                   top_p, frequency_penalty, presence_penalty, stream, and
+                   cache_ttl (seconds; enables the response cache for this client),
+                   priority ("interactive" or "batch"; interactive requests are
+                   admitted first when the model's rate limits are saturated),
+                   retry ({max_attempts, base_delay, max_delay}) and hedge
+                   (true, or {after: seconds}) for non-streamed calls, and
+                   prompt_cache_key (provider prompt-cache routing key; defaults
+                   to the agent name, since an agent's calls share its static
+                   prompt prefix).
+            registry: Client registry to share connections with (default: the
+                     process-wide one, so all agents use one HTTP pool).
+            cache: Response cache (default: the process-wide one from
+                  RESPONSE_CACHE_CONFIGS).
+            agent: Agent name used as the metrics label (e.g. "analysis_agent").
         """
         self.api_key = OPENAI_API_KEY
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY not found in global_configs")
         
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        self.registry = registry or get_client_registry()
         self.config = config or {}
+        self.cache = cache if cache is not None else get_response_cache()
+        self.retry = RetryPolicy.from_config(self.config.get("retry"))
+        self.latencies = LatencyTracker()
+        self.agent = agent
+    
+    @property
+    def client(self) -> AsyncOpenAI:
+        """Shared AsyncOpenAI for the running event loop."""
+        return self.registry.openai()
+    
+    async def _create(self, resource, params: Dict[str, Any]):
+        """Run resource.create(**params) once the model's limiter admits it.
+        
+        Rate-limit headers and actual token usage are fed back to the limiter;
+        streams keep their slot until they are fully consumed or closed.
+        """
+        model = params.get("model", "")
+        labels = {"agent": self.agent, "model": model}
+        tokens = estimate_tokens(params)
+        release = await self.registry.acquire(model, tokens, self.config.get("priority", DEFAULT_PRIORITY))
+        start = time.perf_counter()
+        try:
+            raw = await resource.with_raw_response.create(**params)
+            response = raw.parse()
+        except Exception as e:
+            release()
+            if isinstance(e, RateLimitError):
+                self.registry.throttle(model, e.response.headers)
+            self._record_error(labels, e)
+            raise
+        except BaseException:
+            # Cancelled (e.g. the losing half of a hedge): not an upstream error
+            release()
+            raise
+        usage = getattr(response, "usage", None)
+        self.registry.observe(model, raw.headers, tokens, getattr(usage, "total_tokens", None))
+        
+        if params.get("stream"):
+            first_token, failed = [], []
+            
+            def on_chunk(chunk):
+                if not first_token and _has_content(chunk):
+                    first_token.append(True)
+                    LLM_TTFT.observe(time.perf_counter() - start, **labels)
+                self._record_usage(labels, getattr(chunk, "usage", None))
+            
+            def on_error(e):
+                failed.append(e)
+                self._record_error(labels, e)
+            
+            def finish():
+                # The outcome is only known once the stream ends: count it here, once
+                release()
+                LLM_DURATION.observe(time.perf_counter() - start, **labels)
+                if not failed:
+                    LLM_REQUESTS.inc(status="ok", **labels)
+            
+            return SlotStream(response, _once(finish), on_chunk, on_error)
+        
+        release()
+        LLM_DURATION.observe(time.perf_counter() - start, **labels)
+        LLM_REQUESTS.inc(status="ok", **labels)
+        self._record_usage(labels, usage)
+        return response
+    
+    @staticmethod
+    def _record_error(labels: Dict[str, str], error: BaseException):
+        LLM_REQUESTS.inc(status="error", **labels)
+        LLM_ERRORS.inc(error=type(error).__name__, **labels)
+    
+    @staticmethod
+    def _record_usage(labels: Dict[str, str], usage):
+        """Count prompt/completion/reasoning/cached tokens (Chat Completions or Responses usage)."""
+        if usage is None:
+            return
+        prompt = getattr(usage, "prompt_tokens", None)
+        if prompt is None:
+            prompt = getattr(usage, "input_tokens", None)
+        completion = getattr(usage, "completion_tokens", None)
+        if completion is None:
+            completion = getattr(usage, "output_tokens", None)
+        prompt_details = getattr(usage, "prompt_tokens_details", None) or getattr(usage, "input_tokens_details", None)
+        completion_details = (getattr(usage, "completion_tokens_details", None)
+                              or getattr(usage, "output_tokens_details", None))
+        counts = {
+            "prompt": prompt,
+            "completion": completion,
+            "cached": getattr(prompt_details, "cached_tokens", None),
+            "reasoning": getattr(completion_details, "reasoning_tokens", None),
+        }
+        for kind, n in counts.items():
+            if n:
+                LLM_TOKENS.inc(n, kind=kind, **labels)
+        if prompt:
+            cached = counts["cached"] or 0
+            logger.info(
+                f"{labels['agent']} {labels['model']}: {prompt} prompt tokens, "
+                f"{cached} cached ({cached / prompt:.0%}), {completion or 0} completion"
+            )
+    
+    def _hedge_delay(self) -> Optional[float]:
+        """Seconds before a hedged duplicate is sent, or None when hedging is off."""
+        hedge = self.config.get("hedge")
+        if not hedge:
+            return None
+        if isinstance(hedge, dict) and hedge.get("after") is not None:
+            return float(hedge["after"])
+        p95 = self.latencies.p95()
+        return DEFAULT_HEDGE_AFTER if p95 is None else p95
+    
+    async def _call(self, resource, params: Dict[str, Any], endpoint: str = CHAT_COMPLETIONS):
+        """_create with the retry policy (and hedging, if configured).
+        
+        Streams get exactly one attempt. Attempt counts are recorded per model
+        in the registry stats. Under a BatchCollector the request is queued into
+        a batch job instead (never streamed) and the parsed result returned.
+        """
+        batch = current_batch()
+        if batch is not None:
+            response = await batch.request(endpoint, params, label=self.agent)
+            self._record_usage({"agent": self.agent, "model": params.get("model", "")}, response.usage)
+            return response
+        
+        if params.get("stream"):
+            return await self._create(resource, params)
+        
+        model = params.get("model", "")
+        hedge_after = self._hedge_delay()
+        attempts = hedges = hedge_wins = 0
+        for retry in range(self.retry.max_attempts):
+            if retry:
+                await asyncio.sleep(self.retry.backoff(retry))
+            start = time.perf_counter()
+            try:
+                if hedge_after is None:
+                    attempts += 1
+                    response = await self._create(resource, params)
+                else:
+                    response, started, won = await hedged(lambda: self._create(resource, params), hedge_after)
+                    attempts += started
+                    hedges += started - 1
+                    hedge_wins += int(won)
+            except Exception as e:
+                if not is_retryable(e) or retry == self.retry.max_attempts - 1:
+                    self.registry.record_call(model, attempts, hedges, hedge_wins, failed=True)
+                    raise
+                logger.warning(f"{model} attempt {retry + 1}/{self.retry.max_attempts} failed ({type(e).__name__}); retrying")
+                continue
+            self.latencies.add(time.perf_counter() - start)
+            self.registry.record_call(model, attempts, hedges, hedge_wins)
+            return response
     
     async def chat_completion(
         self,
@@ -95,6 +289,7 @@ class OpenAIClient:
             "reasoning_effort": reasoning_effort if reasoning_effort is not None else self.config.get("reasoning_effort"),
             "response_format": response_format if response_format is not None else self.config.get("response_format"),
             "verbosity": verbosity_value,
+            "prompt_cache_key": kwargs.pop("prompt_cache_key", None) if "prompt_cache_key" in kwargs else self.config.get("prompt_cache_key", self.agent),
         }
         
         # Remove None values to avoid sending them to API
@@ -104,9 +299,25 @@ class OpenAIClient:
         params.update(kwargs)
         
         model = params.get("model", "")
-        if "mini" in model.lower():
+        if not accepts_temperature(model):
             params.pop("temperature", None)
-        return await self.client.chat.completions.create(**params)
+        if params.get("stream") and "stream_options" not in params:
+            # Final chunk carries token usage for the metrics
+            params["stream_options"] = {"include_usage": True}
+        
+        # Identical non-streaming requests are served from the response cache
+        ttl = self.config.get("cache_ttl")
+        if not ttl or self.cache is None or params.get("stream"):
+            return await self._call(self.client.chat.completions, params)
+        
+        key = cache_key(params)
+        cached = await self.cache.get(key, label=model)
+        if cached is not None:
+            return ChatCompletion.model_validate_json(cached)
+        response = await self._call(self.client.chat.completions, params)
+        if response.choices and response.choices[0].finish_reason == "stop":
+            await self.cache.set(key, response.model_dump_json(), ttl, label=model)
+        return response
     
     async def responses_create(
         self,
@@ -154,4 +365,24 @@ class OpenAIClient:
         # Remove None values and add kwargs
         params = {k: v for k, v in {**params, **kwargs}.items() if v is not None}
         
-        return await self.client.responses.create(**params)
+        return await self._call(self.client.responses, params, endpoint=RESPONSES)
+
+
+def _once(fn):
+    """fn wrapped so that only the first call runs."""
+    called = []
+    
+    def wrapper():
+        if not called:
+            called.append(True)
+            fn()
+    
+    return wrapper
+
+
+def _has_content(chunk) -> bool:
+    """Whether a stream chunk carries generated text (chat delta or Responses text delta)."""
+    choices = getattr(chunk, "choices", None)
+    if choices:
+        return bool(getattr(choices[0].delta, "content", None))
+    return getattr(chunk, "type", "") == "response.output_text.delta"
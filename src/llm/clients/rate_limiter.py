@@ -0,0 +1,224 @@
+"""Client-side rate limiting and priority scheduling for upstream LLM calls.
+
+One ModelLimiter per model gates every request on three things:
+
+    concurrency  - max in-flight requests (HTTP_CLIENT_CONFIGS.model_concurrency)
+    RPM / TPM    - token buckets refilled continuously at limit / 60 per second
+                   (RATE_LIMIT_CONFIGS), re-synced from the x-ratelimit-*
+                   response headers and paused on 429 retry-after
+
+Waiting requests form one priority queue: only the head may go, so an
+interactive chat turn that arrives while a batch of reports is queued is
+served next instead of behind the batch. Token usage is estimated up front
+(prompt characters / 4 + max_completion_tokens) and corrected with the
+actual usage once the response is in.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import re
+import time
+from collections import defaultdict
+from typing import Any, Dict, Mapping, Optional
+
+PRIORITIES = {"interactive": 0, "batch": 1}
+DEFAULT_PRIORITY = "interactive"
+
+DEFAULT_COMPLETION_TOKENS = 1024
+CHARS_PER_TOKEN = 4
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """'6m0s' / '1.5s' / '20ms' (x-ratelimit-reset-* format) -> seconds."""
+    if not value:
+        return None
+    parts = _DURATION.findall(value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(n) * _UNITS[unit] for n, unit in parts)
+
+
+def estimate_tokens(params: Mapping[str, Any]) -> int:
+    """Rough token cost of a request before it is sent."""
+    prompt = params.get("messages", params.get("input", ""))
+    chars = len(prompt) if isinstance(prompt, str) else len(json.dumps(prompt, ensure_ascii=False, default=str))
+    completion = params.get("max_completion_tokens") or params.get("max_output_tokens") or DEFAULT_COMPLETION_TOKENS
+    return chars // CHARS_PER_TOKEN + int(completion)
+
+
+class TokenBucket:
+    """Continuous-refill bucket holding up to capacity units (a per-minute limit)."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until amount (capped at capacity) is available."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float, now: float):
+        self._refill(now)
+        self.level -= amount
+
+    def sync(self, limit: Optional[float], remaining: Optional[float], now: float):
+        """Adopt the server's view: its limit, and never more than it says remains."""
+        self._refill(now)
+        if limit:
+            self.capacity = float(limit)
+            self.rate = self.capacity / 60.0
+        if remaining is not None:
+            self.level = min(self.level, float(remaining))
+
+
+class ModelLimiter:
+    """Priority-ordered admission for one model: concurrency + RPM + TPM."""
+
+    def __init__(self, concurrency: int, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.paused_until = 0.0
+        self._queue = []
+        self._seq = itertools.count()
+        self._changed = asyncio.Event()
+
+        self.queued = defaultdict(int)
+        self.granted = defaultdict(int)
+        self.wait_seconds = defaultdict(float)
+        self.max_wait_seconds = defaultdict(float)
+        self.throttled = 0
+
+    def _notify(self):
+        """Wake every waiter so the (possibly new) head re-checks."""
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _delay(self, tokens: int, now: float) -> Optional[float]:
+        """0 if a request can go now, seconds to wait, or None (wait for a release)."""
+        if self.in_flight >= self.concurrency:
+            return None
+        delay = max(0.0, self.paused_until - now)
+        if self.requests is not None:
+            delay = max(delay, self.requests.delay(1, now))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.delay(tokens, now))
+        return delay
+
+    async def acquire(self, tokens: int = 0, priority: str = DEFAULT_PRIORITY):
+        """Wait until this request is at the head of the queue and within all limits."""
+        entry = (PRIORITIES[priority], next(self._seq), tokens)
+        heapq.heappush(self._queue, entry)
+        self._notify()
+        self.queued[priority] += 1
+        start = time.monotonic()
+        try:
+            while True:
+                now = time.monotonic()
+                delay = self._delay(tokens, now) if self._queue[0] is entry else None
+                if delay == 0:
+                    break
+                changed = self._changed
+                try:
+                    await asyncio.wait_for(changed.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+            self._notify()
+            raise
+        finally:
+            self.queued[priority] -= 1
+
+        heapq.heappop(self._queue)
+        now = time.monotonic()
+        if self.requests is not None:
+            self.requests.take(1, now)
+        if self.tokens is not None:
+            self.tokens.take(tokens, now)
+        self.in_flight += 1
+        waited = now - start
+        self.granted[priority] += 1
+        self.wait_seconds[priority] += waited
+        self.max_wait_seconds[priority] = max(self.max_wait_seconds[priority], waited)
+        self._notify()
+
+    def release(self):
+        self.in_flight -= 1
+        self._notify()
+
+    # ------------------------------------------------------------------
+    # Feedback from responses
+    # ------------------------------------------------------------------
+    def settle(self, estimated: int, actual: Optional[int]):
+        """Charge (or refund) the difference between estimated and actual tokens."""
+        if self.tokens is not None and actual is not None:
+            self.tokens.level -= actual - estimated
+
+    def observe(self, headers: Mapping[str, str]):
+        """Sync buckets from x-ratelimit-limit-* / x-ratelimit-remaining-* headers."""
+        now = time.monotonic()
+        for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+            limit = _number(headers.get(f"x-ratelimit-limit-{kind}"))
+            remaining = _number(headers.get(f"x-ratelimit-remaining-{kind}"))
+            if limit is None and remaining is None:
+                continue
+            if bucket is None:
+                bucket = TokenBucket(limit or remaining)
+                setattr(self, kind, bucket)
+            bucket.sync(limit, remaining, now)
+        self._notify()
+
+    def throttle(self, headers: Mapping[str, str]):
+        """After a 429: hold the whole queue until the server's retry-after passes."""
+        retry_ms = _number(headers.get("retry-after-ms"))
+        wait = retry_ms / 1000 if retry_ms is not None else parse_duration(headers.get("retry-after"))
+        if wait is None:
+            resets = [parse_duration(headers.get(f"x-ratelimit-reset-{k}")) for k in ("requests", "tokens")]
+            wait = max([r for r in resets if r is not None], default=1.0)
+        self.paused_until = max(self.paused_until, time.monotonic() + wait)
+        self.throttled += 1
+        self.observe(headers)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        for bucket in (self.requests, self.tokens):
+            if bucket is not None:
+                bucket._refill(now)
+        return {
+            "limit": self.concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": {p: self.queued[p] for p in PRIORITIES},
+            "granted": {p: self.granted[p] for p in PRIORITIES},
+            "total_wait_seconds": {p: round(self.wait_seconds[p], 3) for p in PRIORITIES},
+            "max_wait_seconds": {p: round(self.max_wait_seconds[p], 3) for p in PRIORITIES},
+            "rpm_available": None if self.requests is None else round(self.requests.level, 1),
+            "tpm_available": None if self.tokens is None else round(self.tokens.level, 1),
+            "throttled": self.throttled,
+            "paused_for_seconds": round(max(0.0, self.paused_until - now), 3),
+        }
+
+
+def _number(value) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
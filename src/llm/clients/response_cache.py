@@ -0,0 +1,155 @@
+"""Two-tier cache for deterministic chat completions.
+
+Routing, rewriting and the player / news analyses are often requested with
+byte-identical messages (repeat reports for popular players, common first
+questions). OpenAIClient looks such calls up here before going upstream:
+
+    memory  - LRU of the most recent responses (per process)
+    SQLite  - persistent tier shared across restarts and workers
+
+Keys are a SHA-256 of the canonical JSON of everything sent upstream
+(messages, model, sampling params, response_format, ...), so any change in
+the prompt or settings is a miss. Caching is opt-in per agent: set cache_ttl
+(seconds) in the agent's block of configs/model_configs.yaml. Global settings
+live in RESPONSE_CACHE_CONFIGS:
+
+    enabled, memory_entries, sqlite_path
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.global_configs import PROJECT_ROOT, RESPONSE_CACHE_CONFIGS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG = {
+    "enabled": True,
+    "memory_entries": 2048,
+    "sqlite_path": "cache/llm_responses.sqlite3",
+}
+
+
+def cache_key(params: Dict[str, Any]) -> str:
+    """SHA-256 of the canonical JSON of the request parameters."""
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """In-memory LRU in front of a SQLite table; values are JSON strings."""
+
+    def __init__(self, memory_entries: int = 2048, sqlite_path: Optional[Path] = None):
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._db = None
+        self._lock = threading.Lock()
+        if sqlite_path is not None:
+            sqlite_path = Path(sqlite_path)
+            sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(sqlite_path), check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+        self.counters = defaultdict(lambda: defaultdict(int))
+
+    def _count(self, label: str, event: str):
+        self.counters[label][event] += 1
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+    def _remember(self, key: str, value: str, expires_at: float):
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # SQLite tier (blocking; called in a worker thread)
+    # ------------------------------------------------------------------
+    def _disk_get(self, key: str):
+        with self._lock:
+            return self._db.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+
+    def _disk_set(self, key: str, value: str, expires_at: float):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    async def get(self, key: str, label: str = "default") -> Optional[str]:
+        """Cached value or None; label groups the hit/miss counters (e.g. model)."""
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                self._memory.move_to_end(key)
+                self._count(label, "memory_hits")
+                return entry[0]
+            del self._memory[key]
+
+        if self._db is not None:
+            row = await asyncio.to_thread(self._disk_get, key)
+            if row is not None and row[1] > now:
+                self._remember(key, row[0], row[1])
+                self._count(label, "disk_hits")
+                return row[0]
+
+        self._count(label, "misses")
+        return None
+
+    async def set(self, key: str, value: str, ttl: float, label: str = "default"):
+        expires_at = time.time() + ttl
+        self._remember(key, value, expires_at)
+        if self._db is not None:
+            await asyncio.to_thread(self._disk_set, key, value, expires_at)
+        self._count(label, "stores")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per label plus totals and the hit rate."""
+        events = ["memory_hits", "disk_hits", "misses", "stores"]
+        labels = {label: {e: counts[e] for e in events} for label, counts in self.counters.items()}
+        totals = {e: sum(c[e] for c in labels.values()) for e in events}
+        lookups = totals["memory_hits"] + totals["disk_hits"] + totals["misses"]
+        totals["hit_rate"] = round((lookups - totals["misses"]) / lookups, 4) if lookups else None
+        return {"memory_entries": len(self._memory), "totals": totals, "by_model": labels}
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide cache from RESPONSE_CACHE_CONFIGS, or None when disabled."""
+    global _cache
+    config = {**DEFAULT_CONFIG, **RESPONSE_CACHE_CONFIGS}
+    if not config["enabled"]:
+        return None
+    if _cache is None:
+        path = config["sqlite_path"]
+        if path:
+            path = Path(path)
+            path = path if path.is_absolute() else PROJECT_ROOT / path
+        _cache = ResponseCache(config["memory_entries"], path)
+        logger.info(f"LLM response cache: {config['memory_entries']} in memory, SQLite at {path}")
+    return _cache
@@ -0,0 +1,110 @@
+"""Retry and hedging policies for non-streamed LLM calls.
+
+The SDK's built-in retries are switched off (the shared client uses
+max_retries=0) so that every attempt goes through the model's rate limiter
+and follows the per-agent policy configured in model_configs.yaml:
+
+    retry:
+      max_attempts: 3      # 1 = no retries
+      base_delay: 0.5      # seconds; exponential backoff with full jitter
+      max_delay: 8.0
+    hedge: true            # or {after: 1.5} for a fixed delay
+
+Only transient failures are retried: connection errors and timeouts, 408,
+409, 429 and 5xx. Streams are never retried (chunks may already have reached
+the user).
+
+Hedging is meant for short calls (router, rewriter): if the first attempt
+has not answered after the p95 of recent latencies, an identical second
+request is sent and whichever finishes first wins; the other is cancelled.
+"""
+
+import asyncio
+import random
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import openai
+
+RETRYABLE_STATUS = {408, 409, 429}
+
+DEFAULT_RETRY = {"max_attempts": 3, "base_delay": 0.5, "max_delay": 8.0}
+
+# Hedge delay before enough latencies are recorded for a p95
+DEFAULT_HEDGE_AFTER = 2.0
+MIN_HEDGE_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, openai.APIConnectionError):       # includes APITimeoutError
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS or error.status_code >= 500
+    return False
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: sleep U(0, min(max_delay, base * 2^n))."""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "RetryPolicy":
+        return cls(**{**DEFAULT_RETRY, **(config or {})})
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number attempt (1-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class LatencyTracker:
+    """Recent successful-call latencies; p95 sets the hedge delay."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.samples = deque(maxlen=window)
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+
+    def p95(self) -> Optional[float]:
+        if len(self.samples) < MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+async def hedged(attempt: Callable[[], Awaitable[Any]], delay: float) -> Tuple[Any, int, bool]:
+    """
+    Run attempt(); if it has not finished after delay, start a second one
+    and return the first success (cancelling the other).
+
+    Returns (result, attempts started, whether the hedge won). If both
+    attempts fail, the last error is raised.
+    """
+    first = asyncio.ensure_future(attempt())
+    tasks = [first]
+    try:
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result(), 1, False
+
+        second = asyncio.ensure_future(attempt())
+        tasks.append(second)
+        pending = {first, second}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), 2, task is second
+        # Both failed: surface the hedge's error
+        return second.result(), 2, True
+    finally:
+        leftover = [task for task in tasks if not task.done()]
+        for task in leftover:
+            task.cancel()
+        if leftover:
+            await asyncio.gather(*leftover, return_exceptions=True)
@@ -0,0 +1,168 @@
+"""Offline bulk report generation through provider batch jobs.
+
+Runs ReportOrchestrator for many players under a BatchCollector
+(src/llm/clients/batch.py). Every stage of every pipeline goes out as one
+batch per endpoint (analysis + news, then news analysis, then the report)
+at batch pricing, and never takes interactive rate-limit capacity.
+
+Per-player state lives in <job_dir>/players.json:
+    {player_id: {"status": pending|running|done|failed, "stage": last agent,
+                 "error": ..., "report": "reports/<id>.json", "updated_at": ...}}
+Re-running with the same job directory skips finished players. Results
+already returned by earlier batches are reused, and batches that are
+still open are polled instead of resubmitted.
+
+    python -m src.llm.orchestrators.batch_report_runner --input watchlist.jsonl --job-dir batch_jobs/watchlist
+    python -m src.llm.orchestrators.batch_report_runner --ids 7161 8198 --job-dir batch_jobs/w2 --local
+"""
+
+import contextvars
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from src.llm.clients.batch import BatchCollector, OpenAIBatchBackend
+from src.llm.orchestrators.report_orchestrator import ReportOrchestrator
+
+logger = logging.getLogger(__name__)
+
+_player: contextvars.ContextVar = contextvars.ContextVar("batch_player", default=None)
+
+
+def player_key(player_data: Dict[str, Any]) -> str:
+    """Stable id of a player_data record (player_id, else basic_info.player_id, else name)."""
+    basic = player_data.get("basic_info") or {}
+    for value in (player_data.get("player_id"), basic.get("player_id"), player_data.get("name")):
+        if value is not None:
+            return str(value)
+    raise ValueError("player_data has no player_id or name")
+
+
+class BatchReportRunner:
+    """Generate reports for a list of players through batch jobs, resumably.
+
+    Args:
+        job_dir: Directory holding the job state, batch files and reports.
+        backend: Batch backend (default: OpenAIBatchBackend).
+        orchestrator: ReportOrchestrator to run per player.
+        poll_interval: Seconds between batch status checks.
+        settle: Seconds without new requests before a stage is submitted.
+    """
+
+    def __init__(
+        self,
+        job_dir,
+        backend=None,
+        orchestrator: Optional[ReportOrchestrator] = None,
+        poll_interval: float = 30.0,
+        settle: float = 0.2,
+    ):
+        self.job_dir = Path(job_dir)
+        self.collector = BatchCollector(
+            backend or OpenAIBatchBackend(), self.job_dir, poll_interval=poll_interval, settle=settle
+        )
+        self.collector.on_request = self._on_request
+        self.orchestrator = orchestrator or ReportOrchestrator()
+        (self.job_dir / "reports").mkdir(parents=True, exist_ok=True)
+        self.state_path = self.job_dir / "players.json"
+        self.players: Dict[str, Dict[str, Any]] = {}
+        if self.state_path.exists():
+            with open(self.state_path, encoding="utf-8") as f:
+                self.players = json.load(f)
+
+    def _save(self):
+        tmp = self.state_path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.players, f, indent=2)
+        tmp.replace(self.state_path)
+
+    def _update(self, key: str, save: bool = True, **fields):
+        entry = self.players.setdefault(key, {"status": "pending"})
+        entry.update(fields, updated_at=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        if save:
+            self._save()
+
+    def _on_request(self, label: str, custom_id: str):
+        key = _player.get()
+        if key is not None:
+            # Stage changes are persisted with the next status change
+            self._update(key, save=False, stage=label)
+
+    async def run(self, players: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Generate every player's report not already done; returns counts per status."""
+        todo = {}
+        for player_data in players:
+            key = player_key(player_data)
+            if self.players.get(key, {}).get("status") == "done":
+                continue
+            todo[key] = player_data
+            self._update(key, save=False, status="pending")
+        self._save()
+        logger.info(f"Batch report job {self.job_dir}: {len(todo)} players to generate")
+
+        await self.collector.drive([self._generate(key, data) for key, data in todo.items()])
+        return self.summary()
+
+    async def _generate(self, key: str, player_data: Dict[str, Any]):
+        _player.set(key)
+        self._update(key, status="running", error=None)
+        try:
+            basic = player_data.get("basic_info") or {}
+            report = await self.orchestrator.generate_player_report(
+                player_data=player_data,
+                player_name=player_data.get("name") or basic.get("name"),
+                club=basic.get("current_club_name"),
+            )
+        except Exception as e:
+            logger.warning(f"Batch report for player {key} failed: {e}")
+            self._update(key, status="failed", error=str(e))
+            return
+        path = self.job_dir / "reports" / f"{key}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        self._update(key, status="done", report=str(path.relative_to(self.job_dir)))
+
+    def summary(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for entry in self.players.values():
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        return counts
+
+
+# ---------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------
+def _load_players(input_path: Optional[str], ids):
+    if input_path:
+        with open(input_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    from src.json_generator.build_player_json import build_player_massive_json, load_all_data
+    shap_df, scores_df, mlr_df, players_df = load_all_data()
+    return [build_player_massive_json(pid, shap_df, scores_df, mlr_df, players_df) for pid in ids]
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+
+    from src.llm.clients.batch import LocalBatchProcessor
+
+    parser = argparse.ArgumentParser(description="Generate player reports offline through batch jobs.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", type=str, help="JSONL file with one player_data record per line.")
+    source.add_argument("--ids", type=int, nargs="+", help="Player ids, built from the model data.")
+    parser.add_argument("--job-dir", type=str, required=True, help="Job directory (reuse it to resume).")
+    parser.add_argument("--poll-interval", type=float, default=30.0, help="Seconds between status checks.")
+    parser.add_argument("--completion-window", type=str, default="24h")
+    parser.add_argument(
+        "--local", action="store_true",
+        help="Process batches locally against OPENAI_BASE_URL (e.g. the stub server) instead of the Batch API.",
+    )
+    args = parser.parse_args()
+
+    backend = LocalBatchProcessor() if args.local else OpenAIBatchBackend(completion_window=args.completion_window)
+    runner = BatchReportRunner(args.job_dir, backend=backend, poll_interval=args.poll_interval)
+    counts = asyncio.run(runner.run(_load_players(args.input, args.ids)))
+    print(json.dumps({"players": counts, "batches": runner.collector.stats}, indent=2))
@@ -1,6 +1,8 @@
 """Orchestrator for coordinating all report generation agents."""
 
-from typing import Dict, Any, Optional, List
+import asyncio
+import logging
+from typing import Dict, Any, Optional, List, AsyncIterator, Tuple
 from src.llm.agents.report import (
     AnalysisAgent,
     NewsAgent,
@@ -13,6 +15,10 @@ from src.global_configs import (
     NEWS_ANALYSIS_AGENT_CONFIGS,
     GENERATOR_AGENT_CONFIGS
 )
+from src.llm.clients.response_cache import cache_key
+from src.utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
 
 
 class ReportOrchestrator:
@@ -37,6 +43,19 @@ class ReportOrchestrator:
         self.news_agent = NewsAgent(config=news_config or NEWS_AGENT_CONFIGS)
         self.news_analysis_agent = NewsAnalysisAgent(config=news_analysis_config or NEWS_ANALYSIS_AGENT_CONFIGS)
         self.generator_agent = GeneratorAgent(config=generator_config or GENERATOR_AGENT_CONFIGS)
+        
+        # Identical concurrent requests share one pipeline run. The key covers the
+        # inputs plus every agent's prompts and model config, so a prompt or model
+        # change never joins a run started with the old version.
+        self._single_flight = SingleFlight()
+        self.pipeline_version = cache_key({
+            type(agent).__name__: {
+                "config": agent.config,
+                "system_prompt": getattr(agent, "system_prompt", None),
+                "user_prompt": getattr(agent, "user_prompt_template", None),
+            }
+            for agent in (self.analysis_agent, self.news_agent, self.news_analysis_agent, self.generator_agent)
+        })
     
     async def generate_player_report(
         self,
@@ -46,6 +65,10 @@ class ReportOrchestrator:
     ) -> Dict[str, Any]:
         """Generate a complete player report by orchestrating all agents.
         
+        Concurrent calls with identical inputs (e.g. two scouts opening the same
+        player, or a frontend retry) await one shared run; it completes for the
+        remaining callers even if one of them disconnects.
+        
         Args:
             player_data: Combined player stats and ML model output in one JSON dict.
                        Should contain player statistics and ML predictions.
@@ -58,6 +81,44 @@ class ReportOrchestrator:
         Raises:
             ValueError: If player_name cannot be determined from player_data
         """
+        player_name, club = self._resolve_player(player_data, player_name, club)
+        key = cache_key({
+            "player_data": player_data,
+            "player_name": player_name,
+            "club": club,
+            "pipeline": self.pipeline_version,
+        })
+        return await self._single_flight.do(
+            key, lambda: self._run_pipeline(player_data, player_name, club)
+        )
+    
+    def stream_player_report(
+        self,
+        player_data: Dict[str, Any],
+        player_name: Optional[str] = None,
+        club: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Generate a player report, streaming progress and report sections.
+        
+        Runs the same pipeline as generate_player_report (not shared with
+        concurrent identical calls) and returns an async iterator of events:
+        ("stage", {"stage": "analysis" | "news_analysis" | "report"}) as each step
+        starts, then GeneratorAgent.stream_report's "section" / "reset" events and
+        the final ("report", report).
+        
+        Raises:
+            ValueError: Immediately, if player_name cannot be determined from player_data
+        """
+        player_name, club = self._resolve_player(player_data, player_name, club)
+        return self._stream_pipeline(player_data, player_name, club)
+    
+    @staticmethod
+    def _resolve_player(
+        player_data: Dict[str, Any],
+        player_name: Optional[str],
+        club: Optional[str]
+    ) -> Tuple[str, Optional[str]]:
+        """player_name and club, falling back to player_data['player_info']."""
         # Extract player_name and club from player_data if not provided
         if not player_name:
             player_info = player_data.get("player_info", {})
@@ -68,10 +129,62 @@ class ReportOrchestrator:
         if not club:
             player_info = player_data.get("player_info", {})
             club = player_info.get("club")
+        return player_name, club
+    
+    async def _run_pipeline(
+        self,
+        player_data: Dict[str, Any],
+        player_name: str,
+        club: Optional[str]
+    ) -> Dict[str, Any]:
+        """The four-agent pipeline behind generate_player_report."""
+        player_analysis, news_articles = await self._analyze(player_data, player_name, club)
+        news_analysis = await self._analyze_news(news_articles)
         
-        # Step 1 & 2: Run analysis and news fetching in parallel
-        import asyncio
+        # Step 4: Generate final report
+        try:
+            final_report = await self.generator_agent.generate_report(
+                player_analysis=player_analysis,
+                news_articles=news_articles,
+                news_analysis=news_analysis
+            )
+            return final_report
+        except Exception as e:
+            logger.error(f"Generator agent failed: {e}")
+            raise RuntimeError(f"Failed to generate final report: {e}") from e
+    
+    async def _stream_pipeline(
+        self,
+        player_data: Dict[str, Any],
+        player_name: str,
+        club: Optional[str]
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """The pipeline behind stream_player_report."""
+        yield "stage", {"stage": "analysis"}
+        player_analysis, news_articles = await self._analyze(player_data, player_name, club)
+        yield "stage", {"stage": "news_analysis"}
+        news_analysis = await self._analyze_news(news_articles)
         
+        # Step 4: Stream the final report
+        yield "stage", {"stage": "report"}
+        try:
+            async for event in self.generator_agent.stream_report(
+                player_analysis=player_analysis,
+                news_articles=news_articles,
+                news_analysis=news_analysis
+            ):
+                yield event
+        except Exception as e:
+            logger.error(f"Generator agent failed: {e}")
+            raise RuntimeError(f"Failed to generate final report: {e}") from e
+    
+    async def _analyze(
+        self,
+        player_data: Dict[str, Any],
+        player_name: str,
+        club: Optional[str]
+    ) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Steps 1 & 2: player analysis and news fetching, in parallel."""
         # Run analysis and news fetching concurrently
         analysis_task = self.analysis_agent.analyze(player_data)
         news_task = self.news_agent.fetch_news(player_name, club)
@@ -87,39 +200,18 @@ class ReportOrchestrator:
             raise RuntimeError(f"Analysis agent failed: {player_analysis}") from player_analysis
         if isinstance(news_articles, Exception):
             # News fetching failure is not critical, continue with empty list
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"News agent failed: {news_articles}. Continuing with empty news list.")
             news_articles = []
-        
-        # Step 3: Analyze news (if we have news articles)
+        return player_analysis, news_articles
+    
+    async def _analyze_news(self, news_articles: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Step 3: analyze news (if we have news articles)."""
         if news_articles:
             try:
-                news_analysis = await self.news_analysis_agent.analyze(news_articles)
+                return await self.news_analysis_agent.analyze(news_articles)
             except Exception as e:
-                import logging
-                logger = logging.getLogger(__name__)
                 logger.warning(f"News analysis agent failed: {e}. Continuing with empty news analysis.")
-                news_analysis = {
-                    "analysis": ""
-                }
-        else:
-            # Empty news analysis if no news articles
-            news_analysis = {
-                "analysis": ""
-            }
-        
-        # Step 4: Generate final report
-        try:
-            final_report = await self.generator_agent.generate_report(
-                player_analysis=player_analysis,
-                news_articles=news_articles,
-                news_analysis=news_analysis
-            )
-            return final_report
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Generator agent failed: {e}")
-            raise RuntimeError(f"Failed to generate final report: {e}") from e
-
+        # Empty news analysis if no news articles
+        return {
+            "analysis": ""
+        }
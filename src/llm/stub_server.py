@@ -0,0 +1,410 @@
+"""Local OpenAI-compatible stub server for offline load and latency testing.
+
+Implements the two endpoints the agents use:
+
+    POST /v1/chat/completions   streamed (SSE) and non-streamed; json_schema
+                                response formats get a generated instance that
+                                conforms to the request's schema (i.e. the
+                                schemas in configs/schemas)
+    POST /v1/responses          Responses API incl. the web_search tool
+                                (a web_search_call item plus cited output)
+
+Latency is simulated per request: time to first token, then tokens at a
+fixed rate, plus optional jitter. Prompt caching is simulated like the
+provider's: usage reports as cached_tokens the longest prefix (at least 1024
+tokens, in 128-token steps) already sent to the same model. Errors can be injected at a given rate
+(5xx, or 429 with retry-after headers). x-ratelimit-* headers are sent like
+the real API so the client-side limiter can be exercised.
+
+Run it and point the app at it:
+
+    python -m src.llm.stub_server --port 8001 --ttft-ms 400 --tokens-per-second 60 --error-rate 0.02
+    OPENAI_BASE_URL=http://127.0.0.1:8001/v1 uvicorn src.api.main:app
+
+In-process (tests, benchmarks):
+
+    with run_in_thread(StubConfig(ttft_ms=0)) as base_url:
+        registry = ClientRegistry(base_url=base_url)
+"""
+
+import asyncio
+import contextlib
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+CHARS_PER_TOKEN = 4
+DEFAULT_COMPLETION_TOKENS = 60
+PROMPT_CACHE_MIN_TOKENS = 1024
+PROMPT_CACHE_STEP_TOKENS = 128
+
+
+class StubConfig:
+    """Latency and error-injection settings (all times in milliseconds)."""
+
+    def __init__(
+        self,
+        ttft_ms: float = 300.0,
+        tokens_per_second: float = 80.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        retry_after_ms: float = 500.0,
+        completion_tokens: int = DEFAULT_COMPLETION_TOKENS,
+        rpm_limit: int = 10_000,
+        tpm_limit: int = 10_000_000,
+        seed: Optional[int] = None,
+        prompt_caching: bool = True,
+    ):
+        self.ttft_ms = ttft_ms
+        self.tokens_per_second = tokens_per_second
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after_ms = retry_after_ms
+        self.completion_tokens = completion_tokens
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+        self.rng = random.Random(seed)
+        self.prompt_caching = prompt_caching
+
+
+# ---------------------------------------------------------
+# Content generation
+# ---------------------------------------------------------
+def _resolve(schema: Dict[str, Any], root: Dict[str, Any]) -> Dict[str, Any]:
+    ref = schema.get("$ref")
+    if not ref:
+        return schema
+    node = root
+    for part in ref.lstrip("#/").split("/"):
+        node = node[part]
+    return _resolve(node, root)
+
+
+def example_from_schema(schema: Dict[str, Any], rng: random.Random, root: Optional[Dict[str, Any]] = None,
+                        name: str = "value") -> Any:
+    """A value that validates against schema (the subset used by strict structured outputs)."""
+    root = root or schema
+    schema = _resolve(schema, root)
+    for combinator in ("anyOf", "oneOf", "allOf"):
+        if combinator in schema:
+            return example_from_schema(schema[combinator][0], rng, root, name)
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    if "const" in schema:
+        return schema["const"]
+
+    kind = schema.get("type", "object" if "properties" in schema else "string")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+
+    if kind == "object":
+        return {
+            key: example_from_schema(sub, rng, root, key)
+            for key, sub in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        n = max(schema.get("minItems", 0), min(2, schema.get("maxItems", 2)))
+        return [example_from_schema(schema.get("items", {}), rng, root, name) for _ in range(n)]
+    if kind == "integer":
+        return rng.randint(int(schema.get("minimum", 0)), int(schema.get("maximum", 100)))
+    if kind == "number":
+        return round(rng.uniform(schema.get("minimum", 0.0), schema.get("maximum", 100.0)), 2)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    if kind == "null":
+        return None
+    fmt = schema.get("format")
+    if fmt == "date-time":
+        return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    if fmt == "date":
+        return date.today().isoformat()
+    if fmt == "uri":
+        return f"https://example.com/{name}"
+    if "description" in schema:
+        # Described fields are narrative sections: write a paragraph, not a label
+        return _text(rng.randint(40, 60), rng)
+    return f"Stub {name.replace('_', ' ')} {rng.randint(1, 999)}."
+
+
+def _text(n_tokens: int, rng: random.Random) -> str:
+    words = ["The", "player", "shows", "steady", "growth", "in", "output", "and", "market", "value", "this", "season"]
+    return " ".join(rng.choice(words) for _ in range(n_tokens)) + "."
+
+
+def _prompt_text(messages: Any) -> str:
+    return messages if isinstance(messages, str) else json.dumps(messages, ensure_ascii=False)
+
+
+def _prompt_tokens(messages: Any) -> int:
+    return max(1, len(_prompt_text(messages)) // CHARS_PER_TOKEN)
+
+
+class PromptCache:
+    """Prompt prefixes seen per model; lookup() returns the cached token count."""
+
+    def __init__(self):
+        self._seen = set()
+
+    def lookup(self, model: str, messages: Any) -> int:
+        text = _prompt_text(messages)
+        cached = 0
+        tokens = PROMPT_CACHE_MIN_TOKENS
+        while tokens * CHARS_PER_TOKEN <= len(text):
+            key = (model, hash(text[:tokens * CHARS_PER_TOKEN]))
+            if key in self._seen:
+                cached = tokens
+            self._seen.add(key)
+            tokens += PROMPT_CACHE_STEP_TOKENS
+        return cached
+
+
+def _content(body: Dict[str, Any], config: StubConfig) -> str:
+    """Response text: schema instance for json_schema, a JSON object for json_object, else prose."""
+    fmt = body.get("response_format") or (body.get("text") or {}).get("format") or {}
+    if fmt.get("type") == "json_schema":
+        spec = fmt.get("json_schema", fmt)
+        return json.dumps(example_from_schema(spec.get("schema", {}), config.rng))
+    if fmt.get("type") == "json_object":
+        return json.dumps({"result": _text(8, config.rng)})
+    limit = body.get("max_completion_tokens") or body.get("max_output_tokens") or config.completion_tokens
+    return _text(min(config.completion_tokens, int(limit)), config.rng)
+
+
+def _chunks(text: str) -> List[str]:
+    """Split into ~token-sized pieces (whitespace kept with the following word)."""
+    pieces, start = [], 0
+    for i in range(1, len(text)):
+        if text[i] == " " or i - start >= CHARS_PER_TOKEN:
+            pieces.append(text[start:i])
+            start = i
+    pieces.append(text[start:])
+    return pieces
+
+
+# ---------------------------------------------------------
+# App
+# ---------------------------------------------------------
+def create_app(config: Optional[StubConfig] = None) -> FastAPI:
+    config = config or StubConfig()
+    app = FastAPI(title="OpenAI stub")
+    app.state.config = config
+    app.state.requests = 0
+    app.state.prompt_cache = PromptCache()
+
+    def headers(tokens: int) -> Dict[str, str]:
+        return {
+            "x-request-id": f"req_{uuid.uuid4().hex[:16]}",
+            "x-ratelimit-limit-requests": str(config.rpm_limit),
+            "x-ratelimit-remaining-requests": str(config.rpm_limit - 1),
+            "x-ratelimit-reset-requests": "6ms",
+            "x-ratelimit-limit-tokens": str(config.tpm_limit),
+            "x-ratelimit-remaining-tokens": str(max(0, config.tpm_limit - tokens)),
+            "x-ratelimit-reset-tokens": "1ms",
+        }
+
+    async def first_token():
+        jitter = config.rng.uniform(-config.jitter_ms, config.jitter_ms) if config.jitter_ms else 0.0
+        await asyncio.sleep(max(0.0, config.ttft_ms + jitter) / 1000)
+
+    def token_delay() -> float:
+        return 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+
+    def injected_error() -> Optional[JSONResponse]:
+        if config.error_rate <= 0 or config.rng.random() >= config.error_rate:
+            return None
+        status = config.error_status
+        extra = {"retry-after-ms": str(int(config.retry_after_ms))} if status == 429 else {}
+        kind = "rate_limit_exceeded" if status == 429 else "server_error"
+        return JSONResponse(
+            {"error": {"message": f"Injected stub error ({status})", "type": kind, "code": kind}},
+            status_code=status,
+            headers={**headers(0), **extra},
+        )
+
+    def cached_tokens(model: str, messages: Any) -> int:
+        return app.state.prompt_cache.lookup(model, messages) if config.prompt_caching else 0
+
+    def usage(prompt: int, completion: int, cached: int = 0, responses_api: bool = False) -> Dict[str, Any]:
+        if responses_api:
+            return {
+                "input_tokens": prompt, "output_tokens": completion, "total_tokens": prompt + completion,
+                "input_tokens_details": {"cached_tokens": cached},
+                "output_tokens_details": {"reasoning_tokens": 0},
+            }
+        return {
+            "prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion,
+            "prompt_tokens_details": {"cached_tokens": cached},
+            "completion_tokens_details": {"reasoning_tokens": 0},
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        app.state.requests += 1
+        body = await request.json()
+        error = injected_error()
+        if error is not None:
+            await first_token()
+            return error
+
+        model = body.get("model", "stub")
+        content = _content(body, config)
+        pieces = _chunks(content)
+        prompt = _prompt_tokens(body.get("messages", []))
+        cached = cached_tokens(model, body.get("messages", []))
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        if not body.get("stream"):
+            await first_token()
+            await asyncio.sleep(token_delay() * len(pieces))
+            return JSONResponse({
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content, "refusal": None}}],
+                "usage": usage(prompt, len(pieces), cached),
+            }, headers=headers(prompt + len(pieces)))
+
+        include_usage = (body.get("stream_options") or {}).get("include_usage")
+
+        async def events():
+            def chunk(delta, finish=None):
+                return "data: " + json.dumps({
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                }) + "\n\n"
+
+            await first_token()
+            yield chunk({"role": "assistant", "content": ""})
+            for i, piece in enumerate(pieces):
+                if i:
+                    await asyncio.sleep(token_delay())
+                yield chunk({"content": piece})
+            yield chunk({}, "stop")
+            if include_usage:
+                yield "data: " + json.dumps({
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [], "usage": usage(prompt, len(pieces), cached),
+                }) + "\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream", headers=headers(prompt))
+
+    @app.post("/v1/responses")
+    async def responses(request: Request):
+        app.state.requests += 1
+        body = await request.json()
+        error = injected_error()
+        if error is not None:
+            await first_token()
+            return error
+
+        model = body.get("model", "stub")
+        prompt = _prompt_tokens(body.get("input", ""))
+        cached = cached_tokens(model, body.get("input", ""))
+        output: List[Dict[str, Any]] = []
+        annotations: List[Dict[str, Any]] = []
+        searching = any(t.get("type", "").startswith("web_search") for t in body.get("tools") or [])
+        if searching:
+            output.append({
+                "id": f"ws_{uuid.uuid4().hex[:16]}", "type": "web_search_call", "status": "completed",
+                "action": {"type": "search", "query": str(body.get("input", ""))[:120]},
+            })
+            # News-shaped payload, the format news_agent asks for
+            articles = [
+                {
+                    "title": f"Stub headline {i}",
+                    "summary": _text(20, config.rng),
+                    "date": date.today().isoformat(),
+                    "source": f"https://news.example.com/story-{i}",
+                    "relevance": config.rng.choice(["high", "medium", "low"]),
+                }
+                for i in range(1, 4)
+            ]
+            text = json.dumps({"news": articles})
+            for article in articles:
+                start = text.index(article["source"])
+                annotations.append({
+                    "type": "url_citation", "url": article["source"], "title": article["title"],
+                    "start_index": start, "end_index": start + len(article["source"]),
+                })
+        else:
+            text = _content(body, config)
+
+        pieces = _chunks(text)
+        await first_token()
+        await asyncio.sleep(token_delay() * len(pieces))
+        output.append({
+            "id": f"msg_{uuid.uuid4().hex[:16]}", "type": "message", "role": "assistant", "status": "completed",
+            "content": [{"type": "output_text", "text": text, "annotations": annotations}],
+        })
+        return JSONResponse({
+            "id": f"resp_{uuid.uuid4().hex[:24]}", "object": "response", "created_at": int(time.time()),
+            "model": model, "status": "completed", "output": output,
+            "parallel_tool_calls": True, "tool_choice": body.get("tool_choice", "auto"),
+            "tools": body.get("tools") or [], "usage": usage(prompt, len(pieces), cached, responses_api=True),
+        }, headers=headers(prompt + len(pieces)))
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "stub", "object": "model", "created": 0, "owned_by": "stub"}]}
+
+    return app
+
+
+@contextlib.contextmanager
+def run_in_thread(config: Optional[StubConfig] = None, host: str = "127.0.0.1") -> Iterator[str]:
+    """Serve the stub on a free port in a background thread; yields its base URL (…/v1)."""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(create_app(config), host=host, port=0, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://{host}:{port}/v1"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+# ---------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub server.")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--ttft-ms", type=float, default=300.0, help="Time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0, help="Generation speed (0 = instant)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter on the TTFT")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=500, help="Status of injected errors (e.g. 500, 503, 429)")
+    parser.add_argument("--retry-after-ms", type=float, default=500.0, help="retry-after-ms sent with injected 429s")
+    parser.add_argument("--completion-tokens", type=int, default=DEFAULT_COMPLETION_TOKENS,
+                        help="Length of free-text answers")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--no-prompt-caching", action="store_true", help="Always report 0 cached tokens")
+    args = parser.parse_args()
+
+    stub = StubConfig(
+        ttft_ms=args.ttft_ms, tokens_per_second=args.tokens_per_second, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, error_status=args.error_status, retry_after_ms=args.retry_after_ms,
+        completion_tokens=args.completion_tokens, seed=args.seed, prompt_caching=not args.no_prompt_caching,
+    )
+    print(f"OpenAI stub on http://{args.host}:{args.port}/v1 — set OPENAI_BASE_URL to use it")
+    uvicorn.run(create_app(stub), host=args.host, port=args.port, log_level="warning")
@@ -1,4 +1,10 @@
+import hashlib
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+GROWTH_FIELD = "growth_potential_score"
+
 
 def load_jsonl(path):
     data = {}
@@ -11,13 +17,15 @@ def load_jsonl(path):
 
 
 def strip_growth(p):
-    """Return a deep copy of player p without growth_potential_score."""
-    p2 = json.loads(json.dumps(p))  # deep copy
-    try:
-        if "growth_potential_score" in p2.get("basic_info", {}):
-            del p2["basic_info"]["growth_potential_score"]
-    except:
-        pass
+    """Return a copy of player p without growth_potential_score.
+
+    Only the top level and basic_info are copied; the rest of the record is
+    shared with p, which is fine because nothing here mutates it.
+    """
+    p2 = dict(p)
+    basic_info = p2.get("basic_info")
+    if isinstance(basic_info, dict) and GROWTH_FIELD in basic_info:
+        p2["basic_info"] = {k: v for k, v in basic_info.items() if k != GROWTH_FIELD}
     return p2
 
 
@@ -53,11 +61,185 @@ def compare_files(file1, file2):
         print("Players with mismatches:", mismatches)
 
 
+# ---------------------------------------------------------
+# Streaming mode: per-player digests over byte-range chunks
+# ---------------------------------------------------------
+
+def record_digest(p):
+    """Digest of a canonical serialization (sorted keys, no whitespace)."""
+    canonical = json.dumps(p, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).digest()
+
+
+def chunk_ranges(path, n_chunks):
+    """Split a file into ~n_chunks byte ranges that start and end on line boundaries."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    n_chunks = max(1, min(n_chunks, size))
+    step = size // n_chunks
+
+    boundaries = [0]
+    with open(path, "rb") as f:
+        for i in range(1, n_chunks):
+            f.seek(i * step)
+            f.readline()  # move to the start of the next full line
+            pos = f.tell()
+            if pos > boundaries[-1] and pos < size:
+                boundaries.append(pos)
+    boundaries.append(size)
+
+    return [(boundaries[i], boundaries[i + 1]) for i in range(len(boundaries) - 1)]
+
+
+def index_chunk(path, start, end, remove_growth):
+    """Return [(player_id, digest, byte_offset), ...] for every line in [start, end)."""
+    entries = []
+    with open(path, "rb") as f:
+        f.seek(start)
+        offset = start
+        while offset < end:
+            line = f.readline()
+            if not line:
+                break
+            if line.strip():
+                p = json.loads(line)
+                if remove_growth:
+                    # p was freshly parsed from this line, so stripping in place is safe
+                    basic_info = p.get("basic_info")
+                    if isinstance(basic_info, dict):
+                        basic_info.pop(GROWTH_FIELD, None)
+                entries.append((p.get("player_id"), record_digest(p), offset))
+            offset += len(line)
+    return entries
+
+
+def build_index(path, remove_growth, workers=1, chunks_per_worker=4):
+    """Map player_id -> (digest, byte_offset). Later lines win, as in load_jsonl."""
+    ranges = chunk_ranges(path, max(1, workers * chunks_per_worker))
+
+    if workers > 1 and len(ranges) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(index_chunk, path, start, end, remove_growth)
+                for start, end in ranges
+            ]
+            chunk_entries = [fut.result() for fut in futures]
+    else:
+        chunk_entries = [index_chunk(path, start, end, remove_growth) for start, end in ranges]
+
+    index = {}
+    for entries in chunk_entries:  # chunks are in file order
+        for pid, digest, offset in entries:
+            index[pid] = (digest, offset)
+    return index
+
+
+def read_record_at(path, offset):
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return json.loads(f.readline())
+
+
+def field_diff(a, b, path=""):
+    """Yield (path, value_a, value_b) for every leaf that differs between a and b."""
+    if isinstance(a, dict) and isinstance(b, dict):
+        for key in sorted(set(a) | set(b), key=str):
+            sub = f"{path}.{key}" if path else str(key)
+            if key not in a:
+                yield sub, "<missing>", b[key]
+            elif key not in b:
+                yield sub, a[key], "<missing>"
+            else:
+                yield from field_diff(a[key], b[key], sub)
+    elif isinstance(a, list) and isinstance(b, list):
+        for i in range(max(len(a), len(b))):
+            sub = f"{path}[{i}]"
+            if i >= len(a):
+                yield sub, "<missing>", b[i]
+            elif i >= len(b):
+                yield sub, a[i], "<missing>"
+            else:
+                yield from field_diff(a[i], b[i], sub)
+    elif a != b:
+        yield path, a, b
+
+
+def compare_files_streaming(file1, file2, workers=None, max_field_diffs=20, verbose=True):
+    """Bounded-memory variant of compare_files.
+
+    Only (player_id, digest, offset) is kept per record; full records are
+    re-read from disk for players whose digests differ.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    index1 = build_index(file1, remove_growth=False, workers=workers)
+    index2 = build_index(file2, remove_growth=True, workers=workers)
+
+    missing_in_2 = set(index1) - set(index2)
+    missing_in_1 = set(index2) - set(index1)
+
+    if verbose and missing_in_2:
+        print("❌ Players missing in second file:", missing_in_2)
+    if verbose and missing_in_1:
+        print("❌ Players missing in first file:", missing_in_1)
+
+    mismatches = []
+    diffs = {}
+
+    common = [pid for pid in index1 if pid in index2]
+    for pid in sorted(common, key=lambda x: (x is None, str(type(x)), x if x is not None else 0)):
+        digest1, offset1 = index1[pid]
+        digest2, offset2 = index2[pid]
+        if digest1 == digest2:
+            continue
+
+        # Digest mismatch: materialize just these two records
+        p1 = read_record_at(file1, offset1)
+        p2 = strip_growth(read_record_at(file2, offset2))
+        if p1 == p2:
+            continue  # e.g. 1 vs 1.0 serializes differently but compares equal
+
+        mismatches.append(pid)
+        diffs[pid] = list(field_diff(p1, p2))
+
+    if verbose:
+        if not mismatches and not missing_in_1 and not missing_in_2:
+            print("✅ PERFECT MATCH — the ONLY difference is growth_potential_score.")
+        else:
+            print("❌ Differences found.")
+            print("Players with mismatches:", mismatches)
+            for pid in mismatches:
+                field_diffs = diffs[pid]
+                print(f"\n--- player_id {pid}: {len(field_diffs)} field(s) differ")
+                for field, v1, v2 in field_diffs[:max_field_diffs]:
+                    print(f"  {field}: {v1!r} -> {v2!r}")
+                if len(field_diffs) > max_field_diffs:
+                    print(f"  ... {len(field_diffs) - max_field_diffs} more")
+
+    return {
+        "missing_in_1": missing_in_1,
+        "missing_in_2": missing_in_2,
+        "mismatches": mismatches,
+        "diffs": diffs,
+    }
+
+
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Compare JSONL files with growth potential.")
     parser.add_argument("--file1", required=True, help="Original JSONL file")
     parser.add_argument("--file2", required=True, help="Modified JSONL file (with growth score)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Bounded-memory digest comparison (for full-population files)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for --stream (default: CPU count)")
+    parser.add_argument("--max-field-diffs", type=int, default=20,
+                        help="Field-level differences to print per mismatching player")
     args = parser.parse_args()
 
-    compare_files(args.file1, args.file2)
+    if args.stream:
+        compare_files_streaming(args.file1, args.file2, workers=args.workers,
+                                max_field_diffs=args.max_field_diffs)
+    else:
+        compare_files(args.file1, args.file2)
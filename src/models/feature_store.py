@@ -0,0 +1,271 @@
+"""Persistent per-player feature store.
+
+Every player's transfer-fee feature row (the 42 FEATURE_COLUMNS, including the
+365-day form totals) is computed once per refresh and saved as a float32
+matrix sorted by player_id, together with the ids and a manifest of feature
+names. Consumers memory-map it instead of rejoining players.csv, clubs.csv and
+appearances.csv:
+
+    feature_store/
+        CURRENT                   name of the active version
+        20261018T0600/
+            manifest.json         version, reference_date, feature_names, n_players
+            player_ids.npy        int64, ascending
+            features.npy          float32 [n_players, n_features], row-major
+
+Rows are the model input of a hypothetical transfer on reference_date to the
+player's current club (missing values are 0, as the booster saw them).
+Building a new version never touches the old one; CURRENT is switched last.
+
+    python -m src.models.feature_store build --data-dir data
+    python -m src.models.feature_store show --player-ids 8198 28003
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.models.universal_score import DATA_DIR, OUTPUT_DIR
+
+STORE_DIR = OUTPUT_DIR / "feature_store"
+
+_stores = {}
+
+
+def build_feature_store(predictor, out_dir=STORE_DIR, reference_date=None, chunk_size=50_000):
+    """
+    Write a new store version for every player known to predictor.
+
+    Args:
+        predictor: TransferFeePredictor over the raw tables
+        out_dir: Store root (a new version directory is created inside)
+        reference_date: Transfer date the rows are computed for (default today)
+        chunk_size: Players computed per batch (bounds memory)
+
+    Returns:
+        Path of the new version directory
+    """
+    out_dir = Path(out_dir)
+    reference_date = pd.Timestamp(reference_date or datetime.now().date())
+    version = datetime.now().strftime("%Y%m%dT%H%M%S")
+    version_dir = out_dir / version
+    version_dir.mkdir(parents=True, exist_ok=False)
+
+    player_ids = np.sort(predictor.player_index.to_numpy(dtype="int64"))
+    columns = list(predictor.columns)
+    matrix = np.lib.format.open_memmap(
+        version_dir / "features.npy", mode="w+", dtype="float32", shape=(len(player_ids), len(columns))
+    )
+    for start in range(0, len(player_ids), chunk_size):
+        ids = player_ids[start:start + chunk_size]
+        matrix[start:start + len(ids)] = predictor.feature_matrix(ids, reference_date=reference_date)
+    matrix.flush()
+    del matrix
+    np.save(version_dir / "player_ids.npy", player_ids)
+
+    manifest = {
+        "version": version,
+        "reference_date": reference_date.strftime("%Y-%m-%d"),
+        "feature_names": columns,
+        "n_players": int(len(player_ids)),
+        "dtype": "float32",
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    (version_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    tmp = out_dir / "CURRENT.tmp"
+    tmp.write_text(version, encoding="utf-8")
+    os.replace(tmp, out_dir / "CURRENT")
+    return version_dir
+
+
+class FeatureStore:
+    """Read-only, memory-mapped view of one store version."""
+
+    def __init__(self, version_dir):
+        """
+        Args:
+            version_dir: Directory written by build_feature_store
+        """
+        self.path = Path(version_dir)
+        self.manifest = json.loads((self.path / "manifest.json").read_text(encoding="utf-8"))
+        self.version = self.manifest["version"]
+        self.reference_date = pd.Timestamp(self.manifest["reference_date"])
+        self.feature_names = list(self.manifest["feature_names"])
+        self._column_pos = {name: j for j, name in enumerate(self.feature_names)}
+
+        self.player_ids = np.load(self.path / "player_ids.npy", mmap_mode="r")
+        self.matrix = np.load(self.path / "features.npy", mmap_mode="r")
+
+        # Dense id -> row table: one array lookup per player
+        max_id = int(self.player_ids[-1]) if len(self.player_ids) else -1
+        self._row_of = np.full(max_id + 2, -1, dtype="int32")
+        self._row_of[np.asarray(self.player_ids)] = np.arange(len(self.player_ids), dtype="int32")
+        self._scale = None
+
+    @classmethod
+    def open(cls, root=STORE_DIR, version=None):
+        """Open version (default: the one named in root/CURRENT)."""
+        root = Path(root)
+        if version is None:
+            current = root / "CURRENT"
+            if not current.exists():
+                raise FileNotFoundError(
+                    f"No feature store at {root}; run python -m src.models.feature_store build"
+                )
+            version = current.read_text(encoding="utf-8").strip()
+        return cls(root / version)
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def __contains__(self, player_id):
+        return self.row_indices([player_id])[0] >= 0
+
+    def row_indices(self, player_ids):
+        """Row number per player id (-1 if not in the store)."""
+        ids = np.asarray(player_ids, dtype="int64")
+        inside = (ids >= 0) & (ids < len(self._row_of))
+        rows = np.full(len(ids), -1, dtype="int64")
+        rows[inside] = self._row_of[ids[inside]]
+        return rows
+
+    def column_indices(self, columns):
+        return [self._column_pos[c] for c in columns]
+
+    def row(self, player_id):
+        """Feature row of one player (read-only view), or None."""
+        row = self.row_indices([player_id])[0]
+        return None if row < 0 else self.matrix[row]
+
+    def rows(self, player_ids, columns=None):
+        """
+        Feature rows for a batch of players.
+
+        Args:
+            player_ids: Player ids (any order, duplicates allowed)
+            columns: Feature names to return, in this order (default: all)
+
+        Returns:
+            (float32 matrix [n, k] with zero rows for unknown ids, found mask [n])
+        """
+        rows = self.row_indices(player_ids)
+        found = rows >= 0
+        cols = slice(None) if columns is None else self.column_indices(columns)
+        out = np.zeros((len(rows), len(self.feature_names) if columns is None else len(cols)), dtype="float32")
+        out[found] = self.matrix[rows[found]][:, cols]
+        return out, found
+
+    def slice(self, start, stop):
+        """(player_ids, matrix) for store rows start:stop, without copying."""
+        return self.player_ids[start:stop], self.matrix[start:stop]
+
+    def frame(self, player_ids=None, columns=None):
+        """DataFrame indexed by player_id (default: every player)."""
+        if player_ids is None:
+            player_ids = np.asarray(self.player_ids)
+        values, found = self.rows(player_ids, columns)
+        return pd.DataFrame(
+            values[found],
+            index=pd.Index(np.asarray(player_ids, dtype="int64")[found], name="player_id"),
+            columns=self.feature_names if columns is None else columns,
+        )
+
+    def _standardization(self, chunk_size=100_000):
+        """Per-feature mean and std over the whole store (computed once, chunked)."""
+        if self._scale is None:
+            total = np.zeros(len(self.feature_names))
+            total_sq = np.zeros(len(self.feature_names))
+            for start in range(0, len(self), chunk_size):
+                block = np.asarray(self.matrix[start:start + chunk_size], dtype="float64")
+                total += block.sum(axis=0)
+                total_sq += np.square(block).sum(axis=0)
+            mean = total / max(len(self), 1)
+            std = np.sqrt(np.maximum(total_sq / max(len(self), 1) - mean ** 2, 0.0))
+            self._scale = (mean.astype("float32"), np.where(std > 0, std, 1.0).astype("float32"))
+        return self._scale
+
+    def nearest(self, player_id, k=10, columns=None, chunk_size=100_000):
+        """
+        Most similar players by Euclidean distance on standardized features.
+
+        Returns:
+            List of (player_id, distance), closest first, excluding player_id itself
+        """
+        query = self.row(player_id)
+        if query is None:
+            return []
+        mean, std = self._standardization()
+        cols = np.arange(len(self.feature_names)) if columns is None else np.array(self.column_indices(columns))
+        mean, std = mean[cols], std[cols]
+        target = (query[cols] - mean) / std
+
+        best_ids, best_dist = [], []
+        for start in range(0, len(self), chunk_size):
+            ids, block = self.slice(start, start + chunk_size)
+            dist = np.sqrt(np.square((block[:, cols] - mean) / std - target).sum(axis=1))
+            take = min(k + 1, len(dist))
+            top = np.argpartition(dist, take - 1)[:take]
+            best_ids.append(np.asarray(ids)[top])
+            best_dist.append(dist[top])
+        ids, dist = np.concatenate(best_ids), np.concatenate(best_dist)
+        order = np.argsort(dist, kind="stable")
+        return [(int(i), float(d)) for i, d in zip(ids[order], dist[order]) if i != player_id][:k]
+
+
+def get_feature_store(root=STORE_DIR):
+    """
+    Current store version under root, cached per root (None if not built).
+
+    Re-opened when CURRENT changes, so a rebuild is served without a restart.
+    """
+    root = Path(root)
+    try:
+        mtime = (root / "CURRENT").stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _stores.get(root)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, FeatureStore.open(root))
+        _stores[root] = cached
+    return cached[1]
+
+
+# ---------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from src.models.transfer_fee_inference import TransferFeePredictor
+
+    parser = argparse.ArgumentParser(description="Build or inspect the per-player feature store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Write a new version from the raw CSVs")
+    build.add_argument("--data-dir", type=str, default=str(DATA_DIR))
+    build.add_argument("--store-dir", type=str, default=str(STORE_DIR))
+    build.add_argument("--reference-date", type=str, default=None, help="Default: today")
+
+    show = sub.add_parser("show", help="Print stored rows and nearest players")
+    show.add_argument("--player-ids", type=int, nargs="+", required=True)
+    show.add_argument("--store-dir", type=str, default=str(STORE_DIR))
+    show.add_argument("--similar", type=int, default=5, help="Nearest players to list")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        predictor = TransferFeePredictor.from_data_dir(args.data_dir)
+        path = build_feature_store(predictor, args.store_dir, args.reference_date)
+        print(f"Stored {len(predictor.player_index)} players in {time.perf_counter() - start:.1f}s -> {path}")
+    else:
+        store = FeatureStore.open(args.store_dir)
+        print(f"Version {store.version} ({len(store)} players, as of {store.reference_date.date()})")
+        print(store.frame(args.player_ids).T.to_string())
+        for pid in args.player_ids:
+            print(f"Similar to {pid}: {store.nearest(pid, k=args.similar)}")
@@ -0,0 +1,397 @@
+"""Daily incremental ingestion of new appearances and valuations.
+
+Maintains these artifacts in one directory (default: json_generator/model_data):
+
+    appearances_scored.parquet             every scored appearance (the store)
+    valuations.parquet                     every valuation (the store)
+    player_game_scores_and_values.parquet  per-player universal score series
+    player_game_scores_and_values.meta.json
+    player_aggregates_365.parquet          trailing-365-day totals per player
+    growth_scores.parquet                  growth_potential_score per player
+    percentile_tables.npz                  norms per position and age band (see percentiles.py)
+    player_metrics.parquet
+    club_aggregates.parquet                club / league summaries (see squad_aggregates.py)
+    league_aggregates.parquet
+    ingest_watermark.json                  what has been ingested so far
+
+`bootstrap` builds everything once from the full CSVs. `ingest` then takes
+only the new rows of the daily drop and, for the players they touch,
+recomputes the series from the earliest new date onwards, the 365-day
+totals and the growth score. When a new score widens a profile's bounds,
+universal_score_100 and the growth score are also redone for every player in
+that profile. Other players' rows are left as they are.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from src.models.compute_growth_potential import compute_growth_potential
+from src.models.percentiles import refresh_percentiles
+from src.models.squad_aggregates import refresh_squad_aggregates
+from src.models.rolling_windows import AppearanceWindows
+from src.models.universal_score import (
+    APPEARANCE_DTYPES,
+    DATA_DIR,
+    OUTPUT_DIR,
+    OUTPUT_NAME,
+    VALUATION_DTYPES,
+    _prepare_valuations,
+    _read_csv,
+    attach_valuations,
+    load_games,
+    load_players,
+    prepare_appearances,
+    scale_scores,
+    score_appearances,
+    update_bounds,
+)
+
+APPEARANCES_STORE = "appearances_scored.parquet"
+VALUATIONS_STORE = "valuations.parquet"
+AGGREGATES_NAME = "player_aggregates_365.parquet"
+GROWTH_NAME = "growth_scores.parquet"
+WATERMARK_NAME = "ingest_watermark.json"
+
+STORE_COLS = [
+    "player_id", "game_id", "date", "profile", "minutes_played", "goals", "assists",
+    "yellow_cards", "red_cards", "universal_score",
+]
+SERIES_COLS = [
+    "player_id", "player_name", "time", "game_id", "profile",
+    "universal_score", "universal_score_100", "market_value",
+]
+MAX_HISTORY = 30
+
+
+# ---------------------------------------------------------
+# Small I/O helpers
+# ---------------------------------------------------------
+def _now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _write_parquet(df, path):
+    """Write to a temp file and rename, so readers never see a half-written file."""
+    tmp = Path(f"{path}.tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def _write_json(obj, path):
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _max_date(series):
+    return str(series.max().date()) if len(series) and series.notna().any() else None
+
+
+def load_player_birthdates(path):
+    players = pd.read_csv(path, usecols=["player_id", "date_of_birth"], dtype={"player_id": "int64"})
+    players["date_of_birth"] = pd.to_datetime(players["date_of_birth"], errors="coerce")
+    return players.drop_duplicates("player_id").set_index("player_id")["date_of_birth"]
+
+
+# ---------------------------------------------------------
+# Derived artifacts for a set of players
+# ---------------------------------------------------------
+def trailing_365_totals(apps):
+    """Totals over the 365 days ending at each player's latest appearance."""
+    apps = apps.dropna(subset=["date"])
+    last = apps.groupby("player_id")["date"].max()
+    agg = AppearanceWindows(apps).totals(last.index.to_numpy(), last.to_numpy())
+    return agg.rename(columns={"ref_date": "as_of_date"})
+
+
+def build_series(apps, vals, players, bounds):
+    """Series rows (SERIES_COLS) for the given appearances."""
+    apps = apps.copy()
+    apps["universal_score_100"] = scale_scores(
+        apps["profile"].astype(str), apps["universal_score"].to_numpy(), bounds
+    )
+    merged = attach_valuations(apps, vals)
+    merged = merged.merge(players[["player_id", "player_name"]], on="player_id", how="left")
+    return merged.rename(columns={"date": "time"})[SERIES_COLS]
+
+
+def growth_scores_for(player_ids, apps, vals, series, birthdates):
+    """Growth potential for each player, from the stores instead of the JSONL."""
+    apps = apps[apps["player_id"].isin(player_ids)].sort_values(["player_id", "date"])
+    vals = vals[vals["player_id"].isin(player_ids)].sort_values(["player_id", "date"])
+    series = series[series["player_id"].isin(player_ids)]
+
+    apps_by_player = dict(tuple(apps.groupby("player_id")))
+    vals_by_player = dict(tuple(vals.groupby("player_id")))
+    series_by_player = dict(tuple(series.groupby("player_id")))
+    reference = pd.Timestamp(datetime.now(timezone.utc).date())
+
+    rows = []
+    for pid in player_ids:
+        p_apps = apps_by_player.get(pid, apps.iloc[:0]).tail(10)
+        p_vals = vals_by_player.get(pid, vals.iloc[:0])
+        p_series = series_by_player.get(pid, series.iloc[:0])
+        dob = birthdates.get(pid, pd.NaT)
+
+        player = {
+            "basic_info": {
+                "age_at_reference_date": int((reference - dob).days // 365.25) if pd.notna(dob) else None,
+            },
+            "valuation_history": [
+                {"date": d.strftime("%Y-%m-%d"), "market_value_in_eur": float(v)}
+                for d, v in zip(p_vals["date"], p_vals["market_value_in_eur"])
+            ],
+            "performance_time_series": [
+                {"date": d.strftime("%Y-%m-%d"), "universal_score_100": float(s)}
+                for d, s in zip(p_series["time"], p_series["universal_score_100"])
+            ],
+            "recent_form_last_10_games": {
+                "summary": {
+                    "minutes_played": float(p_apps["minutes_played"].sum()),
+                    "goals": float(p_apps["goals"].sum()),
+                    "assists": float(p_apps["assists"].sum()),
+                }
+            },
+        }
+        rows.append({"player_id": pid, "growth_potential_score": compute_growth_potential(player)})
+
+    return pd.DataFrame(rows, columns=["player_id", "growth_potential_score"])
+
+
+def _replace_players(existing, fresh, player_ids):
+    """existing minus player_ids, plus fresh, sorted by player_id."""
+    kept = existing[~existing["player_id"].isin(player_ids)]
+    return pd.concat([kept, fresh], ignore_index=True).sort_values("player_id", kind="stable").reset_index(drop=True)
+
+
+# ---------------------------------------------------------
+# Bootstrap: full build, once
+# ---------------------------------------------------------
+def bootstrap(data_dir=DATA_DIR, artifacts_dir=OUTPUT_DIR, mode="position", chunksize=500_000):
+    """Build every artifact from the full CSVs and write the first watermark."""
+    data_dir, artifacts_dir = Path(data_dir), Path(artifacts_dir)
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+
+    players = load_players(data_dir / "players.csv")
+    games = load_games(data_dir / "games.csv")
+    profiles_by_player = players.set_index("player_id")["profile"]
+
+    chunks, bounds, n_read = [], {}, 0
+    for chunk in _read_csv(data_dir / "appearances.csv", APPEARANCE_DTYPES, chunksize=chunksize):
+        n_read += len(chunk)
+        apps = prepare_appearances(chunk, games, profiles_by_player, mode=mode)
+        apps["universal_score"] = score_appearances(apps)
+        update_bounds(bounds, apps["profile"], apps["universal_score"].to_numpy())
+        chunks.append(apps[STORE_COLS])
+    apps = pd.concat(chunks, ignore_index=True).dropna(subset=["date"])
+    apps = apps.drop_duplicates(["player_id", "game_id"], keep="last")
+
+    vals = pd.concat(
+        [_prepare_valuations(c) for c in _read_csv(data_dir / "player_valuations.csv", VALUATION_DTYPES, chunksize=chunksize)],
+        ignore_index=True,
+    ).drop_duplicates(["player_id", "date"], keep="last")
+    vals = vals.sort_values(["date", "player_id"], kind="stable").reset_index(drop=True)
+
+    series = build_series(apps, vals, players, bounds).sort_values(["player_id", "time"], kind="stable")
+    aggregates = trailing_365_totals(apps)
+    birthdates = load_player_birthdates(data_dir / "players.csv")
+    growth = growth_scores_for(sorted(apps["player_id"].unique()), apps, vals, series, birthdates)
+
+    meta = {
+        "created_at": _now(),
+        "profiles_mode": mode,
+        "bounds": bounds,
+        "rows": int(len(series)),
+        "players": int(series["player_id"].nunique()),
+    }
+    _write_parquet(apps.sort_values(["player_id", "date"], kind="stable"), artifacts_dir / APPEARANCES_STORE)
+    _write_parquet(vals, artifacts_dir / VALUATIONS_STORE)
+    _write_parquet(series, artifacts_dir / f"{OUTPUT_NAME}.parquet")
+    _write_json(meta, artifacts_dir / f"{OUTPUT_NAME}.meta.json")
+    _write_parquet(aggregates, artifacts_dir / AGGREGATES_NAME)
+    _write_parquet(growth, artifacts_dir / GROWTH_NAME)
+    refresh_percentiles(artifacts_dir, data_dir / "players.csv")
+    refresh_squad_aggregates(artifacts_dir, data_dir / "players.csv")
+
+    watermark = {
+        "updated_at": meta["created_at"],
+        "appearances": {"max_date": _max_date(apps["date"]), "rows": int(len(apps))},
+        "valuations": {"max_date": _max_date(vals["date"]), "rows": int(len(vals))},
+        "history": [{"run": "bootstrap", "at": meta["created_at"], "appearances_read": n_read}],
+    }
+    _write_json(watermark, artifacts_dir / WATERMARK_NAME)
+    return watermark
+
+
+# ---------------------------------------------------------
+# Incremental ingest: only the new rows
+# ---------------------------------------------------------
+def ingest(new_appearances=None, new_valuations=None, data_dir=DATA_DIR, artifacts_dir=OUTPUT_DIR):
+    """Ingest a daily drop and update the affected players' artifacts in place.
+
+    Args:
+        new_appearances: CSV with only the new appearances.csv rows (or None)
+        new_valuations: CSV with only the new player_valuations.csv rows (or None)
+        data_dir: Directory with the current games.csv and players.csv
+        artifacts_dir: Directory written by bootstrap()
+
+    Rows already in the stores (same player_id+game_id, or player_id+date for
+    valuations) are skipped, so re-running a drop is harmless. Late rows for
+    earlier dates are ingested like any other.
+    """
+    data_dir, artifacts_dir = Path(data_dir), Path(artifacts_dir)
+    watermark_path = artifacts_dir / WATERMARK_NAME
+    if not watermark_path.exists():
+        raise FileNotFoundError(f"No watermark in {artifacts_dir}; run bootstrap first")
+
+    watermark = _load_json(watermark_path)
+    meta_path = artifacts_dir / f"{OUTPUT_NAME}.meta.json"
+    meta = _load_json(meta_path)
+    bounds = meta["bounds"]
+
+    apps = pd.read_parquet(artifacts_dir / APPEARANCES_STORE)
+    vals = pd.read_parquet(artifacts_dir / VALUATIONS_STORE)
+    players = load_players(data_dir / "players.csv")
+
+    # ---- New appearances: score them, drop ones we already have
+    skipped = {"appearances": 0, "valuations": 0}
+    new_apps = apps.iloc[:0]
+    if new_appearances is not None:
+        games = load_games(data_dir / "games.csv")
+        raw = _read_csv(new_appearances, APPEARANCE_DTYPES)
+        new_apps = prepare_appearances(
+            raw, games, players.set_index("player_id")["profile"], mode=meta.get("profiles_mode", "position")
+        )
+        new_apps["universal_score"] = score_appearances(new_apps)
+        new_apps = new_apps[STORE_COLS].dropna(subset=["date"]).drop_duplicates(["player_id", "game_id"], keep="last")
+        known = pd.MultiIndex.from_frame(apps[["player_id", "game_id"]])
+        stored = pd.MultiIndex.from_frame(new_apps[["player_id", "game_id"]]).isin(known)
+        skipped["appearances"] = int(stored.sum())
+        new_apps = new_apps[~stored]
+
+    # ---- New valuations, same idea
+    new_vals = vals.iloc[:0]
+    if new_valuations is not None:
+        new_vals = _prepare_valuations(_read_csv(new_valuations, VALUATION_DTYPES))
+        new_vals = new_vals.drop_duplicates(["player_id", "date"], keep="last")
+        known = pd.MultiIndex.from_frame(vals[["player_id", "date"]])
+        stored = pd.MultiIndex.from_frame(new_vals[["player_id", "date"]]).isin(known)
+        skipped["valuations"] = int(stored.sum())
+        new_vals = new_vals[~stored]
+
+    # Earliest new date per affected player: series rows from here on are stale
+    since = pd.concat([
+        new_apps[["player_id", "date"]], new_vals[["player_id", "date"]]
+    ]).groupby("player_id")["date"].min()
+    affected = since.index.to_numpy()
+
+    run = {
+        "run": "ingest",
+        "at": _now(),
+        "new_appearances": int(len(new_apps)),
+        "new_valuations": int(len(new_vals)),
+        "already_stored": skipped,
+        "players_affected": int(len(affected)),
+        "rescaled_profiles": [],
+    }
+
+    if len(affected):
+        apps = pd.concat([apps, new_apps], ignore_index=True).sort_values(["player_id", "date"], kind="stable")
+        vals = pd.concat([vals, new_vals], ignore_index=True).sort_values(["date", "player_id"], kind="stable")
+
+        series = pd.read_parquet(artifacts_dir / f"{OUTPUT_NAME}.parquet")
+
+        # A new extreme score widens its profile's bounds; rescale that profile everywhere
+        old_bounds = {k: list(v) for k, v in bounds.items()}
+        if len(new_apps):
+            update_bounds(bounds, new_apps["profile"], new_apps["universal_score"].to_numpy())
+        changed = [p for p in bounds if old_bounds.get(p) != bounds[p]]
+        regrow = set(affected.tolist())
+        if changed:
+            mask = series["profile"].astype(str).isin(changed).to_numpy()
+            series.loc[mask, "universal_score_100"] = scale_scores(
+                series.loc[mask, "profile"].astype(str), series.loc[mask, "universal_score"].to_numpy(), bounds
+            )
+            run["rescaled_profiles"] = changed
+            # Growth follows the slope of universal_score_100, so rescaled players need it again
+            regrow.update(series.loc[mask, "player_id"].unique().tolist())
+        regrow = sorted(regrow)
+        run["growth_recomputed"] = len(regrow)
+
+        # Tail recompute: affected players, from their earliest new date
+        cutoff_series = series["player_id"].map(since)
+        series = series[~(cutoff_series.notna() & (series["time"] >= cutoff_series))]
+        cutoff_apps = apps["player_id"].map(since)
+        tail_apps = apps[cutoff_apps.notna() & (apps["date"] >= cutoff_apps)]
+        tail = build_series(tail_apps, vals[vals["player_id"].isin(affected)], players, bounds)
+        series = pd.concat([series, tail], ignore_index=True).sort_values(["player_id", "time"], kind="stable")
+
+        affected_apps = apps[apps["player_id"].isin(affected)]
+        aggregates = _replace_players(
+            pd.read_parquet(artifacts_dir / AGGREGATES_NAME), trailing_365_totals(affected_apps), affected
+        )
+        birthdates = load_player_birthdates(data_dir / "players.csv")
+        growth = _replace_players(
+            pd.read_parquet(artifacts_dir / GROWTH_NAME),
+            growth_scores_for(regrow, apps, vals, series, birthdates),
+            regrow,
+        )
+
+        meta.update({"bounds": bounds, "updated_at": run["at"], "rows": int(len(series)),
+                     "players": int(series["player_id"].nunique())})
+        _write_parquet(apps, artifacts_dir / APPEARANCES_STORE)
+        _write_parquet(vals, artifacts_dir / VALUATIONS_STORE)
+        _write_parquet(series.reset_index(drop=True), artifacts_dir / f"{OUTPUT_NAME}.parquet")
+        _write_json(meta, meta_path)
+        _write_parquet(aggregates, artifacts_dir / AGGREGATES_NAME)
+        _write_parquet(growth, artifacts_dir / GROWTH_NAME)
+        # Percentiles and squad aggregates span many players: rebuild them (cheap)
+        refresh_percentiles(artifacts_dir, data_dir / "players.csv")
+        refresh_squad_aggregates(artifacts_dir, data_dir / "players.csv")
+
+    # Watermark goes last: a crash before this point just means the drop is re-ingested
+    watermark["updated_at"] = run["at"]
+    watermark["appearances"] = {"max_date": _max_date(apps["date"]), "rows": int(len(apps))}
+    watermark["valuations"] = {"max_date": _max_date(vals["date"]), "rows": int(len(vals))}
+    watermark["history"] = (watermark.get("history", []) + [run])[-MAX_HISTORY:]
+    _write_json(watermark, watermark_path)
+    return run
+
+
+# ---------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Incrementally update derived player artifacts.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_boot = sub.add_parser("bootstrap", help="Full build from the complete CSVs")
+    p_boot.add_argument("--data-dir", type=str, default=str(DATA_DIR))
+    p_boot.add_argument("--artifacts-dir", type=str, default=str(OUTPUT_DIR))
+    p_boot.add_argument("--profiles", choices=["position", "universal"], default="position")
+
+    p_ingest = sub.add_parser("ingest", help="Ingest only the new rows of a daily drop")
+    p_ingest.add_argument("--appearances", type=str, default=None, help="CSV of new appearances rows")
+    p_ingest.add_argument("--valuations", type=str, default=None, help="CSV of new valuation rows")
+    p_ingest.add_argument("--data-dir", type=str, default=str(DATA_DIR),
+                          help="Directory with current games.csv and players.csv")
+    p_ingest.add_argument("--artifacts-dir", type=str, default=str(OUTPUT_DIR))
+
+    args = parser.parse_args()
+    if args.command == "bootstrap":
+        result = bootstrap(args.data_dir, args.artifacts_dir, mode=args.profiles)
+    else:
+        result = ingest(args.appearances, args.valuations, args.data_dir, args.artifacts_dir)
+    print(json.dumps(result, indent=2))
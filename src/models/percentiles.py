@@ -0,0 +1,229 @@
+"""Percentile tables per position and age band.
+
+Gives the report agents position-specific norms: for each metric the values
+of every player in the same position and age band are kept as one sorted
+array, so a player's percentile is two binary searches (O(log n)).
+
+Metrics (per player, as of the last refresh):
+    goals_per90, assists_per90   365-day rates (players with >= MIN_MINUTES only)
+    universal_score              mean universal_score_100 of the last RECENT_GAMES games
+    market_value_in_eur          players.csv
+    growth_potential_score       growth_scores.parquet
+
+Written next to the incremental_update artifacts and refreshed with them:
+
+    percentile_tables.npz     sorted arrays, keyed "metric|position|age_band"
+    player_metrics.parquet    each player's metric values, position and band
+
+    python -m src.models.percentiles --data-dir data
+"""
+
+import os
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.models.universal_score import DATA_DIR, OUTPUT_DIR, OUTPUT_NAME
+
+TABLES_NAME = "percentile_tables.npz"
+METRICS_NAME = "player_metrics.parquet"
+
+METRICS = ["goals_per90", "assists_per90", "universal_score", "market_value_in_eur", "growth_potential_score"]
+PER90_METRICS = ["goals_per90", "assists_per90"]
+AGE_EDGES = [21, 24, 27, 30]
+AGE_BANDS = ["U21", "21-23", "24-26", "27-29", "30+"]
+ALL = "all"
+
+MIN_MINUTES = 450   # per-90 rates over fewer minutes are noise
+MIN_GROUP = 20      # smaller groups fall back to position, then everyone
+RECENT_GAMES = 10
+
+_tables = {}
+
+
+def age_band(age):
+    """Age in years (scalar or array) -> AGE_BANDS label (None where unknown)."""
+    ages = np.atleast_1d(np.asarray(age, dtype="float64"))
+    labels = np.array(AGE_BANDS, dtype=object)[np.digitize(ages, AGE_EDGES)]
+    labels[np.isnan(ages)] = None
+    return labels if np.ndim(age) else labels[0]
+
+
+def player_metrics(players, aggregates, series, growth, reference_date=None):
+    """
+    One row per player: position, age, age_band and METRICS.
+
+    Args:
+        players: players.csv frame (player_id, position, date_of_birth, market_value_in_eur)
+        aggregates: player_aggregates_365.parquet frame
+        series: universal score series (player_id, time, universal_score_100)
+        growth: growth_scores.parquet frame
+        reference_date: Date ages are computed at (default today)
+    """
+    reference_date = pd.Timestamp(reference_date or date.today())
+    df = players[["player_id", "position", "date_of_birth", "market_value_in_eur"]].drop_duplicates("player_id")
+    df = df.assign(player_id=df["player_id"].astype("int64"))
+    born = pd.to_datetime(df["date_of_birth"], errors="coerce")
+    df["age"] = (reference_date - born).dt.days / 365.25
+    df["age_band"] = age_band(df["age"].to_numpy())
+    df["position"] = df["position"].fillna("Unknown").astype(str)
+
+    rates = aggregates[["player_id", "minutes_365"] + PER90_METRICS].copy()
+    rates.loc[rates["minutes_365"] < MIN_MINUTES, PER90_METRICS] = np.nan
+    recent = (
+        series.sort_values(["player_id", "time"], kind="stable")
+        .groupby("player_id").tail(RECENT_GAMES)
+        .groupby("player_id")["universal_score_100"].mean()
+        .rename("universal_score")
+    )
+    df = (
+        df.merge(rates, on="player_id", how="left")
+        .merge(recent, left_on="player_id", right_index=True, how="left")
+        .merge(growth[["player_id", "growth_potential_score"]], on="player_id", how="left")
+    )
+    return df[["player_id", "position", "age", "age_band", "minutes_365"] + METRICS].reset_index(drop=True)
+
+
+def build_tables(metrics):
+    """{"metric|position|age_band": sorted values}, with ALL rows for both fallbacks."""
+    tables = {}
+    groupings = [(["position", "age_band"], None), (["position"], ALL), ([], ALL)]
+    for metric in METRICS:
+        values = metrics[["position", "age_band", metric]].dropna(subset=[metric])
+        for keys, fill in groupings:
+            groups = values.groupby(keys, sort=False)[metric] if keys else [((), values[metric])]
+            for key, col in groups:
+                key = key if isinstance(key, tuple) else (key,)
+                position = key[0] if keys else ALL
+                band = key[1] if len(keys) == 2 else fill
+                tables[f"{metric}|{position}|{band}"] = np.sort(col.to_numpy(dtype="float64"))
+    return tables
+
+
+def refresh_percentiles(artifacts_dir=OUTPUT_DIR, players_path=DATA_DIR / "players.csv", reference_date=None):
+    """Rebuild both files from the incremental_update artifacts in artifacts_dir."""
+    from src.models.incremental_update import AGGREGATES_NAME, GROWTH_NAME, _write_parquet
+
+    artifacts_dir = Path(artifacts_dir)
+    players = pd.read_csv(
+        players_path, usecols=["player_id", "position", "date_of_birth", "market_value_in_eur"],
+        dtype={"player_id": "int64"},
+    )
+    metrics = player_metrics(
+        players,
+        pd.read_parquet(artifacts_dir / AGGREGATES_NAME),
+        pd.read_parquet(artifacts_dir / f"{OUTPUT_NAME}.parquet",
+                        columns=["player_id", "time", "universal_score_100"]),
+        pd.read_parquet(artifacts_dir / GROWTH_NAME),
+        reference_date,
+    )
+    tables = build_tables(metrics)
+
+    tmp = artifacts_dir / f"{TABLES_NAME}.tmp.npz"
+    np.savez(tmp, **tables)
+    os.replace(tmp, artifacts_dir / TABLES_NAME)
+    _write_parquet(metrics, artifacts_dir / METRICS_NAME)
+    return metrics, tables
+
+
+class PercentileTables:
+    """Percentile lookups against the precomputed sorted arrays."""
+
+    def __init__(self, tables, metrics=None):
+        """
+        Args:
+            tables: build_tables() output
+            metrics: player_metrics() output (needed for player_percentiles)
+        """
+        self.tables = tables
+        self.metrics = None if metrics is None else metrics.set_index("player_id")
+
+    @classmethod
+    def load(cls, artifacts_dir=OUTPUT_DIR):
+        artifacts_dir = Path(artifacts_dir)
+        with np.load(artifacts_dir / TABLES_NAME) as npz:
+            tables = {key: npz[key] for key in npz.files}
+        return cls(tables, pd.read_parquet(artifacts_dir / METRICS_NAME))
+
+    def _group(self, metric, position, band):
+        """Most specific table with at least MIN_GROUP values: (values, position, band)."""
+        for pos, bnd in ((position, band), (position, ALL), (ALL, ALL)):
+            values = self.tables.get(f"{metric}|{pos}|{bnd}")
+            if values is not None and len(values) >= MIN_GROUP:
+                return values, pos, bnd
+        values = self.tables.get(f"{metric}|{ALL}|{ALL}")
+        return values, ALL, ALL
+
+    def percentile(self, metric, value, position=ALL, band=ALL):
+        """
+        Share of the group below value (ties count half), 0-100.
+
+        Returns:
+            (percentile, group dict) or (None, None) if value or table is missing
+        """
+        if value is None or pd.isna(value):
+            return None, None
+        values, pos, bnd = self._group(metric, position, band)
+        if values is None or not len(values):
+            return None, None
+        below = np.searchsorted(values, value, side="left")
+        at_or_below = np.searchsorted(values, value, side="right")
+        pct = 100.0 * (below + at_or_below) / (2 * len(values))
+        return round(float(pct), 1), {"position": pos, "age_band": bnd, "size": int(len(values))}
+
+    def player_percentiles(self, player_id):
+        """Section for the player JSON, or None if the player has no metrics."""
+        if self.metrics is None or player_id not in self.metrics.index:
+            return None
+        row = self.metrics.loc[player_id]
+        band = row["age_band"] if isinstance(row["age_band"], str) else ALL
+        section = {"position": row["position"], "age_band": band, "metrics": {}}
+        for metric in METRICS:
+            pct, group = self.percentile(metric, row[metric], row["position"], band)
+            if pct is not None:
+                section["metrics"][metric] = {"value": float(row[metric]), "percentile": pct, "compared_with": group}
+        return section
+
+
+def get_percentile_tables(artifacts_dir=OUTPUT_DIR):
+    """
+    Tables for artifacts_dir, cached per directory (None if not built).
+
+    Re-read when a refresh has replaced either file, so the API serves new
+    percentiles after an incremental_update ingest without a restart.
+    """
+    artifacts_dir = Path(artifacts_dir)
+    try:
+        mtimes = tuple((artifacts_dir / name).stat().st_mtime_ns for name in (TABLES_NAME, METRICS_NAME))
+    except FileNotFoundError:
+        return None
+    cached = _tables.get(artifacts_dir)
+    if cached is None or cached[0] != mtimes:
+        cached = (mtimes, PercentileTables.load(artifacts_dir))
+        _tables[artifacts_dir] = cached
+    return cached[1]
+
+
+# ---------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(description="Build percentile tables per position and age band.")
+    parser.add_argument("--data-dir", type=str, default=str(DATA_DIR), help="Directory with players.csv")
+    parser.add_argument("--artifacts-dir", type=str, default=str(OUTPUT_DIR),
+                        help="incremental_update artifacts (written here too)")
+    parser.add_argument("--player-id", type=int, default=None, help="Print one player's percentiles")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    metrics, tables = refresh_percentiles(args.artifacts_dir, Path(args.data_dir) / "players.csv")
+    print(f"{len(tables)} tables over {len(metrics)} players in {time.perf_counter() - start:.1f}s")
+    if args.player_id is not None:
+        section = PercentileTables(tables, metrics).player_percentiles(args.player_id)
+        print(json.dumps(section, indent=2))
@@ -0,0 +1,244 @@
+"""Offline SHAP and MLR explanations for every transfer in final_processed_for_xgboost.csv.
+
+Batch alternative to the on-demand explainer, and the full-population
+replacement for player_shap_transfer_fee_321.pkl and
+mlr_local_explanations_per_transfer_321.pkl.
+
+    python -m src.models.precompute_explanations \\
+        --csv src/models/final_processed_for_xgboost.csv --workers 8
+
+The CSV is streamed in chunks, and a process pool explains each chunk
+(TreeSHAP from the booster, MLR contributions from a fit over the whole
+file). Results go to parquet partitioned by player_id bucket:
+
+    explanations/
+        manifest.json             settings, MLR fit, "complete" once every chunk is done
+        shap/bucket=017/part-00003.parquet
+        mlr/bucket=017/part-00003.parquet
+        _done/00003.json          one marker per finished chunk
+
+A chunk's marker is written only after all its files exist, and part names
+are deterministic, so an interrupted run resumes by skipping marked chunks
+and overwriting any half-written ones. The manifest's "complete" flag is
+cleared when a run starts and set as its very last step; readers
+(build_player_json.load_all_data) ignore the directory until it is set.
+"""
+
+import json
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.json_generator.build_player_json import EXPLANATIONS_DIR
+from src.models.mlr_explanations import MLR_RAW_COLUMNS, explain_transfers, fit_mlr
+from src.models.transfer_fee_inference import FEATURE_COLUMNS, MODEL_PATH
+
+BASE_DIR = Path(__file__).resolve().parent
+CSV_PATH = BASE_DIR / "final_processed_for_xgboost.csv"
+N_BUCKETS = 64
+
+META_COLUMNS = [
+    "player_id", "player_name", "transfer_year", "transfer_season", "from_club_id", "to_club_id",
+    "from_club_name", "to_club_name", "transfer_date", "transfer_fee", "log_transfer_fee",
+]
+
+_booster = None
+_mlr_fit = None
+
+
+# ---------------------------------------------------------
+# MLR: one fit over the whole file, applied per chunk
+# ---------------------------------------------------------
+def mlr_explanations(chunk, fit):
+    """Per-transfer contributions in the mlr_local_explanations_*.pkl layout."""
+    return explain_transfers(chunk, fit, id_columns=["row_id"] + META_COLUMNS)
+
+
+# ---------------------------------------------------------
+# SHAP: TreeSHAP from the booster
+# ---------------------------------------------------------
+def shap_explanations(chunk, booster):
+    """Per-transfer SHAP values in the player_shap_transfer_fee_*.pkl layout (unpruned)."""
+    from src.models.shap_explanations import shap_values
+
+    X = chunk.reindex(columns=FEATURE_COLUMNS).apply(pd.to_numeric, errors="coerce").fillna(0)
+    values, bias = shap_values(booster, X.to_numpy(dtype="float32"))
+
+    out = chunk[["row_id"] + [c for c in META_COLUMNS if c in chunk.columns]].reset_index(drop=True)
+    out = pd.concat([out, pd.DataFrame(values, columns=[f"shap_{c}" for c in FEATURE_COLUMNS])], axis=1)
+    pred = values.sum(axis=1) + bias
+    out["pred_log_transfer_fee"] = pred
+    out["pred_transfer_fee"] = np.exp(pred)  # as in xgboost.ipynb
+    return out
+
+
+# ---------------------------------------------------------
+# Chunk workers
+# ---------------------------------------------------------
+def _init_worker(model_path, mlr_fit):
+    global _booster, _mlr_fit
+    import xgboost as xgb
+
+    _booster = xgb.Booster()
+    _booster.load_model(str(model_path))
+    _mlr_fit = mlr_fit
+
+
+def _write_partitioned(df, root, chunk_index, n_buckets):
+    buckets = df["player_id"].to_numpy(dtype="int64") % n_buckets
+    for bucket in np.unique(buckets):
+        part_dir = root / f"bucket={bucket:03d}"
+        part_dir.mkdir(parents=True, exist_ok=True)
+        df[buckets == bucket].to_parquet(part_dir / f"part-{chunk_index:05d}.parquet", index=False)
+
+
+def process_chunk(chunk_index, chunk, out_dir, n_buckets):
+    """Explain one chunk, write its partitions, then its done marker."""
+    out_dir = Path(out_dir)
+    start = time.perf_counter()
+    chunk = chunk[chunk["player_id"].notna()].copy()
+    chunk["player_id"] = chunk["player_id"].astype("int64")
+
+    shap_df = shap_explanations(chunk, _booster)
+    mlr_df = mlr_explanations(chunk, _mlr_fit)
+    _write_partitioned(shap_df, out_dir / "shap", chunk_index, n_buckets)
+    _write_partitioned(mlr_df, out_dir / "mlr", chunk_index, n_buckets)
+
+    marker = {"rows": int(len(chunk)), "shap_rows": int(len(shap_df)), "mlr_rows": int(len(mlr_df)),
+              "seconds": round(time.perf_counter() - start, 3)}
+    tmp = out_dir / "_done" / f"{chunk_index:05d}.json.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(marker, f)
+    os.replace(tmp, tmp.with_suffix(""))
+    return chunk_index, marker
+
+
+# ---------------------------------------------------------
+# Driver
+# ---------------------------------------------------------
+def precompute(csv_path=CSV_PATH, out_dir=EXPLANATIONS_DIR, model_path=MODEL_PATH,
+               workers=None, chunksize=50_000, n_buckets=N_BUCKETS, restart=False):
+    """Explain every transfer in csv_path; resumes unless restart=True."""
+    csv_path, out_dir = Path(csv_path), Path(out_dir)
+    if restart and out_dir.exists():
+        shutil.rmtree(out_dir)
+    (out_dir / "_done").mkdir(parents=True, exist_ok=True)
+
+    manifest_path = out_dir / "manifest.json"
+    model_stat = Path(model_path).stat()
+    settings = {
+        "csv": str(csv_path.resolve()),
+        "csv_size": csv_path.stat().st_size,
+        "model": str(Path(model_path).resolve()),
+        "model_mtime": model_stat.st_mtime,
+        "chunksize": chunksize,
+        "n_buckets": n_buckets,
+    }
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest["settings"] != settings:
+            raise ValueError(f"{out_dir} was built with different inputs or settings; rerun with --restart")
+        mlr_fit = manifest["mlr_fit"]
+    else:
+        mlr_fit = fit_mlr(pd.read_csv(csv_path, usecols=MLR_RAW_COLUMNS + ["log_transfer_fee"]))
+        manifest = {"settings": settings, "mlr_fit": mlr_fit, "feature_columns": FEATURE_COLUMNS}
+    # Parts may be rewritten below: readers wait until the run has finished
+    manifest["complete"] = False
+    _write_manifest(manifest, manifest_path)
+
+    done = {int(p.stem) for p in (out_dir / "_done").glob("*.json")}
+    workers = workers or os.cpu_count() or 1
+    print(f"Explaining {csv_path.name} with {workers} workers ({len(done)} chunks already done)")
+
+    start = time.perf_counter()
+    rows, n_chunks = 0, 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model_path, mlr_fit)) as pool:
+        pending = set()
+        reader = pd.read_csv(csv_path, chunksize=chunksize, low_memory=False)
+        for chunk_index, chunk in enumerate(reader):
+            n_chunks = chunk_index + 1
+            if chunk_index in done:
+                continue
+            chunk.insert(0, "row_id", np.arange(chunk_index * chunksize, chunk_index * chunksize + len(chunk)))
+            pending.add(pool.submit(process_chunk, chunk_index, chunk, out_dir, n_buckets))
+
+            # Keep at most two chunks per worker in memory
+            while len(pending) >= 2 * workers:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                rows += _report(finished)
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            rows += _report(finished)
+
+    done = {int(p.stem) for p in (out_dir / "_done").glob("*.json")}
+    missing = sorted(set(range(n_chunks)) - done)
+    if missing:
+        raise RuntimeError(f"Chunks {missing} of {csv_path} have no done marker; rerun to resume")
+    manifest.update({"complete": True, "chunks": n_chunks, "completed_at": time.strftime("%Y-%m-%dT%H:%M:%S")})
+    _write_manifest(manifest, manifest_path)
+
+    print(f"Done: {rows} new rows in {time.perf_counter() - start:.1f}s -> {out_dir}")
+    return out_dir
+
+
+def _write_manifest(manifest, path):
+    tmp = Path(f"{path}.tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _report(finished):
+    rows = 0
+    for future in finished:
+        chunk_index, marker = future.result()
+        rows += marker["rows"]
+        print(f"  chunk {chunk_index:5d}: {marker['rows']} rows in {marker['seconds']}s")
+    return rows
+
+
+# ---------------------------------------------------------
+# Readers
+# ---------------------------------------------------------
+def load_explanations(kind, out_dir=EXPLANATIONS_DIR, player_ids=None):
+    """
+    Read 'shap' or 'mlr' explanations, optionally only for some players.
+
+    With player_ids, only the matching bucket directories are read.
+    """
+    out_dir = Path(out_dir)
+    root = out_dir / kind
+    if player_ids is None:
+        df = pd.read_parquet(root)
+    else:
+        n_buckets = json.loads((out_dir / "manifest.json").read_text(encoding="utf-8"))["settings"]["n_buckets"]
+        buckets = sorted({int(pid) % n_buckets for pid in player_ids})
+        parts = [pd.read_parquet(root / f"bucket={b:03d}") for b in buckets if (root / f"bucket={b:03d}").exists()]
+        df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=["player_id"])
+        df = df[df["player_id"].isin(list(player_ids))]
+    return df.drop(columns=["bucket"], errors="ignore").sort_values("row_id").reset_index(drop=True)
+
+
+# ---------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute SHAP and MLR explanations for every transfer.")
+    parser.add_argument("--csv", type=str, default=str(CSV_PATH), help="final_processed_for_xgboost.csv")
+    parser.add_argument("--output-dir", type=str, default=str(EXPLANATIONS_DIR))
+    parser.add_argument("--model", type=str, default=str(MODEL_PATH), help="best_xgb_model.json")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=50_000, help="CSV rows per chunk")
+    parser.add_argument("--buckets", type=int, default=N_BUCKETS, help="player_id partitions")
+    parser.add_argument("--restart", action="store_true", help="Discard previous progress")
+    args = parser.parse_args()
+
+    precompute(args.csv, args.output_dir, args.model, workers=args.workers,
+               chunksize=args.chunksize, n_buckets=args.buckets, restart=args.restart)
@@ -0,0 +1,123 @@
+"""Trailing-window appearance totals (minutes_365, goals_365, ...) without a cartesian merge.
+
+xgboost.ipynb merges every appearance with every transfer of the same player
+and then filters to the previous 365 days, so the intermediate frame grows with
+appearances x transfers. Here appearances are sorted once by (player_id, date)
+and turned into cumulative sums. The total over any window is then the
+difference of two cumulative sums, and both window ends are found by binary
+search. Memory is linear in the number of appearances, and each query costs
+O(log n).
+
+    windows = AppearanceWindows(apps)
+    agg = windows.totals(transfers["player_id"], transfers["transfer_date"])
+    live = windows.totals(player_ids, pd.Timestamp.today())
+"""
+
+import numpy as np
+import pandas as pd
+
+WINDOW_DAYS = 365
+
+# output column -> appearances column, as aggregated in xgboost.ipynb
+SUM_COLUMNS = {
+    "minutes_365": "minutes_played",
+    "goals_365": "goals",
+    "assists_365": "assists",
+    "yellow_365": "yellow_cards",
+    "red_365": "red_cards",
+}
+WINDOW_COLUMNS = list(SUM_COLUMNS) + [
+    "games_365", "goals_per90", "assists_per90", "cards_per90", "minutes_per_game",
+]
+
+# (player_id, day) packed into one sortable int64
+_DAY_BITS = 21
+_DAY_OFFSET = 1 << 20  # keeps pre-1970 dates positive
+
+
+def _days(dates):
+    """Dates (anything to_datetime accepts) -> int64 days since epoch, time of day dropped."""
+    return pd.to_datetime(dates).to_numpy(dtype="datetime64[D]").astype("int64")
+
+
+def _keys(player_ids, days):
+    return (np.asarray(player_ids, dtype="int64") << _DAY_BITS) + (days + _DAY_OFFSET)
+
+
+class AppearanceWindows:
+    """Cumulative per-player appearance sums, queryable for any reference date."""
+
+    def __init__(self, apps):
+        """
+        Args:
+            apps: DataFrame with player_id, date and the SUM_COLUMNS sources
+                  (missing source columns count as zero)
+        """
+        apps = apps.dropna(subset=["player_id", "date"])
+        days = _days(apps["date"])
+        keys = _keys(apps["player_id"].to_numpy(), days)
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+
+        values = np.zeros((len(apps), len(SUM_COLUMNS) + 1), dtype="float64")
+        for i, col in enumerate(SUM_COLUMNS.values()):
+            if col in apps.columns:
+                values[:, i] = np.nan_to_num(apps[col].to_numpy(dtype="float64")[order])
+        values[:, -1] = 1.0  # games
+
+        # Row i holds the totals of the first i appearances, so cum[hi] - cum[lo] is a window
+        self.cum = np.zeros((len(apps) + 1, values.shape[1]), dtype="float64")
+        np.cumsum(values, axis=0, out=self.cum[1:])
+
+    def __len__(self):
+        return len(self.keys)
+
+    def arrays(self, player_ids, ref_dates, days=WINDOW_DAYS):
+        """Like totals(), without the DataFrame overhead.
+
+        Returns:
+            ({column: numpy array} for WINDOW_COLUMNS, reference days since epoch)
+        """
+        player_ids = np.asarray(player_ids, dtype="int64")
+        if np.ndim(ref_dates) == 0:
+            ref_dates = [ref_dates] * len(player_ids)
+        ref_days = _days(ref_dates)
+
+        lo = np.searchsorted(self.keys, _keys(player_ids, ref_days - days), side="left")
+        hi = np.searchsorted(self.keys, _keys(player_ids, ref_days), side="right")
+        sums = self.cum[hi] - self.cum[lo]
+        sums[hi == lo] = np.nan
+
+        out = {col: sums[:, i] for i, col in enumerate(SUM_COLUMNS)}
+        out["games_365"] = sums[:, -1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            minutes = np.where(out["minutes_365"] == 0, np.nan, out["minutes_365"])
+            out["goals_per90"] = out["goals_365"] / (minutes / 90)
+            out["assists_per90"] = out["assists_365"] / (minutes / 90)
+            out["cards_per90"] = (out["yellow_365"] + out["red_365"]) / (minutes / 90)
+            out["minutes_per_game"] = out["minutes_365"] / np.where(out["games_365"] == 0, np.nan, out["games_365"])
+        return out, ref_days
+
+    def totals(self, player_ids, ref_dates, days=WINDOW_DAYS):
+        """Totals over [ref_date - days, ref_date] (both ends inclusive) per query.
+
+        Args:
+            player_ids: Sequence of player ids, one per query
+            ref_dates: Sequence of dates aligned with player_ids, or a single date
+            days: Window length in days
+
+        Returns:
+            DataFrame with player_id, ref_date and WINDOW_COLUMNS, one row per
+            query in input order. Windows without appearances are all NaN, the
+            same as the notebook's left merge.
+        """
+        out, ref_days = self.arrays(player_ids, ref_dates, days=days)
+        agg = pd.DataFrame(out, columns=WINDOW_COLUMNS)
+        agg.insert(0, "ref_date", pd.to_datetime(ref_days.astype("datetime64[D]")))
+        agg.insert(0, "player_id", np.asarray(player_ids, dtype="int64"))
+        return agg
+
+
+def window_totals(apps, player_ids, ref_dates, days=WINDOW_DAYS):
+    """One-shot helper: AppearanceWindows(apps).totals(player_ids, ref_dates, days)."""
+    return AppearanceWindows(apps).totals(player_ids, ref_dates, days=days)
@@ -0,0 +1,180 @@
+"""On-demand TreeSHAP explanations for the transfer-fee booster.
+
+player_shap_transfer_fee_321.pkl only covers the players the notebook
+explained. Here SHAP values come straight from the loaded booster
+(Booster.predict(..., pred_contribs=True) is XGBoost's own TreeSHAP, the same
+algorithm as shap.TreeExplainer), for any feature row TransferFeePredictor
+can build. The result uses build_shap_section's shape (top 5 positive and
+bottom 5 negative features).
+
+Results are cached in an in-memory LRU keyed by player and a hash of the
+feature row (plus the model), backed by a SQLite file so a restart does not
+recompute everything.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.json_generator.build_player_json import keep_top_bottom, split_features
+from src.models.universal_score import OUTPUT_DIR
+
+CACHE_PATH = OUTPUT_DIR / "shap_cache.sqlite"
+
+
+def shap_values(booster, X):
+    """TreeSHAP contributions for rows of X: (values [n, f], bias [n])."""
+    import xgboost as xgb
+
+    # Boosters trained on a DataFrame (as in xgboost.ipynb) insist on their feature names
+    dmatrix = xgb.DMatrix(np.asarray(X, dtype="float32"), feature_names=booster.feature_names)
+    contribs = booster.predict(dmatrix, pred_contribs=True)
+    return contribs[:, :-1], contribs[:, -1]
+
+
+class ShapCache:
+    """LRU of SHAP rows in memory, persisted to SQLite."""
+
+    def __init__(self, path=CACHE_PATH, capacity=10_000):
+        """
+        Args:
+            path: SQLite file (None: memory only)
+            capacity: Max entries kept in memory
+        """
+        self.capacity = capacity
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self.hits = 0
+        self.misses = 0
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS shap_cache "
+                "(key TEXT PRIMARY KEY, player_id INTEGER, contribs BLOB)"
+            )
+            self._db.commit()
+
+    def _remember(self, key, contribs):
+        self._lru[key] = contribs
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.capacity:
+            self._lru.popitem(last=False)
+
+    def get_many(self, keys):
+        """{key: contribs} for the keys found in memory or on disk."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[key] = self._lru[key]
+            missing = [k for k in keys if k not in found]
+            if missing and self._db is not None:
+                placeholders = ",".join("?" * len(missing))
+                rows = self._db.execute(
+                    f"SELECT key, contribs FROM shap_cache WHERE key IN ({placeholders})", missing
+                ).fetchall()
+                for key, blob in rows:
+                    contribs = np.frombuffer(blob, dtype="float32")
+                    self._remember(key, contribs)
+                    found[key] = contribs
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        """Store [(key, player_id, contribs float32 array)]."""
+        with self._lock:
+            for key, _, contribs in items:
+                self._remember(key, contribs)
+            if self._db is not None and items:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO shap_cache (key, player_id, contribs) VALUES (?, ?, ?)",
+                    [(key, int(pid), contribs.tobytes()) for key, pid, contribs in items],
+                )
+                self._db.commit()
+
+    def stats(self):
+        return {"entries": len(self._lru), "hits": self.hits, "misses": self.misses}
+
+
+class ShapExplainer:
+    """SHAP summaries for any player, computed from the live feature rows."""
+
+    def __init__(self, predictor, cache=None):
+        """
+        Args:
+            predictor: TransferFeePredictor with a loaded booster
+            cache: ShapCache (default: persisted at CACHE_PATH)
+        """
+        self.predictor = predictor
+        self.cache = cache if cache is not None else ShapCache()
+        # Retraining the model must not serve stale explanations
+        self.model_tag = hashlib.blake2b(bytes(predictor.booster.save_raw("json")), digest_size=8).hexdigest()
+
+    def _key(self, player_id, row):
+        digest = hashlib.blake2b(row.tobytes(), digest_size=12, key=self.model_tag.encode()).hexdigest()
+        return f"{int(player_id)}:{digest}"
+
+    def contributions(self, player_ids, to_club_ids=None, reference_date=None):
+        """
+        Raw SHAP rows (features..., bias) and feature rows for a batch, using the cache.
+
+        Returns:
+            (contribs float32 [n, f + 1], feature matrix [n, f])
+        """
+        X = self.predictor.feature_matrix(player_ids, to_club_ids, reference_date)
+        keys = [self._key(pid, row) for pid, row in zip(player_ids, X)]
+        found = self.cache.get_many(list(dict.fromkeys(keys)))
+
+        todo = [i for i, k in enumerate(keys) if k not in found]
+        if todo:
+            values, bias = shap_values(self.predictor.booster, X[todo])
+            fresh = np.column_stack([values, bias]).astype("float32")
+            new_items = {}
+            for i, contribs in zip(todo, fresh):
+                new_items[keys[i]] = (keys[i], player_ids[i], contribs)
+                found[keys[i]] = contribs
+            self.cache.put_many(list(new_items.values()))
+
+        return np.vstack([found[k] for k in keys]) if keys else np.empty((0, X.shape[1] + 1)), X
+
+    def explain(self, player_ids, to_club_ids=None, reference_date=None):
+        """shap_summary dicts (build_shap_section layout) for a batch of players."""
+        reference_date = pd.Timestamp(reference_date or self.predictor.default_reference_date)
+        if to_club_ids is None:
+            to_club_ids = [None] * len(player_ids)
+        contribs, _ = self.contributions(player_ids, to_club_ids, reference_date)
+        columns = self.predictor.columns
+        from_clubs = self.predictor.current_club_ids(player_ids)
+
+        summaries = []
+        for pid, to_club, from_club, row in zip(player_ids, to_club_ids, from_clubs, contribs):
+            pruned = keep_top_bottom(row[:-1])
+            log_fee = float(row.sum())  # SHAP values + bias add up to the prediction
+            positive, negative = split_features(
+                {col: float(v) for col, v in zip(columns, pruned) if v != 0.0}
+            )
+            to_club = from_club if to_club is None else to_club
+            summaries.append({
+                "source": "on_demand",
+                "reference_transfer": {
+                    "from_club_name": self.predictor.club_name(from_club),
+                    "to_club_name": self.predictor.club_name(to_club),
+                    "transfer_season": None,
+                    "transfer_year": int(reference_date.year),
+                    "transfer_date": reference_date.strftime("%Y-%m-%d"),
+                    "actual_transfer_fee": None,
+                    "predicted_transfer_fee": float(np.expm1(log_fee)),
+                },
+                "positive_features": positive,
+                "negative_features": negative,
+            })
+        return summaries
@@ -0,0 +1,157 @@
+"""Club and league aggregates, materialized once per data refresh.
+
+One vectorized pass over players.csv and growth_scores.parquet gives, per
+club and per league: squad size, total / average / top market value,
+average growth potential, age profile (mean age and counts per age band)
+and the number of breakout candidates (growth_potential_score >=
+BREAKOUT_SCORE).
+
+Only current players count: if players.csv has last_season, rows from
+earlier seasons (retired or departed players) are left out.
+
+Written next to the incremental_update artifacts and refreshed with them:
+
+    club_aggregates.parquet
+    league_aggregates.parquet
+
+    python -m src.models.squad_aggregates --data-dir data
+"""
+
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.models.percentiles import AGE_BANDS, age_band
+from src.models.universal_score import DATA_DIR, OUTPUT_DIR
+
+CLUBS_NAME = "club_aggregates.parquet"
+LEAGUES_NAME = "league_aggregates.parquet"
+
+BREAKOUT_SCORE = 70.0
+
+PLAYER_COLUMNS = [
+    "player_id", "date_of_birth", "market_value_in_eur", "current_club_id",
+    "current_club_name", "current_club_domestic_competition_id", "last_season",
+]
+
+_aggregates = {}
+
+
+def _age_column(band):
+    return f"players_{band.lower().replace('-', '_').replace('+', '_plus')}"
+
+
+def squad_aggregates(players, growth, reference_date=None):
+    """
+    Club and league summaries.
+
+    Args:
+        players: players.csv frame
+        growth: growth_scores.parquet frame (player_id, growth_potential_score)
+        reference_date: Date ages are computed at (default today)
+
+    Returns:
+        (clubs, leagues) DataFrames, one row per club_id / league_id
+    """
+    reference_date = pd.Timestamp(reference_date or date.today())
+    df = players[[c for c in PLAYER_COLUMNS if c in players.columns]].drop_duplicates("player_id")
+    if "last_season" in df.columns:
+        df = df[df["last_season"] == df["last_season"].max()]
+    df = df.dropna(subset=["current_club_id"]).merge(
+        growth[["player_id", "growth_potential_score"]], on="player_id", how="left"
+    )
+
+    age = (reference_date - pd.to_datetime(df["date_of_birth"], errors="coerce")).dt.days / 365.25
+    bands = pd.Series(age_band(age.to_numpy()), index=df.index)
+    df = df.assign(
+        club_id=df["current_club_id"].astype("int64"),
+        league_id=df["current_club_domestic_competition_id"].fillna("Unknown").astype(str),
+        age=age,
+        breakout=(df["growth_potential_score"] >= BREAKOUT_SCORE).astype("int64"),
+        **{_age_column(b): (bands == b).astype("int64") for b in AGE_BANDS},
+    )
+
+    aggregations = {
+        "squad_size": ("player_id", "size"),
+        "total_market_value": ("market_value_in_eur", "sum"),
+        "average_market_value": ("market_value_in_eur", "mean"),
+        "top_market_value": ("market_value_in_eur", "max"),
+        "average_growth_score": ("growth_potential_score", "mean"),
+        "breakout_candidates": ("breakout", "sum"),
+        "average_age": ("age", "mean"),
+        "median_age": ("age", "median"),
+        **{_age_column(b): (_age_column(b), "sum") for b in AGE_BANDS},
+    }
+    clubs = df.groupby("club_id").agg(
+        club_name=("current_club_name", "first"), league_id=("league_id", "first"), **aggregations
+    ).reset_index()
+    leagues = df.groupby("league_id").agg(clubs=("club_id", "nunique"), **aggregations).reset_index()
+    return clubs, leagues
+
+
+def refresh_squad_aggregates(artifacts_dir=OUTPUT_DIR, players_path=DATA_DIR / "players.csv", reference_date=None):
+    """Rebuild both files from players.csv and the growth scores in artifacts_dir."""
+    from src.models.incremental_update import GROWTH_NAME, _write_parquet
+
+    artifacts_dir = Path(artifacts_dir)
+    players = pd.read_csv(players_path, dtype={"player_id": "int64"})
+    clubs, leagues = squad_aggregates(players, pd.read_parquet(artifacts_dir / GROWTH_NAME), reference_date)
+    _write_parquet(clubs, artifacts_dir / CLUBS_NAME)
+    _write_parquet(leagues, artifacts_dir / LEAGUES_NAME)
+    return clubs, leagues
+
+
+def _summary(row):
+    """One aggregate row -> JSON-friendly dict with the age profile nested."""
+    out = {k: (None if isinstance(v, float) and np.isnan(v) else v) for k, v in row.items()}
+    out["age_profile"] = {
+        "average_age": out.pop("average_age"),
+        "median_age": out.pop("median_age"),
+        "players_by_age_band": {b: int(out.pop(_age_column(b))) for b in AGE_BANDS},
+    }
+    out["breakout_threshold"] = BREAKOUT_SCORE
+    return out
+
+
+def get_summary(kind, key, artifacts_dir=OUTPUT_DIR):
+    """
+    Summary for one club ("clubs", club_id) or league ("leagues", league_id).
+
+    Files are re-read when a refresh has replaced them. Returns None if the
+    id is unknown; raises FileNotFoundError if the aggregates were never built.
+    """
+    path = Path(artifacts_dir) / (CLUBS_NAME if kind == "clubs" else LEAGUES_NAME)
+    mtime = path.stat().st_mtime
+    cached = _aggregates.get(path)
+    if cached is None or cached[0] != mtime:
+        df = pd.read_parquet(path)
+        index = "club_id" if kind == "clubs" else "league_id"
+        cached = (mtime, df.set_index(index, drop=False))
+        _aggregates[path] = cached
+
+    df = cached[1]
+    if key not in df.index:
+        return None
+    row = {k: (v.item() if hasattr(v, "item") else v) for k, v in df.loc[key].items()}
+    return _summary(row)
+
+
+# ---------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build club and league aggregates.")
+    parser.add_argument("--data-dir", type=str, default=str(DATA_DIR), help="Directory with players.csv")
+    parser.add_argument("--artifacts-dir", type=str, default=str(OUTPUT_DIR),
+                        help="incremental_update artifacts (written here too)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    clubs, leagues = refresh_squad_aggregates(args.artifacts_dir, Path(args.data_dir) / "players.csv")
+    print(f"{len(clubs)} clubs, {len(leagues)} leagues in {time.perf_counter() - start:.2f}s")
+    print(clubs.sort_values("total_market_value", ascending=False).head(10).to_string(index=False))
@@ -0,0 +1,274 @@
+"""Online transfer-fee predictions from the XGBoost model trained in xgboost.ipynb.
+
+The notebook saves the booster as best_xgb_model.json, trained on a numpy
+matrix with the columns of FEATURE_COLUMNS (log1p(fee) target). This module
+rebuilds those features for any player in players.csv, using the notebook's
+feature engineering. Each prediction is a hypothetical transfer dated on the
+reference day (default: today), from the player's current club to to_club_id
+(default: the same club). With a FeatureStore attached, requests for the day
+the store was built for read the rows it holds instead of recomputing them.
+
+    predictor = TransferFeePredictor.from_data_dir("data")
+    predictor.predict([8198, 28003])
+
+CLI:
+    python -m src.models.transfer_fee_inference --player-ids 8198 28003
+"""
+
+import os
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.models.rolling_windows import AppearanceWindows
+from src.models.universal_score import APPEARANCE_DTYPES, DATA_DIR, _read_csv
+
+MODEL_PATH = Path(os.getenv("XGB_MODEL_PATH", Path(__file__).resolve().parent / "best_xgb_model.json"))
+
+# Column order of X_full in xgboost.ipynb (the booster carries no feature names)
+FEATURE_COLUMNS = [
+    "market_value_in_eur", "height_in_cm", "age_at_transfer", "contract_years_left",
+    "from_total_market_value", "from_squad_size", "from_average_age",
+    "from_foreigners_percentage", "to_total_market_value", "to_squad_size",
+    "to_average_age", "to_foreigners_percentage", "minutes_365", "goals_365",
+    "assists_365", "yellow_365", "red_365", "games_365", "goals_per90",
+    "assists_per90", "cards_per90", "minutes_per_game", "position_Defender",
+    "position_Goalkeeper", "position_Midfield", "sub_position_Central Midfield",
+    "sub_position_Centre-Back", "sub_position_Centre-Forward",
+    "sub_position_Defensive Midfield", "sub_position_Goalkeeper",
+    "sub_position_Left Midfield", "sub_position_Left Winger", "sub_position_Left-Back",
+    "sub_position_Right Midfield", "sub_position_Right Winger", "sub_position_Right-Back",
+    "sub_position_Second Striker", "foot_both", "foot_left", "foot_right",
+    "log_market_value_in_eur", "transfer_year",
+]
+CATEGORICAL_COLUMNS = ["position", "sub_position", "foot"]
+CLUB_STAT_COLUMNS = ["total_market_value", "squad_size", "average_age", "foreigners_percentage"]
+
+PLAYER_COLUMNS = [
+    "player_id", "name", "date_of_birth", "contract_expiration_date", "height_in_cm",
+    "market_value_in_eur", "current_club_id",
+] + CATEGORICAL_COLUMNS
+
+_booster = None
+
+
+def _day_numbers(dates):
+    """Dates -> float days since epoch (NaN where missing)."""
+    days = pd.to_datetime(dates, errors="coerce").to_numpy(dtype="datetime64[D]")
+    return np.where(np.isnat(days), np.nan, days.astype("int64"))
+
+
+def load_booster(path=MODEL_PATH):
+    """Load best_xgb_model.json once and cache it."""
+    global _booster
+    if _booster is None:
+        import xgboost as xgb
+
+        if not Path(path).exists():
+            raise FileNotFoundError(
+                f"XGBoost model not found at {path}; run xgboost.ipynb or set XGB_MODEL_PATH"
+            )
+        booster = xgb.Booster()
+        booster.load_model(str(path))
+        if booster.num_features() != len(FEATURE_COLUMNS):
+            raise ValueError(
+                f"Model expects {booster.num_features()} features, FEATURE_COLUMNS has {len(FEATURE_COLUMNS)}"
+            )
+        _booster = booster
+    return _booster
+
+
+class TransferFeePredictor:
+    """Feature rows and predictions for any player, from the raw data tables."""
+
+    def __init__(self, players, clubs, appearances, booster=None, store=None):
+        """
+        Args:
+            players: players.csv frame
+            clubs: clubs.csv frame
+            appearances: appearances.csv frame (player_id, date and the count columns)
+            booster: Loaded xgboost Booster (default: load_booster() on first predict)
+            store: FeatureStore; rows it holds for its reference_date are read
+                   instead of recomputed
+        """
+        players = players[[c for c in PLAYER_COLUMNS if c in players.columns]].drop_duplicates("player_id")
+        self.player_index = pd.Index(players["player_id"].astype("int64"))
+
+        # Column arrays aligned with player_index, plus a trailing NaN row for unknown ids
+        def column(values):
+            return np.append(np.asarray(values, dtype="float64"), np.nan)
+
+        self.market_value = column(players["market_value_in_eur"])
+        self.height = column(players["height_in_cm"])
+        self.birth_day = column(_day_numbers(players["date_of_birth"]))
+        self.contract_day = column(_day_numbers(players["contract_expiration_date"]))
+        self.club_id = column(players["current_club_id"])
+        self.categories = {
+            cat: np.append(players[cat].fillna("Unknown").astype(str).to_numpy(dtype=object), "Unknown")
+            if cat in players.columns else np.full(len(players) + 1, "Unknown", dtype=object)
+            for cat in CATEGORICAL_COLUMNS
+        }
+
+        clubs = clubs.drop_duplicates("club_id")
+        self.club_index = pd.Index(clubs["club_id"].astype("int64"))
+        stats = clubs[CLUB_STAT_COLUMNS].apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float64")
+        self.club_stats = np.vstack([stats, np.full(len(CLUB_STAT_COLUMNS), np.nan)])
+        self.club_names = clubs["name"].to_numpy(dtype=object) if "name" in clubs.columns else None
+
+        self.windows = AppearanceWindows(appearances)
+        self.booster = booster
+        self.store = store
+
+    @property
+    def columns(self):
+        """Booster column order if the saved model carries names, else FEATURE_COLUMNS."""
+        if self.booster is not None and self.booster.feature_names:
+            return list(self.booster.feature_names)
+        return FEATURE_COLUMNS
+
+    @property
+    def default_reference_date(self):
+        """Transfer date used when none is given: today."""
+        return pd.Timestamp(date.today())
+
+    @classmethod
+    def from_data_dir(cls, data_dir=DATA_DIR, booster=None, store=None):
+        """Load players.csv, clubs.csv and appearances.csv from data_dir."""
+        data_dir = Path(data_dir)
+        players = pd.read_csv(data_dir / "players.csv", dtype={"player_id": "int64"})
+        clubs = pd.read_csv(data_dir / "clubs.csv")
+        appearances = _read_csv(data_dir / "appearances.csv", APPEARANCE_DTYPES)
+        return cls(players, clubs, appearances, booster=booster, store=store)
+
+    def __contains__(self, player_id):
+        return player_id in self.player_index
+
+    def current_club_ids(self, player_ids):
+        """Current club id per player (None if unknown)."""
+        clubs = self.club_id[self.player_index.get_indexer(np.asarray(player_ids, dtype="int64"))]
+        return [None if np.isnan(c) else int(c) for c in clubs]
+
+    def club_name(self, club_id):
+        """Club name from clubs.csv, or None."""
+        if club_id is None or self.club_names is None or club_id not in self.club_index:
+            return None
+        return self.club_names[self.club_index.get_loc(club_id)]
+
+    def _club_rows(self, club_ids):
+        rows = self.club_index.get_indexer(np.nan_to_num(club_ids, nan=-1).astype("int64"))
+        return self.club_stats[rows]  # -1 picks the NaN row
+
+    def feature_matrix(self, player_ids, to_club_ids=None, reference_date=None):
+        """
+        float32 feature matrix (columns in self.columns order) for hypothetical transfers.
+
+        Args:
+            player_ids: Player ids (unknown ids get zeros apart from transfer_year)
+            to_club_ids: Destination club per player (None entries: stay at the current club)
+            reference_date: Transfer date (or one per player) used for age, contract
+                            and the 365-day window; default default_reference_date
+        """
+        ids = np.asarray(player_ids, dtype="int64")
+        if reference_date is None:
+            reference_date = self.default_reference_date
+        store = self.store  # may be swapped for a newer version while we run
+        if store is None or np.ndim(reference_date) or pd.Timestamp(reference_date) != store.reference_date:
+            return self._compute_matrix(ids, to_club_ids, reference_date)
+
+        # Rows for the store's date and the current club are precomputed
+        matrix, stored = store.rows(ids, self.columns)
+        if to_club_ids is not None:
+            stored &= np.array([c is None for c in to_club_ids])
+        if not stored.all():
+            todo = ~stored
+            to_clubs = None if to_club_ids is None else [c for c, t in zip(to_club_ids, todo) if t]
+            matrix[todo] = self._compute_matrix(ids[todo], to_clubs, reference_date)
+        return matrix
+
+    def _compute_matrix(self, ids, to_club_ids, reference_date):
+        """Feature rows from the raw tables (see feature_matrix)."""
+        rows = self.player_index.get_indexer(ids)  # -1 picks the NaN row
+
+        window, ref_day = self.windows.arrays(ids, reference_date)
+        feats = dict(window)
+        feats["market_value_in_eur"] = self.market_value[rows]
+        feats["height_in_cm"] = self.height[rows]
+        feats["age_at_transfer"] = (ref_day - self.birth_day[rows]) / 365.25
+        feats["contract_years_left"] = (self.contract_day[rows] - ref_day) / 365.25
+
+        from_club = self.club_id[rows]
+        to_club = from_club
+        if to_club_ids is not None:
+            requested = np.array([np.nan if c is None else c for c in to_club_ids], dtype="float64")
+            to_club = np.where(np.isnan(requested), from_club, requested)
+        for prefix, club_ids in (("from_", from_club), ("to_", to_club)):
+            stats = self._club_rows(club_ids)
+            for i, col in enumerate(CLUB_STAT_COLUMNS):
+                feats[prefix + col] = stats[:, i]
+
+        # One-hot exactly like pd.get_dummies(..., drop_first=True) produced in training
+        columns = self.columns
+        for cat, values in self.categories.items():
+            values = values[rows]
+            for col in columns:
+                if col.startswith(cat + "_"):
+                    feats[col] = values == col[len(cat) + 1:]
+
+        feats["log_market_value_in_eur"] = np.log1p(feats["market_value_in_eur"])
+        feats["transfer_year"] = ref_day.astype("datetime64[D]").astype("datetime64[Y]").astype("int64") + 1970
+
+        matrix = np.zeros((len(ids), len(columns)), dtype="float32")
+        for j, col in enumerate(columns):
+            if col in feats:
+                matrix[:, j] = feats[col]
+        return np.nan_to_num(matrix, nan=0.0)
+
+    def build_features(self, player_ids, to_club_ids=None, reference_date=None):
+        """feature_matrix() as a DataFrame with named columns."""
+        return pd.DataFrame(
+            self.feature_matrix(player_ids, to_club_ids, reference_date), columns=self.columns
+        )
+
+    def predict(self, player_ids, to_club_ids=None, reference_date=None):
+        """
+        Predicted transfer fees.
+
+        Returns:
+            List of dicts (player_id, known_player, pred_log_transfer_fee, pred_transfer_fee)
+        """
+        if self.booster is None:
+            self.booster = load_booster()
+        log_fee = self.booster.inplace_predict(self.feature_matrix(player_ids, to_club_ids, reference_date))
+        return [
+            {
+                "player_id": int(pid),
+                "known_player": pid in self.player_index,
+                "pred_log_transfer_fee": float(lf),
+                "pred_transfer_fee": float(np.expm1(lf)),
+            }
+            for pid, lf in zip(player_ids, log_fee)
+        ]
+
+
+# ---------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(description="Predict transfer fees with best_xgb_model.json.")
+    parser.add_argument("--player-ids", type=int, nargs="+", required=True)
+    parser.add_argument("--to-club-id", type=int, default=None, help="Destination club (default: current club)")
+    parser.add_argument("--data-dir", type=str, default=str(DATA_DIR))
+    parser.add_argument("--model", type=str, default=str(MODEL_PATH))
+    args = parser.parse_args()
+
+    predictor = TransferFeePredictor.from_data_dir(args.data_dir, booster=load_booster(args.model))
+    start = time.perf_counter()
+    results = predictor.predict(args.player_ids, [args.to_club_id] * len(args.player_ids))
+    print(json.dumps(results, indent=2))
+    print(f"{len(results)} predictions in {(time.perf_counter() - start) * 1000:.1f} ms")
@@ -0,0 +1,345 @@
+"""Universal score time series for every player (productionized dual.ipynb).
+
+Reads appearances.csv, games.csv, player_valuations.csv and players.csv,
+scores every appearance, attaches the latest valuation on or before each game
+and writes one columnar file with the per-player series:
+
+    player_id, player_name, time, game_id, profile,
+    universal_score, universal_score_100, market_value
+
+With --profiles universal the output matches the notebook's
+player_game_scores_and_values.csv (appearances whose game is missing from
+games.csv fall back to their own date instead of being dropped). With
+--profiles position each player is scored with the profile for their position
+in players.csv, and universal_score_100 is min-max scaled within each profile.
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+# ---------------------------------------------------------
+# Scoring profiles
+# ---------------------------------------------------------
+# raw = goals*g90 + assists*a90 - cards*(yellow + 3*red)/90'
+#       + clean_sheet*[60'+ played, nothing conceded] - conceded*goals_conceded*(minutes/90)
+# then multiplied by min(minutes / 30, 1) to downweight short cameos.
+WEIGHT_KEYS = ["goals", "assists", "cards", "clean_sheet", "conceded"]
+
+SCORING_PROFILES = {
+    # dual.ipynb formula, identical for every position
+    "universal": {"goals": 4.0, "assists": 3.0, "cards": 1.0, "clean_sheet": 0.0, "conceded": 0.0},
+    "attack": {"goals": 4.0, "assists": 3.0, "cards": 1.0, "clean_sheet": 0.0, "conceded": 0.0},
+    "midfield": {"goals": 4.5, "assists": 3.5, "cards": 1.0, "clean_sheet": 0.5, "conceded": 0.0},
+    "defender": {"goals": 5.0, "assists": 4.0, "cards": 1.0, "clean_sheet": 2.0, "conceded": 0.5},
+    "goalkeeper": {"goals": 5.0, "assists": 4.0, "cards": 1.0, "clean_sheet": 3.0, "conceded": 1.0},
+}
+
+POSITION_PROFILES = {
+    "Attack": "attack",
+    "Midfield": "midfield",
+    "Defender": "defender",
+    "Goalkeeper": "goalkeeper",
+}
+
+CLEAN_SHEET_MIN_MINUTES = 60
+
+
+# ---------------------------------------------------------
+# CSV schemas (only the columns we need, with explicit dtypes)
+# ---------------------------------------------------------
+APPEARANCE_DTYPES = {
+    "game_id": "int64",
+    "player_id": "int64",
+    "player_club_id": "float64",  # may be missing
+    "date": "string",
+    "goals": "float32",
+    "assists": "float32",
+    "yellow_cards": "float32",
+    "red_cards": "float32",
+    "minutes_played": "float32",
+}
+COUNT_COLS = ["goals", "assists", "yellow_cards", "red_cards", "minutes_played"]
+
+GAME_DTYPES = {
+    "game_id": "int64",
+    "date": "string",
+    "home_club_id": "float64",
+    "away_club_id": "float64",
+    "home_club_goals": "float32",
+    "away_club_goals": "float32",
+}
+
+VALUATION_DTYPES = {
+    "player_id": "int64",
+    "date": "string",
+    "market_value_in_eur": "float64",
+}
+
+PLAYER_DTYPES = {
+    "player_id": "int64",
+    "name": "string",
+    "first_name": "string",
+    "last_name": "string",
+    "position": "string",
+}
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DATA_DIR = BASE_DIR / "data"
+OUTPUT_DIR = BASE_DIR / "src" / "json_generator" / "model_data"
+OUTPUT_NAME = "player_game_scores_and_values"
+
+
+def _read_csv(path, dtypes, **kwargs):
+    """read_csv restricted to the known columns that exist in the file."""
+    return pd.read_csv(path, usecols=lambda c: c in dtypes, dtype=dtypes, **kwargs)
+
+
+# ---------------------------------------------------------
+# 1. Reference tables
+# ---------------------------------------------------------
+def load_players(path):
+    """player_id -> player_name, profile (by position)."""
+    players = _read_csv(path, PLAYER_DTYPES)
+
+    if "name" in players.columns:
+        players["player_name"] = players["name"]
+    elif {"first_name", "last_name"}.issubset(players.columns):
+        players["player_name"] = (
+            players["first_name"].fillna("") + " " + players["last_name"].fillna("")
+        ).str.strip()
+    else:
+        players["player_name"] = players["player_id"].astype(str)
+
+    position = players["position"] if "position" in players.columns else pd.Series(pd.NA, index=players.index)
+    players["profile"] = position.map(POSITION_PROFILES).fillna("universal")
+
+    return players[["player_id", "player_name", "profile"]].drop_duplicates("player_id")
+
+
+def load_games(path):
+    """game_id -> match date and both clubs' goals."""
+    games = _read_csv(path, GAME_DTYPES)
+    games["date"] = pd.to_datetime(games["date"], errors="coerce")
+    return games.drop_duplicates("game_id").set_index("game_id")
+
+
+def load_valuations(path, chunksize=None):
+    """Valuations sorted by date, without missing dates/values."""
+    if chunksize:
+        parts = [_prepare_valuations(c) for c in _read_csv(path, VALUATION_DTYPES, chunksize=chunksize)]
+        vals = pd.concat(parts, ignore_index=True)
+    else:
+        vals = _prepare_valuations(_read_csv(path, VALUATION_DTYPES))
+    return vals.sort_values(["date", "player_id"], kind="stable").reset_index(drop=True)
+
+
+def _prepare_valuations(vals):
+    vals = vals.dropna(subset=["date", "market_value_in_eur"]).copy()
+    vals["date"] = pd.to_datetime(vals["date"], errors="coerce")
+    return vals.dropna(subset=["date"])[["player_id", "date", "market_value_in_eur"]]
+
+
+# ---------------------------------------------------------
+# 2. Per-appearance scoring (vectorized)
+# ---------------------------------------------------------
+def prepare_appearances(apps, games, profiles_by_player, mode="position"):
+    """Attach match date, goals conceded and scoring profile to raw appearance rows."""
+    apps = apps.copy()
+    for col in COUNT_COLS:
+        if col not in apps.columns:
+            apps[col] = 0.0
+    apps[COUNT_COLS] = apps[COUNT_COLS].fillna(0)
+
+    # Trust games.csv for the match date, as the notebook does; fall back to
+    # the appearance's own date only for games we don't know about.
+    game_rows = games.reindex(apps["game_id"].to_numpy())
+    own_date = (
+        pd.to_datetime(apps["date"], errors="coerce")
+        if "date" in apps.columns else pd.Series(pd.NaT, index=apps.index)
+    )
+    apps["date"] = pd.Series(game_rows["date"].to_numpy(), index=apps.index).fillna(own_date)
+
+    club = apps["player_club_id"].to_numpy() if "player_club_id" in apps.columns else np.full(len(apps), np.nan)
+    home = game_rows["home_club_id"].to_numpy()
+    conceded = np.where(
+        club == home,
+        game_rows["away_club_goals"].to_numpy(),
+        np.where(club == game_rows["away_club_id"].to_numpy(), game_rows["home_club_goals"].to_numpy(), np.nan),
+    )
+    apps["goals_conceded"] = conceded.astype("float32")
+
+    if mode == "universal":
+        apps["profile"] = "universal"
+    else:
+        apps["profile"] = apps["player_id"].map(profiles_by_player).fillna("universal")
+
+    return apps
+
+
+def score_appearances(apps):
+    """Raw (unscaled) score for every row, using each row's scoring profile."""
+    names = list(SCORING_PROFILES)
+    weights = np.array([[SCORING_PROFILES[n][k] for k in WEIGHT_KEYS] for n in names])
+    codes = pd.Categorical(apps["profile"], categories=names).codes
+    w = weights[np.where(codes < 0, names.index("universal"), codes)]
+
+    minutes = apps["minutes_played"].to_numpy(dtype="float64")
+    mp = np.clip(minutes, 1, None)  # avoid division by zero
+    goals_per90 = apps["goals"].to_numpy(dtype="float64") * 90.0 / mp
+    assists_per90 = apps["assists"].to_numpy(dtype="float64") * 90.0 / mp
+    cards_per90 = (
+        apps["yellow_cards"].to_numpy(dtype="float64") + 3 * apps["red_cards"].to_numpy(dtype="float64")
+    ) * 90.0 / mp
+
+    conceded = apps["goals_conceded"].to_numpy(dtype="float64")
+    known = ~np.isnan(conceded)
+    clean_sheet = (known & (conceded == 0) & (minutes >= CLEAN_SHEET_MIN_MINUTES)).astype("float64")
+    conceded_share = np.where(known, conceded, 0.0) * np.clip(minutes / 90.0, 0, 1)
+
+    raw = (
+        w[:, 0] * goals_per90
+        + w[:, 1] * assists_per90
+        - w[:, 2] * cards_per90
+        + w[:, 3] * clean_sheet
+        - w[:, 4] * conceded_share
+    )
+
+    # Downweight very short cameos (< 30 minutes)
+    short_factor = np.clip(minutes / 30.0, None, 1.0)
+    return raw * short_factor
+
+
+def update_bounds(bounds, profiles, raw):
+    """Fold a chunk's per-profile min/max into bounds {profile: [min, max]}."""
+    frame = pd.DataFrame({"profile": profiles.to_numpy(), "raw": raw})
+    for profile, stats in frame.groupby("profile")["raw"].agg(["min", "max"]).iterrows():
+        lo, hi = float(stats["min"]), float(stats["max"])
+        if profile in bounds:
+            lo, hi = min(lo, bounds[profile][0]), max(hi, bounds[profile][1])
+        bounds[profile] = [lo, hi]
+    return bounds
+
+
+def scale_scores(profiles, raw, bounds):
+    """Min-max scale raw scores to 0-100 within each profile."""
+    lo = profiles.map(lambda p: bounds[p][0]).to_numpy(dtype="float64")
+    hi = profiles.map(lambda p: bounds[p][1]).to_numpy(dtype="float64")
+    span = hi - lo
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scaled = (raw - lo) / span * 100.0
+    # Degenerate case: all games in a profile have the same score
+    return np.where(span == 0, 50.0, scaled)
+
+
+# ---------------------------------------------------------
+# 3. As-of join to valuations (one sorted merge for all players)
+# ---------------------------------------------------------
+def attach_valuations(apps, vals):
+    """Attach the latest valuation on or before each appearance date."""
+    left = apps.dropna(subset=["date"]).sort_values(["date", "player_id"], kind="stable")
+    merged = pd.merge_asof(
+        left,
+        vals.rename(columns={"market_value_in_eur": "market_value"}),
+        on="date",
+        by="player_id",
+        direction="backward",
+    )
+    # Drop appearances earlier than the player's first valuation
+    return merged.dropna(subset=["market_value"])
+
+
+# ---------------------------------------------------------
+# 4. Full pipeline
+# ---------------------------------------------------------
+def build_universal_scores(data_dir=DATA_DIR, mode="position", chunksize=500_000):
+    """Return (series DataFrame, metadata dict) for every player."""
+    data_dir = Path(data_dir)
+    players = load_players(data_dir / "players.csv")
+    games = load_games(data_dir / "games.csv")
+    profiles_by_player = players.set_index("player_id")["profile"]
+
+    keep_cols = ["player_id", "game_id", "date", "profile", "universal_score"]
+    scored_chunks = []
+    bounds = {}
+    n_appearances = 0
+
+    for chunk in _read_csv(data_dir / "appearances.csv", APPEARANCE_DTYPES, chunksize=chunksize):
+        n_appearances += len(chunk)
+        apps = prepare_appearances(chunk, games, profiles_by_player, mode=mode)
+        apps["universal_score"] = score_appearances(apps)
+        # Bounds cover every scored appearance, as in the notebook
+        update_bounds(bounds, apps["profile"], apps["universal_score"].to_numpy())
+        scored_chunks.append(apps[keep_cols])
+
+    apps = pd.concat(scored_chunks, ignore_index=True)
+    apps["profile"] = apps["profile"].astype("category")
+    apps["universal_score_100"] = scale_scores(apps["profile"].astype(str), apps["universal_score"].to_numpy(), bounds)
+
+    vals = load_valuations(data_dir / "player_valuations.csv", chunksize=chunksize)
+    merged = attach_valuations(apps, vals)
+
+    merged = merged.merge(players[["player_id", "player_name"]], on="player_id", how="left")
+    series = merged.rename(columns={"date": "time"})[[
+        "player_id", "player_name", "time", "game_id", "profile",
+        "universal_score", "universal_score_100", "market_value",
+    ]].sort_values(["player_id", "time"], kind="stable").reset_index(drop=True)
+
+    meta = {
+        "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "profiles_mode": mode,
+        "profiles": {name: SCORING_PROFILES[name] for name in bounds},
+        "bounds": bounds,
+        "appearances_read": n_appearances,
+        "rows": int(len(series)),
+        "players": int(series["player_id"].nunique()),
+        "last_appearance_date": str(apps["date"].max().date()) if apps["date"].notna().any() else None,
+        "last_valuation_date": str(vals["date"].max().date()) if len(vals) else None,
+    }
+    return series, meta
+
+
+def write_universal_scores(series, meta, output_dir=OUTPUT_DIR, name=OUTPUT_NAME):
+    """Write <name>.parquet (sorted by player_id, time) and <name>.meta.json."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    parquet_path = output_dir / f"{name}.parquet"
+    series.to_parquet(parquet_path, index=False, row_group_size=250_000)
+    with open(output_dir / f"{name}.meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return parquet_path
+
+
+def read_player_series(path, player_id):
+    """Read one player's series; row-group statistics skip everything else."""
+    return pd.read_parquet(path, filters=[("player_id", "==", int(player_id))])
+
+
+# ---------------------------------------------------------
+# 5. CLI entry point
+# ---------------------------------------------------------
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(
+        description="Build universal score time series for every player."
+    )
+    parser.add_argument("--data-dir", type=str, default=str(DATA_DIR),
+                        help="Directory with appearances.csv, games.csv, player_valuations.csv, players.csv")
+    parser.add_argument("--output-dir", type=str, default=str(OUTPUT_DIR))
+    parser.add_argument("--profiles", choices=["position", "universal"], default="position",
+                        help="'universal' reproduces dual.ipynb exactly")
+    parser.add_argument("--chunksize", type=int, default=500_000,
+                        help="Rows per CSV chunk")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    series, meta = build_universal_scores(args.data_dir, mode=args.profiles, chunksize=args.chunksize)
+    path = write_universal_scores(series, meta, args.output_dir)
+    print(f"Saved {meta['rows']} rows for {meta['players']} players to {path} "
+          f"in {time.perf_counter() - start:.1f}s")
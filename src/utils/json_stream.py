@@ -0,0 +1,131 @@
+"""Incremental JSON parsing for streamed structured outputs.
+
+IncrementalJSONParser is fed the text deltas of a streamed completion and
+returns each value as soon as it is closed, so a client can show a report
+section while later sections are still being generated:
+
+    parser = IncrementalJSONParser(max_depth=2)
+    async for chunk in stream:
+        for path, value in parser.feed(delta_text(chunk)):
+            ...   # e.g. (("report", "executive_summary"), "...")
+
+Values are emitted in the order they close (children before their parent)
+for paths of length 1..max_depth. Text before the first "{" or "[" (e.g. a
+```json fence) is skipped, and so is anything after the root closes.
+"""
+
+import json
+from typing import Any, List, Optional, Tuple, Union
+
+PathPart = Union[str, int]
+Event = Tuple[Tuple[PathPart, ...], Any]
+
+_WHITESPACE = " \t\r\n"
+
+
+class _Frame:
+    """An open object or array and the child value currently being read."""
+
+    __slots__ = ("is_object", "key", "index", "expect_key", "value_start")
+
+    def __init__(self, is_object: bool):
+        self.is_object = is_object
+        self.key: Optional[str] = None
+        self.index = 0
+        self.expect_key = is_object
+        self.value_start: Optional[int] = None
+
+
+class IncrementalJSONParser:
+    """Emit (path, value) for every value closed at depth 1..max_depth.
+
+    Args:
+        max_depth: Deepest path length to emit (1 = the root's members only).
+
+    Raises:
+        json.JSONDecodeError: From feed(), if a closed value is not valid JSON.
+    """
+
+    def __init__(self, max_depth: int = 1):
+        self.max_depth = max_depth
+        self.text = ""
+        self.done = False
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._string_is_key = False
+        self._string_start = 0
+        self._scalar = False
+
+    def feed(self, chunk: str) -> List[Event]:
+        """Add streamed text; return the values it closed."""
+        events: List[Event] = []
+        if self.done or not chunk:
+            return events
+        self.text += chunk
+        text = self.text
+        for i in range(self._pos, len(text)):
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._string_is_key:
+                        self._stack[-1].key = json.loads(text[self._string_start:i + 1])
+                    else:
+                        self._close(i + 1, events)
+                continue
+
+            if not self._stack:
+                if c in "{[":
+                    self._stack.append(_Frame(c == "{"))
+                continue
+            if self._scalar and (c in _WHITESPACE or c in ",}]"):
+                self._scalar = False
+                self._close(i, events)
+            if c in _WHITESPACE:
+                continue
+
+            frame = self._stack[-1]
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+                self._string_is_key = frame.is_object and frame.expect_key
+                if not self._string_is_key:
+                    frame.value_start = i
+            elif c in "{[":
+                frame.value_start = i
+                self._stack.append(_Frame(c == "{"))
+            elif c in "}]":
+                self._stack.pop()
+                if not self._stack:
+                    self.done = True
+                    self._pos = i + 1
+                    return events
+                self._close(i + 1, events)
+            elif c == ":":
+                frame.expect_key = False
+            elif c == ",":
+                if frame.is_object:
+                    frame.expect_key = True
+                else:
+                    frame.index += 1
+            elif not self._scalar:
+                self._scalar = True
+                frame.value_start = i
+        self._pos = len(text)
+        return events
+
+    def _path(self) -> Tuple[PathPart, ...]:
+        return tuple(f.key if f.is_object else f.index for f in self._stack)
+
+    def _close(self, end: int, events: List[Event]):
+        """The current child of the innermost open container ends at `end`."""
+        if len(self._stack) > self.max_depth:
+            return
+        frame = self._stack[-1]
+        events.append((self._path(), json.loads(self.text[frame.value_start:end])))
@@ -0,0 +1,41 @@
+"""Request id carried through async tasks and stamped on every log record.
+
+The API middleware sets the id per request (from an incoming X-Request-ID
+header or a fresh one). Tasks created while handling the request (the
+parallel agents of a report, stream generators) inherit it through
+contextvars, and every log record gets it as %(request_id)s, so the log
+lines of one report can be grepped together.
+"""
+
+import contextvars
+import logging
+import uuid
+
+REQUEST_ID = contextvars.ContextVar("request_id", default="-")
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def get_request_id() -> str:
+    return REQUEST_ID.get()
+
+
+def set_request_id(request_id: str) -> contextvars.Token:
+    return REQUEST_ID.set(request_id)
+
+
+def install_log_record_factory():
+    """Give every LogRecord a request_id attribute (idempotent)."""
+    previous = logging.getLogRecordFactory()
+    if getattr(previous, "adds_request_id", False):
+        return
+
+    def factory(*args, **kwargs):
+        record = previous(*args, **kwargs)
+        record.request_id = REQUEST_ID.get()
+        return record
+
+    factory.adds_request_id = True
+    logging.setLogRecordFactory(factory)
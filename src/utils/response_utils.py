@@ -34,9 +34,28 @@ def extract_json_from_response(response: Any, key: Optional[str] = None) -> Opti
         else:
             return None
             
-        if not content:
-            return None
+        return extract_json_from_text(content, key)
         
+    except (AttributeError, KeyError, IndexError):
+        return None
+
+
+def extract_json_from_text(content: Optional[str], key: Optional[str] = None) -> Optional[Any]:
+    """Parse JSON from model output text (e.g. the joined deltas of a stream).
+    
+    Accepts bare JSON, JSON in a markdown code block, or JSON embedded in text.
+    
+    Args:
+        content: Model output text
+        key: Optional key to extract from the parsed JSON (see extract_json_from_response)
+    
+    Returns:
+        Parsed JSON object, or value at key if key is provided, or None if extraction fails
+    """
+    if not content:
+        return None
+    
+    try:
         # Try to parse JSON directly
         try:
             parsed = json.loads(content)
@@ -59,6 +78,5 @@ def extract_json_from_response(response: Any, key: Optional[str] = None) -> Opti
         
         return parsed
         
-    except (json.JSONDecodeError, AttributeError, KeyError, IndexError):
+    except json.JSONDecodeError:
         return None
-
@@ -0,0 +1,92 @@
+"""JSON Schema checks for structured LLM outputs.
+
+validate() covers the keywords the schemas in configs/schemas use (type,
+properties, required, additionalProperties, items, minItems/maxItems,
+enum), so no jsonschema dependency is needed. quality_issues() adds the
+content checks a schema-valid output can still fail: narrative sections
+that are blank or too short, and lists that should not be empty.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "null": type(None),
+}
+
+
+def _is_type(value: Any, kind: str) -> bool:
+    if kind in ("integer", "number") and isinstance(value, bool):
+        return False
+    if kind == "integer" and isinstance(value, float):
+        return value.is_integer()
+    return isinstance(value, _TYPES.get(kind, object))
+
+
+def validate(instance: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """Schema violations as "path: problem" strings (empty list = valid)."""
+    errors = []
+    kinds = schema.get("type")
+    if kinds is not None:
+        kinds = kinds if isinstance(kinds, list) else [kinds]
+        if not any(_is_type(instance, k) for k in kinds):
+            return [f"{path}: expected {'/'.join(kinds)}, got {type(instance).__name__}"]
+    if "enum" in schema and instance not in schema["enum"]:
+        errors.append(f"{path}: {instance!r} not in {schema['enum']}")
+
+    if isinstance(instance, dict):
+        properties = schema.get("properties", {})
+        for name in schema.get("required", []):
+            if name not in instance:
+                errors.append(f"{path}.{name}: missing")
+        if schema.get("additionalProperties") is False:
+            errors.extend(f"{path}.{name}: not allowed" for name in instance if name not in properties)
+        for name, subschema in properties.items():
+            if name in instance:
+                errors.extend(validate(instance[name], subschema, f"{path}.{name}"))
+
+    if isinstance(instance, list):
+        if len(instance) < schema.get("minItems", 0):
+            errors.append(f"{path}: {len(instance)} items, at least {schema['minItems']} required")
+        if "maxItems" in schema and len(instance) > schema["maxItems"]:
+            errors.append(f"{path}: {len(instance)} items, at most {schema['maxItems']} allowed")
+        if "items" in schema:
+            for i, item in enumerate(instance):
+                errors.extend(validate(item, schema["items"], f"{path}[{i}]"))
+    return errors
+
+
+def _lookup(instance: Any, field: str) -> Any:
+    for part in field.split("."):
+        instance = instance.get(part) if isinstance(instance, dict) else None
+    return instance
+
+
+def quality_issues(
+    instance: Any,
+    text_fields: Sequence[str] = (),
+    min_text_chars: int = 1,
+    nonempty_fields: Sequence[str] = (),
+) -> List[str]:
+    """Sections that are schema-valid but empty or too short.
+
+    text_fields (dotted paths to narrative strings, e.g.
+    "report.executive_summary") need at least min_text_chars non-blank
+    characters; nonempty_fields (dotted paths to arrays) need at least one item.
+    """
+    issues = []
+    for field in text_fields:
+        value = _lookup(instance, field)
+        length = len(value.strip()) if isinstance(value, str) else 0
+        if length < max(min_text_chars, 1):
+            issues.append(f"$.{field}: {length} characters, at least {max(min_text_chars, 1)} expected")
+    for field in nonempty_fields:
+        value = _lookup(instance, field)
+        if not isinstance(value, list) or not value:
+            issues.append(f"$.{field}: empty")
+    return issues
@@ -0,0 +1,56 @@
+"""Single-flight coalescing of identical concurrent async calls."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time; concurrent callers with the same
+    key await the same task and get the same result (or exception).
+
+    Callers wait through asyncio.shield, so a caller that disconnects (is
+    cancelled) does not cancel the shared task: it completes for the
+    remaining waiters.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved even if every waiter has gone
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn() for key, joining an identical call that is already running.
+
+        Args:
+            key: Identity of the call (e.g. a hash of all inputs)
+            fn: Zero-argument coroutine function, only called by the first caller
+
+        Returns:
+            fn()'s result (exceptions are re-raised to every waiter)
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.leaders += 1
+        else:
+            self.followers += 1
+            logger.info(f"Joining in-flight call {key[:12]}")
+        return await asyncio.shield(task)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._inflight)
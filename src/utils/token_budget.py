@@ -0,0 +1,252 @@
+"""Token-budgeted prompt assembly for JSON payloads (player_data).
+
+Each top-level section of the payload is counted with a local tokenizer
+(tiktoken when installed, otherwise a regex approximation of its BPE
+pre-tokenizer). When the total exceeds the budget, the least important
+sections (highest priority number) are trimmed first, one step at a time,
+with the strategies configured for them:
+
+    last_n            keep the last n items of a list (recent games, transfers)
+    top_k             keep the k largest-magnitude items (SHAP features, coefficients)
+    summarize_series  replace a dated series by per-period means plus overall stats
+
+If trimming is not enough, sections not marked required are dropped.
+Sections without a policy are never touched. What was trimmed or dropped is
+logged and returned:
+
+    budgeter = TokenBudgeter(TOKEN_BUDGET_CONFIGS["player_data"], model="gpt-5-mini")
+    player_data, report = budgeter.fit(player_data, budget=8000, label="analysis_agent")
+"""
+
+import json
+import logging
+import math
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # optional: fall back to the approximation below
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODING = "o200k_base"
+
+# Digits in groups of three, letter runs, whitespace runs, single symbols -
+# the same pieces the o200k pre-tokenizer produces before BPE merges
+_PIECES = re.compile(r"\d{1,3}|[^\W\d_]+|\s+|[^\w\s]|_")
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: Optional[str]):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding(DEFAULT_ENCODING)
+    except KeyError:
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:  # encoding files not cached and no network
+        logger.warning(f"tiktoken unavailable ({e}); using approximate token counts")
+        return None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Number of tokens in text for the model's encoding (approximate without tiktoken)."""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    # Letter runs merge into roughly one token per six characters
+    return sum(math.ceil(len(p) / 6) if p[0].isalpha() else 1 for p in _PIECES.findall(text))
+
+
+def dumps(value: Any) -> str:
+    """Serialize a payload the way the agents put it in prompts."""
+    return json.dumps(value, indent=2, default=str)
+
+
+# ---------------------------------------------------------
+# Trimming strategies: (value, **params) -> smaller value
+# ---------------------------------------------------------
+def last_n(items, n: int = 5):
+    """Keep the last n items of a list (lists are in chronological order)."""
+    if not isinstance(items, list):
+        return items
+    return items[-n:] if n > 0 else []
+
+
+def top_k(items, k: int = 5, by: Optional[str] = None):
+    """Keep the k items with the largest absolute value.
+
+    Works on lists of dicts (ranked by item[by]) and on {name: number} dicts;
+    kept items stay in their original order.
+    """
+    def magnitude(v):
+        return abs(v) if isinstance(v, (int, float)) else -1.0
+
+    if isinstance(items, dict):
+        keep = set(sorted(items, key=lambda name: magnitude(items[name]), reverse=True)[:k])
+        return {name: v for name, v in items.items() if name in keep}
+    if isinstance(items, list) and by is not None:
+        ranked = sorted(range(len(items)), key=lambda i: magnitude(items[i].get(by)), reverse=True)[:k]
+        return [items[i] for i in sorted(ranked)]
+    return items
+
+
+def _period(date: str, period: str) -> str:
+    if period == "quarter":
+        return f"{date[:4]}-Q{(int(date[5:7]) - 1) // 3 + 1}"
+    if period == "year":
+        return date[:4]
+    return date[:7]
+
+
+def summarize_series(series, period: str = "month", keep_last: int = 12, date_field: str = "date"):
+    """Summarize a dated series: overall first/last/min/max/mean per numeric field,
+    plus per-period means for the last keep_last periods."""
+    if not isinstance(series, list) or not series:
+        return series
+    points = [p for p in series if isinstance(p, dict) and p.get(date_field)]
+    fields = [f for f in points[0] if f != date_field] if points else []
+
+    def stats(values):
+        values = [v for v in values if isinstance(v, (int, float))]
+        if not values:
+            return None
+        return {"first": round(values[0], 2), "last": round(values[-1], 2), "min": round(min(values), 2),
+                "max": round(max(values), 2), "mean": round(sum(values) / len(values), 2)}
+
+    buckets: Dict[str, List[dict]] = {}
+    for p in points:
+        buckets.setdefault(_period(str(p[date_field]), period), []).append(p)
+    periods = []
+    for key, group in list(buckets.items())[-keep_last:]:
+        row = {period: key, "points": len(group)}
+        for f in fields:
+            s = stats([p.get(f) for p in group])
+            row[f] = s["mean"] if s else None
+        periods.append(row)
+
+    return {
+        "summary": {
+            "points": len(points),
+            "from": str(points[0][date_field]) if points else None,
+            "to": str(points[-1][date_field]) if points else None,
+            **{f: stats([p.get(f) for p in points]) for f in fields},
+        },
+        "periods": periods,
+    }
+
+
+STRATEGIES: Dict[str, Callable] = {
+    "last_n": last_n,
+    "top_k": top_k,
+    "summarize_series": summarize_series,
+}
+
+
+def _apply(value, path: List[str], fn: Callable):
+    """Apply fn at a dotted path inside value ("*" maps over list items)."""
+    if not path:
+        return fn(value)
+    head, rest = path[0], path[1:]
+    if head == "*" and isinstance(value, list):
+        return [_apply(v, rest, fn) for v in value]
+    if isinstance(value, dict) and head in value:
+        return {**value, head: _apply(value[head], rest, fn)}
+    return value
+
+
+# ---------------------------------------------------------
+# Budgeter
+# ---------------------------------------------------------
+class TokenBudgeter:
+    """Fits a dict payload into a token budget using per-section policies.
+
+    Args:
+        sections: {section: {"priority": int, "required": bool, "steps": [
+                  {"strategy": name, "field": "dotted.path", **params}, ...]}}.
+                  Lower priority numbers are kept longest.
+        model: Model name, selects the tokenizer encoding.
+    """
+
+    def __init__(self, sections: Dict[str, Dict[str, Any]], model: Optional[str] = None):
+        self.sections = sections or {}
+        self.model = model
+        for name, policy in self.sections.items():
+            for step in policy.get("steps", []):
+                if step.get("strategy") not in STRATEGIES:
+                    raise ValueError(f"Unknown trimming strategy for {name}: {step.get('strategy')}")
+
+    def count(self, value: Any) -> int:
+        return count_tokens(dumps(value), self.model)
+
+    def _section_tokens(self, name: str, value: Any) -> int:
+        # Tokens the section contributes inside the serialized payload
+        return self.count({name: value}) - 2
+
+    def fit(self, data: Dict[str, Any], budget: int, label: str = "") -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Return (payload within budget where possible, report of what changed)."""
+        tokens = {name: self._section_tokens(name, value) for name, value in data.items()}
+        total = sum(tokens.values()) + 2
+        report = {"budget": budget, "tokens_before": total, "tokens_after": total, "trimmed": [], "dropped": []}
+        if total <= budget:
+            return data, report
+
+        data = dict(data)  # strategies return new values; the caller's payload is left as is
+        # Least important first; larger sections first within a priority
+        order = sorted(
+            (name for name in data if name in self.sections),
+            key=lambda name: (-self.sections[name].get("priority", 1), -tokens[name]),
+        )
+
+        for name in order:
+            for step in self.sections[name].get("steps", []):
+                if total <= budget:
+                    break
+                params = {k: v for k, v in step.items() if k not in ("strategy", "field")}
+                fn = STRATEGIES[step["strategy"]]
+                path = step["field"].split(".") if step.get("field") else []
+                trimmed = _apply(data[name], path, lambda v: fn(v, **params))
+                after = self._section_tokens(name, trimmed)
+                if after >= tokens[name]:
+                    continue
+                report["trimmed"].append({
+                    "section": name, "strategy": step["strategy"], "field": step.get("field"),
+                    "tokens_before": tokens[name], "tokens_after": after,
+                })
+                total -= tokens[name] - after
+                data[name], tokens[name] = trimmed, after
+
+        for name in order:
+            if total <= budget:
+                break
+            if self.sections[name].get("required", False):
+                continue
+            total -= tokens.pop(name)
+            del data[name]
+            report["dropped"].append(name)
+
+        report["tokens_after"] = total
+        self._log(label, report)
+        return data, report
+
+    @staticmethod
+    def _log(label: str, report: Dict[str, Any]):
+        trimmed = ", ".join(
+            f"{t['section']}{'.' + t['field'] if t['field'] else ''} {t['strategy']} "
+            f"({t['tokens_before']}->{t['tokens_after']})"
+            for t in report["trimmed"]
+        )
+        message = (
+            f"Token budget {label}: {report['tokens_before']} -> {report['tokens_after']} tokens "
+            f"(budget {report['budget']}); trimmed: {trimmed or 'none'}; "
+            f"dropped: {', '.join(report['dropped']) or 'none'}"
+        )
+        if report["tokens_after"] > report["budget"]:
+            logger.warning(message + "; still over budget")
+        else:
+            logger.info(message)
@@ -0,0 +1,172 @@
+"""Benchmark suite for scoring and profile building on synthetic players.
+
+Covers compute_growth_potential, build_player_massive_json, search_players and
+clean_json_data. Results are written as JSON so runs on different machines or
+commits can be compared with --compare.
+
+Usage:
+    python tests/benchmark_player_pipeline.py --scales 1k 10k --output bench.json
+    python tests/benchmark_player_pipeline.py --scales 1k --compare bench.json
+"""
+
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+# Importing the routes package builds the LLM orchestrators, which need a key;
+# nothing benchmarked here calls the API.
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark-unused")
+
+sys.path.insert(0, os.path.dirname(__file__))
+from synthetic_player_data import (  # noqa: E402
+    SCALES,
+    generate_model_frames,
+    generate_players,
+    generate_players_search_df,
+)
+
+from src.models.compute_growth_potential import compute_growth_potential  # noqa: E402
+from src.json_generator.build_player_json import build_player_massive_json  # noqa: E402
+from src.api.routes import player_search  # noqa: E402
+
+
+def _timed(fn: Callable[[], Any], repeat: int) -> List[float]:
+    """Run fn repeat times, returning per-call durations in seconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def _summary(name: str, scale: str, n_items: int, durations: List[float]) -> Dict[str, Any]:
+    """Summarize durations of calls that each processed n_items items."""
+    per_item_ms = [d * 1000.0 / max(n_items, 1) for d in durations]
+    return {
+        "name": name,
+        "scale": scale,
+        "items_per_call": n_items,
+        "calls": len(durations),
+        "total_s": sum(durations),
+        "mean_ms_per_item": statistics.fmean(per_item_ms),
+        "p50_ms_per_item": float(np.percentile(per_item_ms, 50)),
+        "p95_ms_per_item": float(np.percentile(per_item_ms, 95)),
+        "items_per_s": n_items * len(durations) / max(sum(durations), 1e-12),
+    }
+
+
+def run_scale(scale: str, seed: int, sample: int, games_per_player: int) -> List[Dict[str, Any]]:
+    """Run every benchmark on one synthetic population."""
+    n = SCALES[scale]
+    results = []
+
+    start = time.perf_counter()
+    players = generate_players(n, seed=seed, games_per_player=games_per_player)
+    shap_df, scores_df, mlr_df, players_df = generate_model_frames(players, seed=seed)
+    search_df = generate_players_search_df(players)
+    print(f"[{scale}] generated {n} players in {time.perf_counter() - start:.1f}s "
+          f"({len(scores_df)} score rows, {len(shap_df)} transfers)")
+
+    rng = np.random.default_rng(seed)
+    sample_ids = [int(pid) for pid in rng.choice(players_df["player_id"], size=min(sample, n), replace=False)]
+
+    # ---- compute_growth_potential over the whole population
+    durations = _timed(lambda: [compute_growth_potential(p) for p in players], repeat=1)
+    results.append(_summary("compute_growth_potential", scale, n, durations))
+
+    # ---- build_player_massive_json, one call per sampled player
+    built = []
+
+    def build_one(pid=None):
+        built.append(build_player_massive_json(pid, shap_df, scores_df, mlr_df, players_df))
+
+    durations = []
+    for pid in sample_ids:
+        durations.extend(_timed(lambda pid=pid: build_one(pid), repeat=1))
+    results.append(_summary("build_player_massive_json", scale, 1, durations))
+
+    # ---- clean_json_data on the built profiles
+    durations = []
+    for profile in built:
+        durations.extend(_timed(lambda profile=profile: player_search.clean_json_data(profile), repeat=1))
+    results.append(_summary("clean_json_data", scale, 1, durations))
+
+    # ---- search_players against the cached search frame
+    player_search._players_search_df = search_df
+    player_search._available_player_ids = set(players_df["player_id"].tolist())
+    queries = ["jonas", "silva", "mü", "ro", str(sample_ids[0])]
+
+    async def search_all():
+        for q in queries:
+            await player_search.search_players(query=q, limit=10)
+
+    durations = _timed(lambda: asyncio.run(search_all()), repeat=5)
+    results.append(_summary("search_players", scale, len(queries), durations))
+
+    return results
+
+
+def compare(current: Dict[str, Any], baseline_path: str) -> None:
+    """Print per-benchmark speed ratios against a previous results file."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    base = {(r["name"], r["scale"]): r for r in baseline["results"]}
+
+    print(f"\n{'benchmark':<28}{'scale':<8}{'baseline ms':>14}{'current ms':>14}{'speedup':>10}")
+    print("-" * 74)
+    for r in current["results"]:
+        b = base.get((r["name"], r["scale"]))
+        if b is None:
+            continue
+        speedup = b["mean_ms_per_item"] / max(r["mean_ms_per_item"], 1e-12)
+        print(f"{r['name']:<28}{r['scale']:<8}{b['mean_ms_per_item']:>14.4f}"
+              f"{r['mean_ms_per_item']:>14.4f}{speedup:>9.2f}x")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark scoring and profile building.")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["1k"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sample", type=int, default=50,
+                        help="Players to profile per scale for per-player benchmarks")
+    parser.add_argument("--games-per-player", type=int, default=60)
+    parser.add_argument("--output", type=str, default=None, help="Write results JSON here")
+    parser.add_argument("--compare", type=str, default=None, help="Baseline results JSON")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+            "sample": args.sample,
+            "games_per_player": args.games_per_player,
+        },
+        "results": [],
+    }
+    for scale in args.scales:
+        report["results"].extend(run_scale(scale, args.seed, args.sample, args.games_per_player))
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Shared LLM test setup: an API key, an in-memory response cache and the local stub server.
+
+OpenAIClient reads process-wide state (the API key, the response cache, the
+client registry). These context managers set it for one block and restore
+the previous values on exit, also when the block fails:
+
+    with offline_llm():                      # clients can be built; no server
+        ...
+    with stub_llm(StubConfig(ttft_ms=0)) as base_url:
+        ...                                  # every client talks to the stub
+"""
+
+import contextlib
+from typing import Iterator, Optional
+
+from src.llm.clients import http_pool, openai_client, response_cache
+from src.llm.stub_server import StubConfig, run_in_thread
+
+
+@contextlib.contextmanager
+def offline_llm(cache_entries: int = 64) -> Iterator[None]:
+    """A test API key (unless one is set) and a fresh memory-only response cache."""
+    saved = openai_client.OPENAI_API_KEY, response_cache._cache
+    openai_client.OPENAI_API_KEY = saved[0] or "test"
+    response_cache._cache = response_cache.ResponseCache(memory_entries=cache_entries)
+    try:
+        yield
+    finally:
+        openai_client.OPENAI_API_KEY, response_cache._cache = saved
+
+
+@contextlib.contextmanager
+def stub_llm(config: Optional[StubConfig] = None, cache_entries: int = 0) -> Iterator[str]:
+    """offline_llm() plus a stub server that the shared client registry points at; yields its base URL."""
+    saved = http_pool._registry
+    with offline_llm(cache_entries):
+        with run_in_thread(config or StubConfig(ttft_ms=0, tokens_per_second=0)) as base_url:
+            http_pool._registry = http_pool.ClientRegistry(api_key="test", base_url=base_url, rate_limits={})
+            try:
+                yield base_url
+            finally:
+                http_pool._registry = saved
@@ -0,0 +1,331 @@
+"""Seeded generator for synthetic player data.
+
+Produces player records shaped like the players_intersection JSONL (same
+keys as REAL_PLAYER_DATA) plus the model tables that build_player_json loads
+from the *_321.pkl files, so the scoring and profile-building code can be
+exercised at 1k/10k/100k scale without the real datasets.
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.models.transfer_fee_inference import FEATURE_COLUMNS
+
+
+POSITIONS = {
+    "Attack": ["Centre-Forward", "Left Winger", "Right Winger", "Second Striker"],
+    "Midfield": ["Central Midfield", "Attacking Midfield", "Defensive Midfield",
+                 "Left Midfield", "Right Midfield"],
+    "Defender": ["Centre-Back", "Left-Back", "Right-Back"],
+    "Goalkeeper": ["Goalkeeper"],
+}
+POSITION_WEIGHTS = [0.27, 0.33, 0.30, 0.10]
+
+# Expected goals / assists per 90 by position
+SCORING_RATES = {
+    "Attack": (0.45, 0.20),
+    "Midfield": (0.15, 0.18),
+    "Defender": (0.05, 0.07),
+    "Goalkeeper": (0.0, 0.005),
+}
+
+FIRST_NAMES = ["Jonas", "Luca", "Mateo", "Noah", "Kai", "Leon", "Hugo", "Theo",
+               "Rafael", "Milan", "Adam", "Oscar", "Elias", "Jan", "Pedro", "Ivan"]
+LAST_NAMES = ["Hofmann", "Silva", "Moreau", "Rossi", "Novak", "Jensen", "Garcia",
+              "Müller", "Kowalski", "Dubois", "Costa", "Berg", "Ortega", "Smit"]
+COUNTRIES = ["Germany", "Spain", "France", "Italy", "England", "Portugal",
+             "Netherlands", "Brazil", "Argentina", "Croatia", "Denmark"]
+LEAGUES = ["L1", "ES1", "FR1", "IT1", "GB1", "PO1", "NL1"]
+FOOT = ["right", "left", "both"]
+
+# Feature names as they appear in player_shap_transfer_fee_321.pkl (without prefix):
+# the XGBoost model's input columns
+SHAP_FEATURES = FEATURE_COLUMNS
+
+# Coefficient names as they appear in mlr_local_explanations_per_transfer_321.pkl
+MLR_FEATURES = [
+    "height_in_cm_c", "age_at_transfer_c", "contract_years_left",
+    "from_foreigners_percentage", "to_foreigners_percentage", "to_squad_size",
+    "to_average_age", "minutes_365", "goals_per90", "assists_per90", "cards_per90",
+    "log_market_value_in_eur", "transfer_year_c", "intercept",
+]
+
+REFERENCE_DATE = date(2025, 6, 30)
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+
+def _iso(d: date) -> str:
+    return d.strftime("%Y-%m-%d")
+
+
+def _valuation_history(rng: np.random.Generator, debut: date, age: int) -> List[Dict[str, Any]]:
+    """Semi-annual geometric random walk that rises into the mid-20s and decays after."""
+    n_points = int(np.clip((REFERENCE_DATE - debut).days // 182, 2, 40))
+    value = float(rng.choice([50_000, 100_000, 250_000, 500_000, 1_000_000]))
+    history = []
+    for i in range(n_points):
+        age_then = age - (n_points - i) / 2
+        drift = 0.18 if age_then < 24 else (0.02 if age_then < 29 else -0.15)
+        value *= float(np.exp(drift + rng.normal(0, 0.25)))
+        value = float(np.clip(round(value, -4), 25_000, 200_000_000))
+        history.append({
+            "date": _iso(debut + timedelta(days=182 * i)) + " 00:00:00",
+            "market_value_in_eur": value,
+        })
+    return history
+
+
+def _games(
+    rng: np.random.Generator, n_games: int, position: str, debut: date
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return (days_since_debut, minutes, goals, assists, yellows, reds) arrays."""
+    span = max((REFERENCE_DATE - debut).days, n_games * 4)
+    days = np.sort(rng.choice(span, size=n_games, replace=n_games > span))
+    minutes = np.where(rng.random(n_games) < 0.7, 90, rng.integers(1, 90, n_games))
+    g_rate, a_rate = SCORING_RATES[position]
+    goals = rng.poisson(g_rate * minutes / 90)
+    assists = rng.poisson(a_rate * minutes / 90)
+    yellows = (rng.random(n_games) < 0.12).astype(int)
+    reds = (rng.random(n_games) < 0.005).astype(int)
+    return days, minutes, goals, assists, yellows, reds
+
+
+def _universal_score_100(minutes, goals, assists, yellows, reds) -> np.ndarray:
+    """Same formula as dual.ipynb, min-max scaled with fixed bounds for synthetic data."""
+    mp = np.clip(minutes, 1, None)
+    raw = (4.0 * goals * 90.0 / mp + 3.0 * assists * 90.0 / mp
+           - (yellows + 3 * reds) * 90.0 / mp)
+    raw = raw * np.clip(minutes / 30.0, None, 1.0)
+    return np.clip((raw + 270.0) / (1440.0 + 270.0) * 100.0, 0.0, 100.0)
+
+
+def generate_player(rng: np.random.Generator, player_id: int, games_per_player: int = 60) -> Dict[str, Any]:
+    """Generate one player record shaped like the players_intersection JSONL."""
+    position = str(rng.choice(list(POSITIONS), p=POSITION_WEIGHTS))
+    sub_position = str(rng.choice(POSITIONS[position]))
+    age = int(rng.integers(17, 37))
+    birth = REFERENCE_DATE - timedelta(days=int(age * 365.25 + rng.integers(0, 365)))
+    debut = birth + timedelta(days=int(365.25 * rng.uniform(16.5, 19.5)))
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    club_id = int(rng.integers(1, 5000))
+    league = str(rng.choice(LEAGUES))
+
+    valuations = _valuation_history(rng, debut, age)
+    for v in valuations:
+        v["current_club_id"] = club_id
+        v["player_club_domestic_competition_id"] = league
+    latest_value = valuations[-1]["market_value_in_eur"]
+    peak_value = max(v["market_value_in_eur"] for v in valuations)
+
+    n_games = max(1, int(rng.poisson(games_per_player)))
+    days, minutes, goals, assists, yellows, reds = _games(rng, n_games, position, debut)
+    scores = _universal_score_100(minutes, goals, assists, yellows, reds)
+    game_dates = [debut + timedelta(days=int(d)) for d in days]
+
+    # As-of join of each game to the latest valuation on or before it
+    val_days = np.array([(debut + timedelta(days=182 * i) - debut).days for i in range(len(valuations))])
+    val_idx = np.searchsorted(val_days, days, side="right") - 1
+
+    performance_time_series = [
+        {
+            "date": _iso(game_dates[i]),
+            "universal_score_100": float(scores[i]),
+            "market_value": valuations[val_idx[i]]["market_value_in_eur"],
+        }
+        for i in range(n_games) if val_idx[i] >= 0
+    ]
+
+    last = slice(max(0, n_games - 10), n_games)
+    recent_games = [
+        {
+            "date": _iso(game_dates[i]) + " 00:00:00",
+            "game_id": int(player_id * 1000 + i),
+            "player_club_id": club_id,
+            "minutes_played": int(minutes[i]),
+            "goals": int(goals[i]),
+            "assists": int(assists[i]),
+            "yellow_cards": int(yellows[i]),
+            "red_cards": int(reds[i]),
+            "club_name": f"Club {club_id}",
+        }
+        for i in range(last.start, last.stop)
+    ]
+
+    total_minutes = int(minutes.sum())
+    return {
+        "player_id": player_id,
+        "name": name,
+        "basic_info": {
+            "player_id": player_id,
+            "name": name,
+            "date_of_birth": _iso(birth),
+            "age_at_reference_date": age,
+            "country_of_birth": str(rng.choice(COUNTRIES)),
+            "nationality": str(rng.choice(COUNTRIES)),
+            "primary_position": position,
+            "secondary_position": sub_position,
+            "preferred_foot": str(rng.choice(FOOT, p=[0.7, 0.25, 0.05])),
+            "height_cm": int(rng.normal(182, 6)),
+            "current_club_id": club_id,
+            "current_club_name": f"Club {club_id}",
+            "current_club_league_id": league,
+            "market_value_eur_latest": latest_value,
+            "highest_market_value_eur": peak_value,
+            "contract_expiration_date": f"{REFERENCE_DATE.year + int(rng.integers(0, 5))}-06-30 00:00:00",
+            "last_season_in_db": REFERENCE_DATE.year - 1,
+        },
+        "career_totals": {
+            "matches_played": n_games,
+            "appearances_count": n_games,
+            "minutes_played": total_minutes,
+            "goals": int(goals.sum()),
+            "assists": int(assists.sum()),
+            "yellow_cards": int(yellows.sum()),
+            "red_cards": int(reds.sum()),
+            "goals_per_90": float(goals.sum() * 90 / max(total_minutes, 1)),
+            "assists_per_90": float(assists.sum() * 90 / max(total_minutes, 1)),
+        },
+        "season_totals": [],
+        "last_season_stats": None,
+        "previous_season_stats": None,
+        "recent_form_last_10_games": {
+            "summary": {
+                "matches_played": len(recent_games),
+                "minutes_played": int(minutes[last].sum()),
+                "goals": int(goals[last].sum()),
+                "assists": int(assists[last].sum()),
+                "avg_rating": None,
+            },
+            "games": recent_games,
+        },
+        "valuation_history": valuations,
+        "transfer_history": [],
+        "performance_time_series": performance_time_series,
+    }
+
+
+def generate_players(n: int, seed: int = 42, games_per_player: int = 60) -> List[Dict[str, Any]]:
+    """Generate n player records with ids 1..n. Same seed, same players."""
+    rng = np.random.default_rng(seed)
+    return [generate_player(rng, pid, games_per_player) for pid in range(1, n + 1)]
+
+
+def generate_model_frames(
+    players: List[Dict[str, Any]],
+    seed: int = 42,
+    transfers_per_player: float = 4.5,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Build (shap_df, scores_df, mlr_df, players_df) shaped like load_all_data() output."""
+    rng = np.random.default_rng(seed + 1)
+    player_ids = np.array([p["player_id"] for p in players], dtype=int)
+
+    # ---- Transfers: several per player, as in the *_321.pkl files
+    n_transfers = np.maximum(1, rng.poisson(transfers_per_player, len(players)))
+    t_pid = np.repeat(player_ids, n_transfers)
+    n_rows = len(t_pid)
+    t_year = rng.integers(2012, 2025, n_rows)
+    t_date = pd.to_datetime(t_year.astype(str) + "-07-01")
+    fee = np.round(np.exp(rng.normal(14.5, 1.3, n_rows)), -4)
+    pred_log = np.log(fee) + rng.normal(0, 0.6, n_rows)
+    meta = {
+        "player_id": t_pid,
+        "transfer_year": t_year,
+        "transfer_season": [f"{y % 100 - 1:02d}/{y % 100:02d}" for y in t_year],
+        "from_club_name": [f"Club {c}" for c in rng.integers(1, 5000, n_rows)],
+        "to_club_name": [f"Club {c}" for c in rng.integers(1, 5000, n_rows)],
+        "transfer_date": t_date.strftime("%Y-%m-%d"),
+    }
+
+    # ---- SHAP: dense values, then keep top 5 / bottom 5 per row as the notebook does
+    shap_values = rng.normal(0, 0.05, (n_rows, len(SHAP_FEATURES)))
+    shap_values[:, 0] += 0.4  # market value dominates, as in the real data
+    order = np.argsort(shap_values, axis=1)
+    keep = np.zeros_like(shap_values, dtype=bool)
+    rows = np.arange(n_rows)[:, None]
+    keep[rows, order[:, :5]] = True
+    keep[rows, order[:, -5:]] = True
+    shap_values = np.where(keep, shap_values, 0.0)
+
+    shap_df = pd.DataFrame(meta)
+    shap_df["transfer_fee"] = fee
+    shap_df["log_transfer_fee"] = np.log1p(fee)
+    shap_df["pred_log_transfer_fee"] = pred_log
+    shap_df["pred_transfer_fee"] = np.exp(pred_log)
+    shap_df = pd.concat(
+        [shap_df, pd.DataFrame(shap_values, columns=[f"shap_{f}" for f in SHAP_FEATURES])],
+        axis=1,
+    )
+
+    # ---- MLR: per-transfer contributions, shared intercept
+    contribs = rng.normal(0, 0.3, (n_rows, len(MLR_FEATURES)))
+    contribs[:, MLR_FEATURES.index("log_market_value_in_eur")] = rng.normal(15.0, 1.0, n_rows)
+    contribs[:, MLR_FEATURES.index("intercept")] = -0.73
+    mlr_df = pd.DataFrame(meta).drop(columns=["transfer_year"])
+    mlr_df.insert(1, "player_name", np.repeat([p["name"] for p in players], n_transfers))
+    mlr_df = pd.concat(
+        [mlr_df, pd.DataFrame(contribs, columns=[f"coef_{f}" for f in MLR_FEATURES])],
+        axis=1,
+    )
+    mlr_pred = contribs.sum(axis=1)
+    mlr_df["pred_log_transfer_fee"] = mlr_pred
+    mlr_df["pred_transfer_fee"] = np.exp(mlr_pred)
+    mlr_df["actual_transfer_fee"] = fee
+    mlr_df["residual_log"] = np.log(fee + 1e-9) - mlr_pred
+
+    # ---- Game scores: flatten each player's performance_time_series
+    series_lengths = [len(p["performance_time_series"]) for p in players]
+    scores_df = pd.DataFrame({
+        "player_id": np.repeat(player_ids, series_lengths),
+        "player_name": np.repeat([p["name"] for p in players], series_lengths),
+        "time": pd.to_datetime([r["date"] for p in players for r in p["performance_time_series"]]),
+        "universal_score_100": [r["universal_score_100"] for p in players for r in p["performance_time_series"]],
+        "market_value": [r["market_value"] for p in players for r in p["performance_time_series"]],
+    })
+
+    # ---- JSONL records without the sections build_player_massive_json adds
+    players_df = pd.DataFrame([
+        {k: v for k, v in p.items() if k != "performance_time_series"} for p in players
+    ])
+
+    return shap_df, scores_df, mlr_df, players_df
+
+
+def generate_players_search_df(players: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Build a players.csv-like frame for the search endpoint."""
+    return pd.DataFrame([
+        {
+            "player_id": p["player_id"],
+            "first_name": p["name"].split(" ", 1)[0],
+            "last_name": p["name"].split(" ", 1)[-1],
+            "name": p["name"],
+            "position": p["basic_info"]["primary_position"],
+            "sub_position": p["basic_info"]["secondary_position"],
+            "current_club_name": p["basic_info"]["current_club_name"],
+            "country_of_citizenship": p["basic_info"]["nationality"],
+            "date_of_birth": p["basic_info"]["date_of_birth"],
+            "foot": p["basic_info"]["preferred_foot"],
+            "height_in_cm": p["basic_info"]["height_cm"],
+            "market_value_in_eur": p["basic_info"]["market_value_eur_latest"],
+            "highest_market_value_in_eur": p["basic_info"]["highest_market_value_eur"],
+        }
+        for p in players
+    ])
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Write synthetic players as JSONL.")
+    parser.add_argument("--scale", choices=list(SCALES), default="1k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=str, default="synthetic_players.jsonl")
+    args = parser.parse_args()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        for player in generate_players(SCALES[args.scale], seed=args.seed):
+            f.write(json.dumps(player, ensure_ascii=False) + "\n")
+    print(f"Wrote {SCALES[args.scale]} players to {args.output}")
@@ -0,0 +1,75 @@
+"""Test bulk report generation through batch jobs with the local batch processor."""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from llm_stub import stub_llm  # noqa: E402
+from synthetic_player_data import generate_players  # noqa: E402
+from src.llm.clients.batch import LocalBatchProcessor  # noqa: E402
+from src.llm.orchestrators.batch_report_runner import BatchReportRunner  # noqa: E402
+from src.llm.stub_server import StubConfig  # noqa: E402
+
+
+class _CountingProcessor(LocalBatchProcessor):
+    def __init__(self):
+        super().__init__()
+        self.endpoints = []
+
+    async def submit(self, path, endpoint):
+        self.endpoints.append(endpoint)
+        return await super().submit(path, endpoint)
+
+
+def test_batch_reports_are_staged_and_resumable():
+    """Stages go out as batches, reports are written per player, and re-runs reuse results."""
+    players = generate_players(3, games_per_player=20)
+
+    with tempfile.TemporaryDirectory() as job_dir, stub_llm():
+        def run(players):
+            processor = _CountingProcessor()
+            runner = BatchReportRunner(job_dir, backend=processor, poll_interval=0.01, settle=0.05)
+            return runner, processor, asyncio.run(runner.run(players))
+
+        # analysis + news, then news analysis, then the report: one batch per endpoint and stage
+        runner, processor, counts = run(players)
+        assert counts == {"done": 3}
+        assert processor.endpoints == ["/v1/chat/completions", "/v1/responses", "/v1/chat/completions",
+                                       "/v1/chat/completions"]
+        assert runner.collector.stats["submitted_requests"] == 12
+        state = runner.players[str(players[0]["player_id"])]
+        assert state["stage"] == "generator_agent"
+        with open(os.path.join(job_dir, state["report"]), encoding="utf-8") as f:
+            assert "report" in json.load(f)
+
+        # Finished players are skipped
+        _, processor, counts = run(players)
+        assert counts == {"done": 3} and processor.endpoints == []
+
+        # Lost player state: every stage is served from the stored batch results
+        os.remove(os.path.join(job_dir, "players.json"))
+        runner, processor, counts = run(players)
+        assert counts == {"done": 3} and processor.endpoints == []
+        assert runner.collector.stats["stored_results"] == 12
+    print("✓ Batch jobs run per stage, write per-player reports and resume from stored results")
+
+
+def test_failed_requests_mark_players_failed():
+    """Errors inside a batch surface per player; the job keeps going."""
+    stub = StubConfig(ttft_ms=0, tokens_per_second=0, error_rate=1.0, error_status=500)
+
+    with tempfile.TemporaryDirectory() as job_dir, stub_llm(stub):
+        runner = BatchReportRunner(job_dir, backend=LocalBatchProcessor(), poll_interval=0.01, settle=0.05)
+        counts = asyncio.run(runner.run(generate_players(2, games_per_player=5)))
+        assert counts == {"failed": 2}
+        assert "Analysis agent failed" in runner.players["1"]["error"]
+    print("✓ Failed batch requests mark their players failed")
+
+
+if __name__ == "__main__":
+    test_batch_reports_are_staged_and_resumable()
+    test_failed_requests_mark_players_failed()
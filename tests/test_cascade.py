@@ -0,0 +1,123 @@
+"""Test schema-validated model cascades."""
+
+import asyncio
+import json
+import os
+import sys
+
+from openai.types.chat import ChatCompletion
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from llm_stub import offline_llm  # noqa: E402
+from src.global_configs import ANALYSIS_AGENT_CONFIGS, ANALYSIS_SCHEMA, GENERATOR_AGENT_CONFIGS  # noqa: E402
+from src.llm.clients.cascade import ModelCascade, cascade_stats  # noqa: E402
+from src.llm.clients.openai_client import accepts_temperature  # noqa: E402
+from src.utils.schema_validation import quality_issues, validate  # noqa: E402
+
+
+def _analysis(summary="A consistent wide midfielder whose output has held steady.", strengths=("Pace",)):
+    text = "Detailed narrative. " * 3
+    return {
+        "player_info": {"id": "1", "name": "A", "position": "Midfield", "age": 27, "club": "X"},
+        "executive_summary": summary, "player_development": text, "breakout_analysis": text,
+        "valuation_insights": text, "transfer_fee_analysis": text,
+        "key_statistics": {"current_market_value": "€5m", "peak_market_value": "€9m", "career_goals": 40,
+                           "career_assists": 31, "recent_form": "Good"},
+        "strengths": list(strengths), "weaknesses": ["Aerial duels"], "recommendation": text,
+    }
+
+
+class _Tier:
+    """Stands in for a tier's OpenAIClient: returns a scripted output or raises."""
+
+    def __init__(self, output):
+        self.output = output
+        self.calls = 0
+
+    async def chat_completion(self, **params):
+        self.calls += 1
+        assert params["stream"] is False
+        if isinstance(self.output, Exception):
+            raise self.output
+        content = json.dumps(self.output)
+        return ChatCompletion.construct(choices=[{"index": 0, "finish_reason": "stop",
+                                                  "message": {"role": "assistant", "content": content}}])
+
+
+def test_validation_and_quality_checks():
+    """Schema violations and empty sections are reported with their paths."""
+    assert validate(_analysis(), ANALYSIS_SCHEMA) == []
+    broken = {**_analysis(), "extra": 1}
+    broken["player_info"] = {**broken["player_info"], "age": "27"}
+    del broken["recommendation"]
+    problems = validate(broken, ANALYSIS_SCHEMA)
+    assert "$.recommendation: missing" in problems and "$.extra: not allowed" in problems
+    assert any(p.startswith("$.player_info.age: expected integer") for p in problems)
+
+    fields = ["executive_summary", "key_statistics.recent_form"]
+    assert quality_issues(_analysis(), fields, min_text_chars=4, nonempty_fields=["strengths"]) == []
+    issues = quality_issues(_analysis(summary="  ", strengths=()), fields, 4, ["strengths"])
+    assert issues == ["$.executive_summary: 0 characters, at least 4 expected", "$.strengths: empty"]
+    print("✓ Schema and quality checks report violations by path")
+
+
+def test_cascade_escalates_and_records_tiers():
+    """Passing cheap outputs are accepted; invalid, short or failed ones escalate."""
+    config = {"model": "big", "cascade": {"tiers": [{"model": "small", "reasoning_effort": "low"}],
+                                          "text_fields": ["executive_summary"], "min_text_chars": 20,
+                                          "nonempty_fields": ["strengths"]}}
+
+    def run(agent, small, big):
+        with offline_llm(cache_entries=0):
+            cascade = ModelCascade(config, agent=agent, schema=ANALYSIS_SCHEMA)
+        assert [c["model"] for c in cascade.tier_configs] == ["small", "big"]
+        cascade.clients = [_Tier(small), _Tier(big)]
+        parsed, _ = asyncio.run(cascade.run([{"role": "user", "content": "x"}], {"type": "json_schema"}))
+        return parsed, [c.calls for c in cascade.clients]
+
+    good, short = _analysis(), _analysis(summary="Fine.")
+    assert run("cascade_test", good, None) == (good, [1, 0])
+    assert run("cascade_test", short, good) == (good, [1, 1])
+    assert run("cascade_test", {"player_info": {}}, good) == (good, [1, 1])
+    assert run("cascade_test", RuntimeError("down"), good) == (good, [1, 1])
+    # The last tier's output is returned even if it fails the checks
+    assert run("cascade_test", short, short) == (short, [1, 1])
+
+    stats = cascade_stats()["cascade_test"]
+    assert stats["small/low"] == {"model": "small", "attempts": 5, "accepted": 1, "invalid": 1,
+                                  "low_quality": 2, "error": 1, "success_rate": 0.2}
+    assert stats["big"]["attempts"] == 4 and stats["big"]["success_rate"] == 0.75
+    print("✓ Cascade accepts valid cheap outputs, escalates the rest and records per-tier rates")
+
+
+def test_tiers_send_only_accepted_params():
+    """Each configured tier sends its own model, and temperature only where the model takes it."""
+    assert not accepts_temperature("gpt-5-nano") and not accepts_temperature("gpt-5-mini")
+    assert not accepts_temperature("gpt-5") and not accepts_temperature("gpt-4o-mini")
+    assert accepts_temperature("gpt-5.1") and accepts_temperature("gpt-4.1")
+
+    for agent, config in (("analysis_agent", ANALYSIS_AGENT_CONFIGS), ("generator_agent", GENERATOR_AGENT_CONFIGS)):
+        with offline_llm(cache_entries=0):
+            cascade = ModelCascade(config, agent=agent, schema=ANALYSIS_SCHEMA)
+        sent = []
+
+        async def capture(resource, params, endpoint=None):
+            sent.append(params)
+            return ChatCompletion.construct(choices=[])
+
+        for client in cascade.clients:
+            client._call = capture
+            asyncio.run(client.chat_completion(messages=[{"role": "user", "content": "x"}], stream=False))
+
+        assert [p["model"] for p in sent] == [c["model"] for c in cascade.tier_configs]
+        for params in sent:
+            assert ("temperature" in params) == accepts_temperature(params["model"]), (agent, params)
+        assert sent[0]["reasoning_effort"] == "low"
+    print("✓ Cascade tiers send only the parameters their models accept")
+
+
+if __name__ == "__main__":
+    test_validation_and_quality_checks()
+    test_cascade_escalates_and_records_tiers()
+    test_tiers_send_only_accepted_params()
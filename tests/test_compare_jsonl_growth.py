@@ -0,0 +1,63 @@
+"""Test the streaming JSONL growth comparison."""
+
+import json
+import os
+import tempfile
+
+from src.models.compare_jsonl_growth import compare_files_streaming, chunk_ranges
+
+
+def _player(pid, value=1000000.0, growth=None):
+    player = {
+        "player_id": pid,
+        "name": f"Player {pid}",
+        "basic_info": {"player_id": pid, "market_value_eur_latest": value},
+        "valuation_history": [{"date": "2024-01-01", "market_value_in_eur": value}],
+    }
+    if growth is not None:
+        player["basic_info"]["growth_potential_score"] = growth
+    return player
+
+
+def _write_jsonl(path, players):
+    with open(path, "w") as f:
+        for p in players:
+            f.write(json.dumps(p) + "\n")
+
+
+def test_streaming_compare():
+    """Only growth differs for most players; one player differs in a real field."""
+    with tempfile.TemporaryDirectory() as tmp:
+        file1 = os.path.join(tmp, "players.jsonl")
+        file2 = os.path.join(tmp, "players_with_growth.jsonl")
+
+        original = [_player(pid) for pid in range(1, 201)]
+        with_growth = [_player(pid, growth=50.0 + pid % 7) for pid in range(1, 201)]
+        with_growth[41] = _player(42, value=2000000.0, growth=61.0)  # real change
+        with_growth.append(_player(999, growth=10.0))               # extra player
+
+        _write_jsonl(file1, original)
+        _write_jsonl(file2, with_growth)
+
+        # Chunks must tile the file exactly
+        ranges = chunk_ranges(file1, 8)
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == os.path.getsize(file1)
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+        for workers in (1, 3):
+            result = compare_files_streaming(file1, file2, workers=workers, verbose=False)
+            assert result["mismatches"] == [42]
+            assert result["missing_in_1"] == {999}
+            assert result["missing_in_2"] == set()
+            changed_fields = {field for field, _, _ in result["diffs"][42]}
+            assert changed_fields == {
+                "basic_info.market_value_eur_latest",
+                "valuation_history[0].market_value_in_eur",
+            }
+
+    print("✓ Streaming comparison found exactly the expected differences")
+
+
+if __name__ == "__main__":
+    test_streaming_compare()
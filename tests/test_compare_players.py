@@ -0,0 +1,33 @@
+"""Test side-by-side player comparison tables."""
+
+import numpy as np
+import pandas as pd
+
+from src.json_generator.compare_players import align_series, combine, metric_table, player_series
+
+
+def test_metric_table_and_aligned_series():
+    """Tables keep request order; series share one grid with gaps outside each player's range."""
+    table = metric_table([{"goals": 0.5, "assists": 0.2}, None, {"goals": np.nan, "xg": 0.4}])
+    assert table == {"goals": [0.5, None, None], "assists": [0.2, None, None], "xg": [None, None, 0.4]}
+
+    scores = pd.DataFrame({
+        "player_id": [1, 1, 1, 2, 2],
+        "time": ["2024-01-10", "2024-03-05", "2024-02-20", "2024-02-01", "2024-04-15"],
+        "universal_score_100": [10.0, 30.0, 20.0, 50.0, 60.0],
+        "market_value": [1e6, 3e6, 2e6, 5e6, 6e6],
+    })
+    parts = [{"player_id": pid, "series": player_series(pid, scores)} for pid in (2, 1, 3)]
+    series = combine(parts, ["series"])["series"]
+
+    assert series["dates"] == ["2024-02-01", "2024-03-01", "2024-04-01", "2024-04-15"]
+    assert series["universal_score_100"][0] == [50.0, 50.0, 50.0, 60.0]   # last value on or before each date
+    assert series["universal_score_100"][1] == [10.0, 20.0, None, None]   # ends 2024-03-05
+    assert series["universal_score_100"][2] == [None] * 4                  # no scores
+    assert series["market_value"][1] == [1e6, 2e6, None, None]
+    assert align_series([None, None]) == {"dates": [], "universal_score_100": [], "market_value": []}
+    print("✓ Comparison tables and aligned series are correct")
+
+
+if __name__ == "__main__":
+    test_metric_table_and_aligned_series()
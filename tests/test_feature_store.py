@@ -0,0 +1,77 @@
+"""Test the memory-mapped per-player feature store."""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from src.json_generator.build_player_json import build_form_section
+from src.models.feature_store import FeatureStore, build_feature_store, get_feature_store
+from src.models.transfer_fee_inference import FEATURE_COLUMNS, TransferFeePredictor
+from test_transfer_fee_inference import _tables
+
+
+def test_store_rows_match_live_features():
+    """Stored rows equal the live feature rows; the predictor reads them back."""
+    players, clubs, apps = _tables()
+    live = TransferFeePredictor(players, clubs, apps)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        build_feature_store(live, tmp, reference_date="2024-06-30", chunk_size=1)
+        store = FeatureStore.open(tmp)
+        assert len(store) == 2 and store.feature_names == FEATURE_COLUMNS
+        assert 10 in store and 99 not in store and -5 not in store
+
+        expected = live.feature_matrix([20, 10], reference_date="2024-06-30")
+        values, found = store.rows([20, 10, 99])
+        assert found.tolist() == [True, True, False]
+        assert (values[:2] == expected).all() and (values[2] == 0).all()
+        assert (store.row(10) == expected[1]).all()
+        ids, block = store.slice(0, 2)
+        assert list(ids) == [10, 20] and block.shape == (2, len(FEATURE_COLUMNS))
+
+        cached = TransferFeePredictor(players, clubs, apps, store=store)
+        assert cached.default_reference_date == live.default_reference_date == pd.Timestamp.today().normalize()
+        # Stored, unknown and re-routed players in one batch
+        batch = [10, 99, 20]
+        to_clubs = [None, None, 1]
+        assert (cached.feature_matrix(batch, to_clubs, reference_date="2024-06-30") ==
+                live.feature_matrix(batch, to_clubs, reference_date="2024-06-30")).all()
+
+        form = build_form_section(10, store)
+        assert form["as_of"] == "2024-06-30" and form["minutes_365"] == 135
+        assert build_form_section(99, store) is None
+        assert [pid for pid, _ in store.nearest(10, k=3)] == [20]
+
+    print("✓ Feature store rows match live features and serve the predictor")
+
+
+def test_get_feature_store_follows_current():
+    """The cached store is per root and is re-opened when CURRENT names a new version."""
+    players, clubs, apps = _tables()
+    live = TransferFeePredictor(players, clubs, apps)
+
+    with tempfile.TemporaryDirectory() as a, tempfile.TemporaryDirectory() as b:
+        a, b = Path(a), Path(b)
+        assert get_feature_store(a) is None
+        first = build_feature_store(live, a, reference_date="2024-06-30")
+        build_feature_store(live, b, reference_date="2024-01-01")
+
+        store = get_feature_store(a)
+        assert get_feature_store(a) is store and store.path == first
+        assert get_feature_store(b).reference_date == pd.Timestamp("2024-01-01")
+
+        # A rebuild switches CURRENT to a new version directory
+        shutil.copytree(first, a / "next")
+        (a / "CURRENT").write_text("next", encoding="utf-8")
+        os.utime(a / "CURRENT", ns=(1, 1))
+        assert get_feature_store(a).path == a / "next"
+
+    print("✓ get_feature_store caches per root and picks up rebuilt versions")
+
+
+if __name__ == "__main__":
+    test_store_rows_match_live_features()
+    test_get_feature_store_follows_current()
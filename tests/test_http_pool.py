@@ -0,0 +1,56 @@
+"""Test the shared LLM HTTP client registry."""
+
+import asyncio
+
+from src.llm.clients.http_pool import ClientRegistry, SlotStream
+
+
+class _Stream:
+    def __init__(self, n):
+        self.n = n
+
+    async def __aiter__(self):
+        for i in range(self.n):
+            yield i
+
+    async def close(self):
+        pass
+
+
+def test_shared_client_and_model_limits():
+    """One client per loop; in-flight requests never exceed the model limit."""
+    registry = ClientRegistry({"model_concurrency": {"default": 4, "slow-model": 2}}, api_key="test", rate_limits={})
+    peak = {"slow-model": 0, "other": 0}
+
+    async def request(model):
+        release = await registry.acquire(model)
+        try:
+            peak[model] = max(peak[model], registry.stats()["models"][model]["in_flight"])
+            await asyncio.sleep(0.01)
+        finally:
+            release()
+            release()                                   # idempotent
+
+    async def main():
+        assert registry.openai() is registry.openai()
+        await asyncio.gather(*[request("slow-model") for _ in range(7)], *[request("other") for _ in range(9)])
+        stats = registry.stats()
+        assert stats["pool"]["event_loops"] == 1 and stats["pool"]["max_connections"] == 100
+        slow = stats["models"]["slow-model"]
+        assert slow["limit"] == 2 and slow["in_flight"] == 0
+        assert slow["queue_depth"]["interactive"] == 0 and slow["granted"]["interactive"] == 7
+
+        # A stream holds its slot until it is consumed
+        stream = SlotStream(_Stream(3), await registry.acquire("slow-model"))
+        assert registry.stats()["models"]["slow-model"]["in_flight"] == 1
+        assert [chunk async for chunk in stream] == [0, 1, 2]
+        assert registry.stats()["models"]["slow-model"]["in_flight"] == 0
+        await registry.aclose()
+
+    asyncio.run(main())
+    assert peak == {"slow-model": 2, "other": 4}
+    print("✓ Shared client is reused and per-model limits hold")
+
+
+if __name__ == "__main__":
+    test_shared_client_and_model_limits()
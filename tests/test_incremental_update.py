@@ -0,0 +1,213 @@
+"""Test daily incremental ingestion against a full rebuild."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.models.incremental_update import (
+    AGGREGATES_NAME, APPEARANCES_STORE, GROWTH_NAME, VALUATIONS_STORE, WATERMARK_NAME, _load_json, bootstrap,
+    ingest,
+)
+from src.models.percentiles import METRICS_NAME, TABLES_NAME
+from src.models.squad_aggregates import CLUBS_NAME, LEAGUES_NAME
+from src.models.universal_score import OUTPUT_NAME
+
+CUTOFF = pd.Timestamp("2024-03-31")
+POSITIONS = ["Attack", "Midfield", "Defender", "Goalkeeper"]
+
+FRAMES = [
+    APPEARANCES_STORE, VALUATIONS_STORE, f"{OUTPUT_NAME}.parquet", AGGREGATES_NAME, GROWTH_NAME,
+    METRICS_NAME, CLUBS_NAME, LEAGUES_NAME,
+]
+
+
+def _tables(n_players=8, n_games=40, seed=0):
+    """Synthetic players, games, appearances and valuations CSV frames spanning the cutoff."""
+    rng = np.random.default_rng(seed)
+    players = pd.DataFrame({
+        "player_id": np.arange(1, n_players + 1),
+        "name": [f"Player {i}" for i in range(1, n_players + 1)],
+        "position": [POSITIONS[i % 4] for i in range(n_players)],
+        "date_of_birth": [f"{1990 + i}-05-01" for i in range(n_players)],
+        "market_value_in_eur": rng.integers(1, 50, n_players) * 1e6,
+        "current_club_id": [10 + i % 2 for i in range(n_players)],
+        "current_club_name": [f"Club {10 + i % 2}" for i in range(n_players)],
+        "current_club_domestic_competition_id": "GB1",
+        "last_season": 2024,
+    })
+    dates = pd.date_range("2023-08-01", "2024-06-30", periods=n_games).normalize()
+    games = pd.DataFrame({
+        "game_id": np.arange(100, 100 + n_games),
+        "date": dates.strftime("%Y-%m-%d"),
+        "home_club_id": 10.0,
+        "away_club_id": 11.0,
+        "home_club_goals": rng.integers(0, 4, n_games).astype(float),
+        "away_club_goals": rng.integers(0, 4, n_games).astype(float),
+    })
+
+    apps = games[["game_id", "date"]].merge(players[["player_id", "current_club_id"]], how="cross")
+    apps = apps.sample(frac=0.7, random_state=seed).sort_values(["date", "game_id", "player_id"])
+    apps = apps.rename(columns={"current_club_id": "player_club_id"}).reset_index(drop=True)
+    apps["goals"] = rng.poisson(0.3, len(apps))
+    apps["assists"] = rng.poisson(0.2, len(apps))
+    apps["yellow_cards"] = rng.binomial(1, 0.1, len(apps))
+    apps["red_cards"] = rng.binomial(1, 0.01, len(apps))
+    apps["minutes_played"] = rng.integers(5, 91, len(apps))
+
+    val_dates = pd.date_range("2023-09-15", "2024-06-15", freq="MS")
+    vals = pd.DataFrame(
+        [(pid, d.strftime("%Y-%m-%d"), float(rng.integers(1, 60)) * 1e6) for pid in players["player_id"]
+         for d in val_dates[pid % 2:]],
+        columns=["player_id", "date", "market_value_in_eur"],
+    )
+    return players, games, apps, vals
+
+
+def _write_data(data_dir, players, games, apps, vals):
+    data_dir.mkdir(parents=True, exist_ok=True)
+    players.to_csv(data_dir / "players.csv", index=False)
+    games.to_csv(data_dir / "games.csv", index=False)
+    apps.to_csv(data_dir / "appearances.csv", index=False)
+    vals.to_csv(data_dir / "player_valuations.csv", index=False)
+
+
+def _split(frame):
+    """(rows up to CUTOFF, rows after it)."""
+    before = pd.to_datetime(frame["date"]) <= CUTOFF
+    return frame[before], frame[~before]
+
+
+def _snapshot(artifacts_dir):
+    """Every artifact as comparable values."""
+    out = {}
+    for name in FRAMES:
+        frame = pd.read_parquet(artifacts_dir / name)
+        out[name] = frame.sort_values(list(frame.columns[:2]), kind="stable").reset_index(drop=True)
+    with np.load(artifacts_dir / TABLES_NAME) as tables:
+        out[TABLES_NAME] = {key: tables[key] for key in tables.files}
+    meta = _load_json(artifacts_dir / f"{OUTPUT_NAME}.meta.json")
+    out["bounds"] = meta["bounds"]
+    return out
+
+
+def _assert_same(actual, expected):
+    assert actual.keys() == expected.keys()
+    for name in FRAMES:
+        pd.testing.assert_frame_equal(actual[name], expected[name], check_dtype=False, check_categorical=False,
+                                      obj=name)
+    for key, values in expected[TABLES_NAME].items():
+        np.testing.assert_array_equal(actual[TABLES_NAME][key], values, err_msg=key)
+    assert actual["bounds"] == expected["bounds"]
+
+
+def _bootstrap_then_ingest(tmp, players, games, apps, vals):
+    """Bootstrap on the rows up to CUTOFF, then ingest the rest as one drop; returns (artifacts, drop paths)."""
+    old_apps, new_apps = _split(apps)
+    old_vals, new_vals = _split(vals)
+    _write_data(tmp / "data", players, games, old_apps, old_vals)
+    artifacts = tmp / "artifacts"
+    bootstrap(tmp / "data", artifacts)
+
+    drop = tmp / "drop"
+    drop.mkdir()
+    new_apps.to_csv(drop / "appearances.csv", index=False)
+    new_vals.to_csv(drop / "player_valuations.csv", index=False)
+    return artifacts, drop / "appearances.csv", drop / "player_valuations.csv"
+
+
+def test_ingest_matches_full_bootstrap():
+    """Bootstrap plus an ingested drop gives the same artifacts as one bootstrap over everything."""
+    players, games, apps, vals = _tables()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        artifacts, new_apps, new_vals = _bootstrap_then_ingest(tmp, players, games, apps, vals)
+        run = ingest(new_apps, new_vals, tmp / "data", artifacts)
+        assert run["new_appearances"] == int((pd.to_datetime(apps["date"]) > CUTOFF).sum())
+        assert run["players_affected"] == len(players)
+
+        _write_data(tmp / "full", players, games, apps, vals)
+        bootstrap(tmp / "full", tmp / "full_artifacts")
+        _assert_same(_snapshot(artifacts), _snapshot(tmp / "full_artifacts"))
+
+        assert _load_json(artifacts / WATERMARK_NAME)["appearances"]["max_date"] == apps["date"].max()
+    print("✓ Incremental ingest matches a full bootstrap on every artifact")
+
+
+def test_widened_bounds_update_unaffected_players():
+    """A record score rescales its whole profile: other players' growth matches a full bootstrap too."""
+    players, games, apps, vals = _tables(seed=3)
+    old_apps, _ = _split(apps)
+    old_vals, _ = _split(vals)
+    game = games[pd.to_datetime(games["date"]) > CUTOFF].iloc[0]
+    record = pd.DataFrame([{"game_id": game["game_id"], "date": game["date"], "player_id": 1,
+                            "player_club_id": 10.0, "goals": 6, "assists": 0, "yellow_cards": 0,
+                            "red_cards": 0, "minutes_played": 90}])
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _write_data(tmp / "data", players, games, old_apps, old_vals)
+        artifacts = tmp / "artifacts"
+        bootstrap(tmp / "data", artifacts)
+        record.to_csv(tmp / "record.csv", index=False)
+
+        run = ingest(tmp / "record.csv", None, tmp / "data", artifacts)
+        assert run["players_affected"] == 1 and run["rescaled_profiles"] == ["attack"]
+        assert run["growth_recomputed"] == 2                     # players 1 and 5 play attack
+
+        _write_data(tmp / "full", players, games, pd.concat([old_apps, record], ignore_index=True), old_vals)
+        bootstrap(tmp / "full", tmp / "full_artifacts")
+        _assert_same(_snapshot(artifacts), _snapshot(tmp / "full_artifacts"))
+    print("✓ Widened bounds refresh growth for every player in the profile")
+
+
+def test_reingest_is_a_no_op():
+    """Ingesting the same drop twice leaves the watermark and the artifacts unchanged."""
+    players, games, apps, vals = _tables(seed=1)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        artifacts, new_apps, new_vals = _bootstrap_then_ingest(tmp, players, games, apps, vals)
+        ingest(new_apps, new_vals, tmp / "data", artifacts)
+        before, watermark = _snapshot(artifacts), _load_json(artifacts / WATERMARK_NAME)
+
+        run = ingest(new_apps, new_vals, tmp / "data", artifacts)
+        assert run["new_appearances"] == run["new_valuations"] == run["players_affected"] == 0
+        _assert_same(_snapshot(artifacts), before)
+        again = _load_json(artifacts / WATERMARK_NAME)
+        for table in ("appearances", "valuations"):
+            assert again[table] == watermark[table]
+    print("✓ Re-ingesting a drop changes nothing")
+
+
+def test_late_rows_are_ingested():
+    """Unseen rows dated before the watermark are ingested; rows already stored are counted and skipped."""
+    players, games, apps, vals = _tables(seed=2)
+    old_apps, _ = _split(apps)
+    old_vals, _ = _split(vals)
+    late_apps = old_apps.sample(5, random_state=2)
+    late_vals = old_vals.sample(2, random_state=2)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _write_data(tmp / "data", players, games, old_apps.drop(late_apps.index), old_vals.drop(late_vals.index))
+        artifacts = tmp / "artifacts"
+        watermark = bootstrap(tmp / "data", artifacts)
+        assert (pd.to_datetime(late_apps["date"]) <= pd.Timestamp(watermark["appearances"]["max_date"])).all()
+
+        # The late rows arrive along with two rows that are already stored
+        pd.concat([late_apps, old_apps.drop(late_apps.index).head(2)]).to_csv(tmp / "late_apps.csv", index=False)
+        late_vals.to_csv(tmp / "late_vals.csv", index=False)
+        run = ingest(tmp / "late_apps.csv", tmp / "late_vals.csv", tmp / "data", artifacts)
+        assert run["new_appearances"] == 5 and run["new_valuations"] == 2
+        assert run["already_stored"] == {"appearances": 2, "valuations": 0}
+
+        _write_data(tmp / "full", players, games, old_apps, old_vals)
+        bootstrap(tmp / "full", tmp / "full_artifacts")
+        _assert_same(_snapshot(artifacts), _snapshot(tmp / "full_artifacts"))
+    print("✓ Late rows before the watermark are ingested")
+
+
+if __name__ == "__main__":
+    test_ingest_matches_full_bootstrap()
+    test_widened_bounds_update_unaffected_players()
+    test_reingest_is_a_no_op()
+    test_late_rows_are_ingested()
@@ -0,0 +1,130 @@
+"""Test the Prometheus metrics and the per-agent LLM instrumentation."""
+
+import asyncio
+import logging
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from llm_stub import offline_llm, stub_llm  # noqa: E402
+from src.llm.clients import http_pool  # noqa: E402
+from src.llm.clients import openai_client  # noqa: E402
+from src.llm.stub_server import StubConfig  # noqa: E402
+from src.utils.metrics import (  # noqa: E402
+    LLM_DURATION, LLM_ERRORS, LLM_REQUESTS, LLM_TOKENS, LLM_TTFT, MetricsRegistry, Counter, Histogram,
+)
+from src.utils.request_context import REQUEST_ID, install_log_record_factory  # noqa: E402
+
+
+def test_exposition_format():
+    """Counters and cumulative histogram buckets render in the text format."""
+    registry = MetricsRegistry()
+    requests = registry.register(Counter("demo_total", "Demo counter.", ("route",)))
+    latency = registry.register(Histogram("demo_seconds", "Demo histogram.", ("route",), buckets=(0.1, 1)))
+    requests.inc(route='/a"b')
+    requests.inc(2, route='/a"b')
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value, route="/a")
+
+    text = registry.render()
+    assert "# TYPE demo_total counter" in text
+    assert 'demo_total{route="/a\\"b"} 3' in text
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 2' in text
+    assert 'demo_seconds_bucket{route="/a",le="1"} 3' in text
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 4' in text
+    assert 'demo_seconds_count{route="/a"} 4' in text
+
+    install_log_record_factory()
+    install_log_record_factory()
+    token = REQUEST_ID.set("abc123")
+    record = logging.getLogger("test").makeRecord("test", logging.INFO, __file__, 1, "msg", (), None)
+    REQUEST_ID.reset(token)
+    assert record.request_id == "abc123"
+    print("✓ Metrics render in Prometheus text format; log records carry the request id")
+
+
+def test_llm_calls_are_recorded():
+    """Tokens, durations and TTFT are recorded per agent and model."""
+    labels = {"agent": "metrics_test", "model": "gpt-5-mini"}
+
+    with stub_llm(StubConfig(ttft_ms=30, tokens_per_second=0), cache_entries=64):
+        client = openai_client.OpenAIClient({"model": "gpt-5-mini"}, agent="metrics_test")
+        messages = [{"role": "user", "content": "hello there"}]
+
+        async def main():
+            response = await client.chat_completion(messages=messages)
+            completion = response.usage.completion_tokens
+            stream = await client.chat_completion(messages=messages, stream=True)
+            async for chunk in stream:
+                if chunk.usage:
+                    completion += chunk.usage.completion_tokens
+            return completion
+
+        completion = asyncio.run(main())
+
+    assert LLM_REQUESTS.value(status="ok", **labels) == 2
+    assert LLM_DURATION.count(**labels) == 2
+    assert LLM_TTFT.count(**labels) == 1
+    assert LLM_TOKENS.value(kind="completion", **labels) == completion > 0
+    assert LLM_TOKENS.value(kind="prompt", **labels) > 0
+    print("✓ LLM requests, tokens, duration and TTFT are recorded per agent")
+
+
+class _BrokenStream:
+    """Yields one chunk, then fails like a dropped connection."""
+
+    def __init__(self):
+        self.sent = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.sent:
+            raise ConnectionResetError("connection dropped")
+        self.sent = True
+        return SimpleNamespace(choices=[], usage=None)
+
+
+class _Completions:
+    """Stands in for client.chat.completions: every create() returns a fresh broken stream."""
+
+    def __init__(self):
+        self.with_raw_response = self
+
+    async def create(self, **params):
+        return SimpleNamespace(headers={}, parse=_BrokenStream)
+
+
+def test_failed_stream_is_counted_once():
+    """A stream that fails mid-way counts as one error request, not also as ok."""
+    labels = {"agent": "metrics_stream_test", "model": "gpt-5-mini"}
+
+    with offline_llm(cache_entries=0):
+        registry = http_pool.ClientRegistry(api_key="test", rate_limits={})
+        client = openai_client.OpenAIClient({"model": "gpt-5-mini"}, registry=registry, agent=labels["agent"])
+
+        async def main():
+            stream = await client._call(_Completions(), {"model": "gpt-5-mini", "stream": True, "messages": []})
+            try:
+                async for _ in stream:
+                    pass
+            except ConnectionResetError:
+                return True
+            return False
+
+        assert asyncio.run(main())
+
+    assert LLM_REQUESTS.value(status="error", **labels) == 1
+    assert LLM_REQUESTS.value(status="ok", **labels) == 0
+    assert LLM_ERRORS.value(error="ConnectionResetError", **labels) == 1
+    assert LLM_DURATION.count(**labels) == 1
+    print("✓ A stream that fails mid-way is counted once, as an error")
+
+
+if __name__ == "__main__":
+    test_exposition_format()
+    test_llm_calls_are_recorded()
+    test_failed_stream_is_counted_once()
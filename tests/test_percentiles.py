@@ -0,0 +1,104 @@
+"""Test percentile tables per position and age band."""
+
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.models.percentiles import (
+    METRICS_NAME, MIN_GROUP, TABLES_NAME, PercentileTables, age_band, build_tables, get_percentile_tables,
+    player_metrics,
+)
+
+
+def _metrics(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, n + 1)
+    players = pd.DataFrame({
+        "player_id": ids,
+        "position": rng.choice(["Attack", "Midfield", "Defender"], n, p=[0.45, 0.45, 0.1]),
+        "date_of_birth": pd.Timestamp("2024-06-30") - pd.to_timedelta(rng.integers(17 * 365, 36 * 365, n), unit="D"),
+        "market_value_in_eur": rng.integers(1, 100, n) * 100_000.0,
+    })
+    aggregates = pd.DataFrame({
+        "player_id": ids,
+        "minutes_365": rng.integers(0, 3000, n),
+        "goals_per90": rng.random(n),
+        "assists_per90": rng.random(n),
+    })
+    series = pd.DataFrame({
+        "player_id": np.repeat(ids, 12),
+        "time": np.tile(pd.date_range("2024-01-01", periods=12, freq="W"), n),
+        "universal_score_100": rng.random(n * 12) * 100,
+    })
+    growth = pd.DataFrame({"player_id": ids, "growth_potential_score": rng.random(n) * 100})
+    return player_metrics(players, aggregates, series, growth, reference_date="2024-06-30"), series
+
+
+def test_metrics_and_lookup():
+    """Percentiles equal a brute-force count within the player's group."""
+    metrics, series = _metrics()
+    assert list(age_band([16.0, 21.0, 23.9, 29.99, 30.0])) == ["U21", "21-23", "21-23", "27-29", "30+"]
+    assert metrics.loc[metrics["minutes_365"] < 450, "goals_per90"].isna().all()
+    last10 = series[series["player_id"] == 1].tail(10)["universal_score_100"].mean()
+    assert np.isclose(metrics.loc[metrics["player_id"] == 1, "universal_score"].iloc[0], last10)
+
+    tables = PercentileTables(build_tables(metrics), metrics)
+    for pid in metrics["player_id"][:50]:
+        section = tables.player_percentiles(int(pid))
+        for metric, entry in section["metrics"].items():
+            group = entry["compared_with"]
+            pool = metrics[metrics[metric].notna()]
+            if group["position"] != "all":
+                pool = pool[pool["position"] == group["position"]]
+            if group["age_band"] != "all":
+                pool = pool[pool["age_band"] == group["age_band"]]
+            assert len(pool) == group["size"] >= MIN_GROUP
+            v = entry["value"]
+            expected = 100 * ((pool[metric] < v).sum() + 0.5 * (pool[metric] == v).sum()) / len(pool)
+            assert entry["percentile"] == round(expected, 1)
+
+    # Defenders are scarce: their age bands are too small and fall back to all ages
+    defender = int(metrics.loc[metrics["position"] == "Defender", "player_id"].iloc[0])
+    entry = tables.player_percentiles(defender)["metrics"]["market_value_in_eur"]
+    assert entry["compared_with"]["age_band"] == "all"
+    assert tables.player_percentiles(99999) is None
+    print("✓ Percentiles match brute-force counts per position and age band")
+
+
+def _write(artifacts_dir, metrics, mtime):
+    np.savez(artifacts_dir / TABLES_NAME, **build_tables(metrics))
+    metrics.to_parquet(artifacts_dir / METRICS_NAME, index=False)
+    for name in (TABLES_NAME, METRICS_NAME):
+        os.utime(artifacts_dir / name, (mtime, mtime))
+
+
+def test_cached_tables_follow_refreshes():
+    """Tables are cached per directory and re-read when a refresh replaces the files."""
+    first, _ = _metrics(seed=0)
+    second, _ = _metrics(seed=1)
+    with tempfile.TemporaryDirectory() as a, tempfile.TemporaryDirectory() as b:
+        a, b = Path(a), Path(b)
+        assert get_percentile_tables(a) is None
+        _write(a, first, 1_000_000)
+        _write(b, second, 1_000_000)
+
+        tables = get_percentile_tables(a)
+        assert get_percentile_tables(a) is tables
+        other = get_percentile_tables(b)
+        assert other is not tables and other.player_percentiles(1) == PercentileTables(
+            build_tables(second), second).player_percentiles(1)
+
+        # An ingest rewrites the files: the next call serves the new values
+        _write(a, second, 2_000_000)
+        refreshed = get_percentile_tables(a)
+        assert refreshed is not tables
+        assert refreshed.player_percentiles(1) == other.player_percentiles(1) != tables.player_percentiles(1)
+    print("✓ Percentile tables are cached per directory and reloaded after refreshes")
+
+
+if __name__ == "__main__":
+    test_metrics_and_lookup()
+    test_cached_tables_follow_refreshes()
@@ -0,0 +1,83 @@
+"""Test the prompt-cache-friendly message layout against the stub's simulated prompt cache."""
+
+import asyncio
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from llm_stub import stub_llm  # noqa: E402
+from synthetic_player_data import generate_players  # noqa: E402
+from src.global_configs import ANALYSIS_AGENT_CONFIGS, REPORT_ANSWER_AGENT_CONFIGS, REPORT_SCHEMA  # noqa: E402
+from src.llm.stub_server import PromptCache, StubConfig, example_from_schema  # noqa: E402
+from src.utils.metrics import LLM_TOKENS  # noqa: E402
+
+
+def _tokens(agent: str):
+    """(prompt, cached) tokens counted so far for an agent."""
+    totals = {"prompt": 0, "cached": 0}
+    for (name, _, kind), n in LLM_TOKENS.samples().items():
+        if name == agent and kind in totals:
+            totals[kind] += n
+    return totals["prompt"], totals["cached"]
+
+
+def _delta(agent: str, before):
+    prompt, cached = _tokens(agent)
+    return prompt - before[0], cached - before[1]
+
+
+def test_stub_prompt_cache_matches_prefixes():
+    """Only prefixes of at least 1024 tokens already sent to the same model are cached."""
+    cache = PromptCache()
+    static = "instructions " * 800
+    assert cache.lookup("m", static + "player A") == 0
+    assert cache.lookup("m", static + "player B") == 2560
+    assert cache.lookup("other", static + "player B") == 0
+    assert cache.lookup("m", "short prompt") == 0 and cache.lookup("m", "short prompt") == 0
+    print("✓ Stub caches repeated prompt prefixes per model")
+
+
+def test_static_prefix_is_shared_across_turns_and_players():
+    """Report chat turns reuse the cached conversation; analyses of different players share the instructions."""
+    from src.llm.agents.chatbot.report_answer_agent import ReportAnswerAgent
+    from src.llm.agents.report import AnalysisAgent
+
+    players = generate_players(2, games_per_player=20)
+    report = example_from_schema(REPORT_SCHEMA, random.Random(0))
+
+    with stub_llm(StubConfig(ttft_ms=0, tokens_per_second=0, seed=5)):
+        chat = ReportAnswerAgent(config=REPORT_ANSWER_AGENT_CONFIGS)
+        analysis = AnalysisAgent(config=ANALYSIS_AGENT_CONFIGS)
+
+        async def turn(question, session_id):
+            before = _tokens("report_answer_agent")
+            async for _ in chat.process_message("u", question, report, players[0], session_id=session_id):
+                pass
+            return _delta("report_answer_agent", before)
+
+        async def analyze(player):
+            before = _tokens("analysis_agent")
+            await analysis.analyze(player)
+            return _delta("analysis_agent", before)
+
+        async def main():
+            session_id = await chat.session_manager.start_session("u")
+            turns = [await turn(q, session_id) for q in ("How old is he?", "Is he undervalued?", "Compare both.")]
+            return turns, [await analyze(p) for p in players]
+
+        turns, analyses = asyncio.run(main())
+
+    assert turns[0][1] == 0
+    for prompt, cached in turns[1:]:
+        assert cached / prompt > 0.9, (prompt, cached)
+
+    # Different players: the system prompt and task instructions come first and are cached
+    assert analyses[0][1] == 0 and analyses[1][1] >= 1024
+    print("✓ Report chat turns and per-player analyses hit the prompt cache")
+
+
+if __name__ == "__main__":
+    test_stub_prompt_cache_matches_prefixes()
+    test_static_prefix_is_shared_across_turns_and_players()
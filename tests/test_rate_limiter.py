@@ -0,0 +1,54 @@
+"""Test client-side LLM rate limiting and priority scheduling."""
+
+import asyncio
+import time
+
+from src.llm.clients.rate_limiter import ModelLimiter, estimate_tokens, parse_duration
+
+
+def test_priority_and_token_buckets():
+    """Interactive requests overtake queued batch ones; RPM, TPM and headers are honoured."""
+    assert parse_duration("6m0s") == 360 and parse_duration("1.5s") == 1.5 and parse_duration("20ms") == 0.02
+    assert estimate_tokens({"messages": "x" * 400, "max_completion_tokens": 50}) == 150
+
+    async def main():
+        # One slot: three batch requests queue up, then a chat turn arrives
+        limiter = ModelLimiter(concurrency=1)
+        order = []
+
+        async def request(name, priority):
+            await limiter.acquire(10, priority)
+            order.append(name)
+            await asyncio.sleep(0.02)
+            limiter.release()
+
+        tasks = [asyncio.create_task(request(f"batch{i}", "batch")) for i in range(3)]
+        await asyncio.sleep(0.005)
+        tasks.append(asyncio.create_task(request("chat", "interactive")))
+        await asyncio.sleep(0.005)
+        assert limiter.stats()["queue_depth"] == {"interactive": 1, "batch": 2}
+        await asyncio.gather(*tasks)
+        assert order == ["batch0", "chat", "batch1", "batch2"]
+
+        # 120 RPM = 2 per second: a burst of 122 waits ~1s for the last two
+        limiter = ModelLimiter(concurrency=1000, rpm=120)
+        start = time.monotonic()
+        for _ in range(122):
+            await limiter.acquire(0, "batch")
+        assert 0.8 < time.monotonic() - start < 1.5
+
+        # Headers shrink the bucket; actual usage is charged after the fact
+        limiter = ModelLimiter(concurrency=10, tpm=60_000)
+        limiter.observe({"x-ratelimit-limit-tokens": "60000", "x-ratelimit-remaining-tokens": "500"})
+        await limiter.acquire(400, "interactive")
+        limiter.settle(estimated=400, actual=1400)
+        assert limiter.stats()["tpm_available"] < 0
+        limiter.throttle({"retry-after-ms": "200"})
+        assert limiter.stats()["paused_for_seconds"] > 0.1 and limiter.stats()["throttled"] == 1
+
+    asyncio.run(main())
+    print("✓ Priority queue, token buckets and header feedback behave")
+
+
+if __name__ == "__main__":
+    test_priority_and_token_buckets()
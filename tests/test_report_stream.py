@@ -0,0 +1,123 @@
+"""Test progressive report streaming: incremental JSON parsing and the SSE endpoint."""
+
+import asyncio
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from llm_stub import stub_llm  # noqa: E402
+from synthetic_player_data import generate_players  # noqa: E402
+from src.global_configs import GENERATOR_AGENT_CONFIGS, REPORT_SCHEMA  # noqa: E402
+from src.llm.stub_server import StubConfig, example_from_schema  # noqa: E402
+from src.utils.json_stream import IncrementalJSONParser  # noqa: E402
+
+
+def _sse_events(body: str):
+    """(event, data) pairs of a text/event-stream body."""
+    events = []
+    for message in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_incremental_parser_emits_closed_values():
+    """Any chunking yields the same values, each as soon as it closes."""
+    report = example_from_schema(REPORT_SCHEMA, random.Random(0))
+    report["report"]["executive_summary"] = 'Quotes " and braces } inside, \\ escaped é'
+    text = "```json\n" + json.dumps(report, indent=2) + "\n```"
+
+    whole = IncrementalJSONParser(max_depth=2).feed(text)
+    assert whole[0] == (("player_info", "id"), report["player_info"]["id"])
+    assert (("report", "executive_summary"), report["report"]["executive_summary"]) in whole
+    assert dict(whole)[("report",)] == report["report"] and dict(whole)[("news",)] == report["news"]
+
+    rng = random.Random(1)
+    for _ in range(20):
+        parser, events, i = IncrementalJSONParser(max_depth=2), [], 0
+        while i < len(text):
+            n = rng.randint(1, 12)
+            events += parser.feed(text[i:i + n])
+            i += n
+        assert events == whole and parser.done
+
+    # A section is emitted by the chunk that closes it, before the rest arrives
+    cut = text.index('"player_development"')
+    parser = IncrementalJSONParser(max_depth=2)
+    assert ("report", "executive_summary") in [path for path, _ in parser.feed(text[:cut])]
+    print("✓ Incremental parser emits each closed value regardless of chunking")
+
+
+def test_stream_endpoint_sends_sections_before_report():
+    """The SSE endpoint streams stages, then each report section, then the full report."""
+    player = generate_players(1, games_per_player=10)[0]
+
+    with stub_llm(StubConfig(ttft_ms=0, tokens_per_second=0, seed=3)):
+        # The route's orchestrator binds the registry when the module is first imported
+        from src.api.routes import generator
+        original, generator.orchestrator = generator.orchestrator, generator.ReportOrchestrator()
+        app = FastAPI()
+        app.include_router(generator.router)
+        try:
+            with TestClient(app) as client:
+                response = client.post("/api/reports/generate/stream", json={
+                    "player_data": player, "player_name": player["name"],
+                    "club": player["basic_info"]["current_club_name"],
+                })
+                assert response.status_code == 200
+                assert response.headers["content-type"].startswith("text/event-stream")
+                events = _sse_events(response.text)
+
+                missing_name = client.post("/api/reports/generate/stream", json={"player_data": {}})
+                assert missing_name.status_code == 400
+        finally:
+            generator.orchestrator = original
+
+    kinds = [kind for kind, _ in events]
+    assert [data["stage"] for kind, data in events if kind == "stage"] == ["analysis", "news_analysis", "report"]
+    assert kinds[-1] == "report" and "error" not in kinds
+    sections = {data["path"]: data["value"] for kind, data in events if kind == "section"}
+    report = events[-1][1]
+    assert sections["report.executive_summary"] == report["report"]["executive_summary"]
+    assert sections["report.strengths"] == report["report"]["strengths"]
+    assert sections["player_info"] == report["player_info"] and "player_info.id" not in sections
+    assert set(sections) >= {f"report.{key}" for key in REPORT_SCHEMA["properties"]["report"]["required"]}
+    print("✓ Report sections stream as Server-Sent Events before the complete report")
+
+
+def test_rejected_tier_resets_streamed_sections():
+    """A cheap tier's rejected output is followed by a reset and the next tier's sections."""
+    from src.llm.agents.report import GeneratorAgent
+
+    config = {**GENERATOR_AGENT_CONFIGS,
+              "cascade": {**GENERATOR_AGENT_CONFIGS.get("cascade", {}),
+                          "tiers": [{"model": "gpt-5-nano"}], "min_text_chars": 10_000}}
+
+    with stub_llm(StubConfig(ttft_ms=0, tokens_per_second=0, seed=4)):
+        agent = GeneratorAgent(config=config)
+
+        async def collect():
+            return [event async for event in agent.stream_report({"executive_summary": "x"}, [], {"analysis": ""})]
+
+        events = asyncio.run(collect())
+
+    kinds = [kind for kind, _ in events]
+    assert kinds.count("reset") == 1 and kinds[-1] == "report"
+    assert events[kinds.index("reset")][1]["outcome"] == "low_quality"
+    summaries = [data for kind, data in events if kind == "section" and data["path"] == "report.executive_summary"]
+    assert len(summaries) == 2
+    # The last tier's output is final even though it fails the length check
+    assert events[-1][1]["report"]["executive_summary"] == summaries[-1]["value"]
+    print("✓ Rejected cascade tiers reset the streamed sections")
+
+
+if __name__ == "__main__":
+    test_incremental_parser_emits_closed_values()
+    test_stream_endpoint_sends_sections_before_report()
+    test_rejected_tier_resets_streamed_sections()
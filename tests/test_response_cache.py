@@ -0,0 +1,44 @@
+"""Test the two-tier LLM response cache."""
+
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from src.llm.clients.response_cache import ResponseCache, cache_key
+
+
+def test_cache_tiers_and_keys():
+    """Keys are canonical; memory evicts LRU, SQLite persists, TTLs expire."""
+    params = {"model": "gpt-5-mini", "messages": [{"role": "user", "content": "Who is 8198?"}]}
+    reordered = {"messages": [{"content": "Who is 8198?", "role": "user"}], "model": "gpt-5-mini"}
+    assert cache_key(params) == cache_key(reordered)
+    assert cache_key(params) != cache_key({**params, "temperature": 0.2})
+
+    async def main(path):
+        cache = ResponseCache(memory_entries=2, sqlite_path=path)
+        assert await cache.get("a") is None
+        await cache.set("a", '{"v": 1}', ttl=60)
+        await cache.set("b", '{"v": 2}', ttl=60)
+        await cache.set("c", '{"v": 3}', ttl=0.05)
+        assert await cache.get("b") == '{"v": 2}'           # memory
+        assert await cache.get("a") == '{"v": 1}'           # evicted from memory, found on disk
+        time.sleep(0.1)
+        assert await cache.get("c") is None                 # expired
+        cache.close()
+
+        reopened = ResponseCache(memory_entries=2, sqlite_path=path)
+        assert await reopened.get("b", label="gpt-5-mini") == '{"v": 2}'
+        stats = reopened.stats()["totals"]
+        reopened.close()
+        return cache.stats()["totals"], stats
+
+    with tempfile.TemporaryDirectory() as tmp:
+        first, second = asyncio.run(main(Path(tmp) / "cache.sqlite3"))
+    assert first == {"memory_hits": 1, "disk_hits": 1, "misses": 2, "stores": 3, "hit_rate": 0.5}
+    assert second["disk_hits"] == 1 and second["hit_rate"] == 1.0
+    print("✓ Response cache tiers, keys and TTLs behave")
+
+
+if __name__ == "__main__":
+    test_cache_tiers_and_keys()
@@ -0,0 +1,98 @@
+"""Test retries with backoff and hedged requests."""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+import openai
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from llm_stub import offline_llm  # noqa: E402
+from src.llm.clients import openai_client  # noqa: E402
+from src.llm.clients.http_pool import ClientRegistry  # noqa: E402
+from src.llm.clients.retry import RetryPolicy, hedged, is_retryable  # noqa: E402
+
+
+def _status_error(cls, status):
+    response = httpx.Response(status, request=httpx.Request("POST", "http://test/v1/chat/completions"))
+    return cls(f"HTTP {status}", response=response, body=None)
+
+
+class _Raw:
+    headers = {}
+
+    def __init__(self, value):
+        self.value = value
+
+    def parse(self):
+        return self.value
+
+
+class _Resource:
+    """Stands in for client.chat.completions: scripted latencies and failures."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.started = 0
+        self.with_raw_response = self
+
+    async def create(self, **params):
+        delay, outcome = self.script[min(self.started, len(self.script) - 1)]
+        self.started += 1
+        await asyncio.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _Raw(outcome)
+
+
+def test_retries_and_hedging():
+    """Transient errors are retried, permanent ones are not; slow calls are hedged."""
+    assert is_retryable(_status_error(openai.InternalServerError, 503))
+    assert is_retryable(_status_error(openai.RateLimitError, 429))
+    assert not is_retryable(_status_error(openai.BadRequestError, 400))
+    policy = RetryPolicy(max_attempts=5, base_delay=0.5, max_delay=2.0)
+    assert all(0 <= policy.backoff(n) <= min(2.0, 0.5 * 2 ** (n - 1)) for n in range(1, 6) for _ in range(50))
+
+    registry = ClientRegistry(api_key="test", rate_limits={})
+    fast_retry = {"max_attempts": 3, "base_delay": 0.001, "max_delay": 0.001}
+    params = {"model": "m", "messages": []}
+
+    async def main():
+        # 503, 503, ok -> three attempts
+        client = openai_client.OpenAIClient({"retry": fast_retry}, registry=registry)
+        resource = _Resource([(0, _status_error(openai.InternalServerError, 503))] * 2 + [(0, "ok")])
+        assert await client._call(resource, params) == "ok" and resource.started == 3
+
+        # 400 is not retried
+        resource = _Resource([(0, _status_error(openai.BadRequestError, 400)), (0, "ok")])
+        try:
+            await client._call(resource, params)
+            raise AssertionError("400 should not be retried")
+        except openai.BadRequestError:
+            assert resource.started == 1
+
+        # Hedge after 20 ms: the slow first attempt loses to the fast duplicate and is cancelled
+        hedging = openai_client.OpenAIClient({"hedge": {"after": 0.02}}, registry=registry)
+        resource = _Resource([(1.0, "slow"), (0.01, "fast")])
+        start = time.perf_counter()
+        assert await hedging._call(resource, params) == "fast"
+        assert time.perf_counter() - start < 0.5
+        assert registry.stats()["models"]["m"]["in_flight"] == 0
+
+        # A fast first attempt never hedges
+        result = await hedged(lambda: asyncio.sleep(0.001, result="first"), delay=0.5)
+        assert result == ("first", 1, False)
+
+    with offline_llm():
+        asyncio.run(main())
+    calls = registry.stats()["calls"]["m"]
+    assert calls["calls"] == 3 and calls["failures"] == 1 and calls["calls_with_3_attempts"] == 1
+    assert calls["hedges"] == 1 and calls["hedge_wins"] == 1
+    print("✓ Retries back off, permanent errors fail fast, hedges win over stragglers")
+
+
+if __name__ == "__main__":
+    test_retries_and_hedging()
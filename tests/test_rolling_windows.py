@@ -0,0 +1,92 @@
+"""Test trailing-window totals against the notebook's merge-filter-groupby."""
+
+import numpy as np
+import pandas as pd
+
+from src.models.rolling_windows import AppearanceWindows, WINDOW_COLUMNS
+
+
+def _appearances(rng, n_players=40, per_player=120):
+    rows = []
+    for pid in range(1, n_players + 1):
+        dates = pd.Timestamp("2018-01-01") + pd.to_timedelta(np.sort(rng.integers(0, 2500, per_player)), unit="D")
+        for i, d in enumerate(dates):
+            rows.append({
+                "appearance_id": f"{pid}_{i}",
+                "player_id": pid,
+                "date": d,
+                "minutes_played": int(rng.integers(0, 91)),
+                "goals": int(rng.poisson(0.2)),
+                "assists": int(rng.poisson(0.15)),
+                "yellow_cards": int(rng.random() < 0.1),
+                "red_cards": int(rng.random() < 0.01),
+            })
+    return pd.DataFrame(rows)
+
+
+def _notebook_agg(apps, queries):
+    """The xgboost.ipynb way: cartesian merge, filter to the window, group."""
+    tmp = apps.merge(queries, on="player_id", how="inner")
+    tmp = tmp[(tmp["date"] <= tmp["transfer_date"]) & (tmp["date"] >= tmp["transfer_date"] - pd.Timedelta(days=365))]
+    agg = tmp.groupby(["player_id", "transfer_date"]).agg(
+        minutes_365=("minutes_played", "sum"),
+        goals_365=("goals", "sum"),
+        assists_365=("assists", "sum"),
+        yellow_365=("yellow_cards", "sum"),
+        red_365=("red_cards", "sum"),
+        games_365=("appearance_id", "count"),
+    ).reset_index()
+    minutes = agg["minutes_365"].replace(0, np.nan)
+    agg["goals_per90"] = agg["goals_365"] / (minutes / 90)
+    agg["assists_per90"] = agg["assists_365"] / (minutes / 90)
+    agg["cards_per90"] = (agg["yellow_365"] + agg["red_365"]) / (minutes / 90)
+    agg["minutes_per_game"] = agg["minutes_365"] / agg["games_365"].replace(0, np.nan)
+    return queries.merge(agg, on=["player_id", "transfer_date"], how="left")
+
+
+def test_matches_notebook():
+    """Same numbers as the notebook for random transfer dates, including empty windows."""
+    rng = np.random.default_rng(7)
+    apps = _appearances(rng)
+
+    # Reference dates on appearance days hit the inclusive window edges
+    edge_dates = apps.sample(30, random_state=1)[["player_id", "date"]].rename(columns={"date": "transfer_date"})
+    edge_dates["transfer_date"] = edge_dates["transfer_date"] + pd.to_timedelta(
+        rng.choice([0, 365, 366], size=len(edge_dates)), unit="D"
+    )
+    random_dates = pd.DataFrame({
+        "player_id": rng.integers(1, 45, 200),  # some players have no appearances
+        "transfer_date": pd.Timestamp("2016-01-01") + pd.to_timedelta(rng.integers(0, 4000, 200), unit="D"),
+    })
+    queries = pd.concat([edge_dates, random_dates], ignore_index=True).drop_duplicates()
+
+    expected = _notebook_agg(apps, queries)
+    actual = AppearanceWindows(apps).totals(queries["player_id"], queries["transfer_date"])
+
+    assert (actual["ref_date"].to_numpy() == queries["transfer_date"].to_numpy()).all()
+    pd.testing.assert_frame_equal(
+        actual[WINDOW_COLUMNS].reset_index(drop=True),
+        expected[WINDOW_COLUMNS].astype("float64").reset_index(drop=True),
+    )
+    assert actual["games_365"].isna().any()
+
+    print(f"✓ {len(queries)} windows match the notebook aggregation")
+
+
+def test_single_reference_date():
+    """A scalar date (e.g. today) applies to every player."""
+    rng = np.random.default_rng(3)
+    apps = _appearances(rng, n_players=5, per_player=50)
+    today = pd.Timestamp("2024-11-30 15:42")
+
+    windows = AppearanceWindows(apps)
+    live = windows.totals([1, 2, 3], today)
+    per_query = windows.totals([1, 2, 3], [pd.Timestamp("2024-11-30")] * 3)
+
+    pd.testing.assert_frame_equal(live, per_query)
+    print("✓ Scalar reference date matches per-query dates")
+
+
+if __name__ == "__main__":
+    test_matches_notebook()
+    test_single_reference_date()
@@ -0,0 +1,61 @@
+"""Test on-demand SHAP explanations and their cache."""
+
+import os
+import tempfile
+
+import numpy as np
+import xgboost as xgb
+
+from src.json_generator.build_player_json import keep_top_bottom
+from src.models.shap_explanations import ShapCache, ShapExplainer
+from src.models.transfer_fee_inference import FEATURE_COLUMNS, TransferFeePredictor
+from test_transfer_fee_inference import _tables
+
+
+def test_keep_top_bottom():
+    """Same pruning as the notebook: 5 most negative and 5 most positive survive."""
+    values = np.array([0.5, -0.2, 0.0, 0.1, -0.9, 0.3, 0.05, -0.01, 0.2, 0.4, -0.3, 0.6])
+    pruned = keep_top_bottom(values)
+    kept = np.flatnonzero(pruned)
+    # top 5: 0.6, 0.5, 0.4, 0.3, 0.2; bottom 5: -0.9, -0.3, -0.2, -0.01 and 0.0
+    assert set(kept) == {11, 0, 9, 5, 8, 4, 10, 1, 7}
+    assert (pruned[kept] == values[kept]).all()
+    print("✓ Top/bottom pruning matches the notebook")
+
+
+def test_explain_and_cache():
+    """SHAP rows add up to the prediction and are served from memory, then disk."""
+    players, clubs, apps = _tables()
+    rng = np.random.default_rng(1)
+    X = rng.random((300, len(FEATURE_COLUMNS))).astype("float32")
+    booster = xgb.train({"max_depth": 3}, xgb.DMatrix(X, label=rng.random(300) * 15), num_boost_round=10)
+    predictor = TransferFeePredictor(players, clubs, apps, booster=booster)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "shap.sqlite")
+        explainer = ShapExplainer(predictor, ShapCache(path))
+
+        contribs, rows = explainer.contributions([10, 20], reference_date="2024-06-30")
+        direct = booster.predict(xgb.DMatrix(rows))
+        assert np.allclose(contribs.sum(axis=1), direct, atol=1e-4)
+
+        summaries = explainer.explain([10, 20, 10], reference_date="2024-06-30")
+        assert summaries[0] == summaries[2]
+        first = summaries[0]
+        assert set(first) == {"source", "reference_transfer", "positive_features", "negative_features"}
+        assert all(f["shap_value"] > 0 for f in first["positive_features"])
+        assert all(f["shap_value"] < 0 for f in first["negative_features"])
+        assert len(first["positive_features"]) + len(first["negative_features"]) <= 10
+        assert explainer.cache.stats()["entries"] == 2
+
+        # A new process starts with an empty LRU but finds the rows on disk
+        reloaded = ShapExplainer(predictor, ShapCache(path))
+        assert reloaded.explain([10, 20], reference_date="2024-06-30") == summaries[:2]
+        assert reloaded.cache.stats() == {"entries": 2, "hits": 2, "misses": 0}
+
+    print("✓ SHAP summaries are additive and cached in memory and on disk")
+
+
+if __name__ == "__main__":
+    test_keep_top_bottom()
+    test_explain_and_cache()
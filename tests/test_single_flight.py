@@ -0,0 +1,61 @@
+"""Test single-flight coalescing of identical report generations."""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from llm_stub import offline_llm  # noqa: E402
+from src.llm.orchestrators.report_orchestrator import ReportOrchestrator  # noqa: E402
+from src.utils.single_flight import SingleFlight  # noqa: E402
+
+
+def test_identical_reports_share_one_run():
+    """Concurrent identical requests run the pipeline once; a disconnect does not cancel it."""
+    with offline_llm():
+        orchestrator = ReportOrchestrator()
+    runs = []
+
+    async def fake_pipeline(player_data, player_name, club):
+        runs.append(player_name)
+        run = len(runs)
+        await asyncio.sleep(0.05)
+        return {"player": player_name, "run": run}
+
+    orchestrator._run_pipeline = fake_pipeline
+    player = {"player_info": {"name": "Player A", "club": "Club X"}, "stats": {"goals": 10}}
+
+    async def main():
+        first = asyncio.create_task(orchestrator.generate_player_report(player))
+        second = asyncio.create_task(orchestrator.generate_player_report(dict(player)))
+        impatient = asyncio.create_task(orchestrator.generate_player_report(player))
+        other = asyncio.create_task(orchestrator.generate_player_report({**player, "stats": {"goals": 11}}))
+        await asyncio.sleep(0.01)
+        impatient.cancel()                               # caller disconnects
+        results = await asyncio.gather(first, second, other)
+        assert impatient.cancelled()
+        assert results[0] is results[1] and results[0]["run"] == 1
+        assert results[2]["run"] == 2
+
+        # Once finished, the next identical request runs again
+        assert (await orchestrator.generate_player_report(player))["run"] == 3
+
+        # Errors reach every waiter, and the key is released afterwards
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        outcomes = await asyncio.gather(flight.do("k", fail), flight.do("k", fail), return_exceptions=True)
+        assert all(isinstance(e, RuntimeError) for e in outcomes)
+        assert flight.leaders == 1 and flight.followers == 1 and flight.in_flight == 0
+
+    asyncio.run(main())
+    assert runs == ["Player A"] * 3
+    print("✓ Identical concurrent reports share one pipeline run")
+
+
+if __name__ == "__main__":
+    test_identical_reports_share_one_run()
@@ -0,0 +1,49 @@
+"""Test club and league aggregates."""
+
+import tempfile
+
+import pandas as pd
+
+from src.models.squad_aggregates import get_summary, squad_aggregates
+
+
+def _players():
+    return pd.DataFrame({
+        "player_id": [1, 2, 3, 4, 5],
+        "date_of_birth": ["2005-01-01", "1999-01-01", "1990-01-01", "2001-06-30", "1980-01-01"],
+        "market_value_in_eur": [1e6, 3e6, 2e6, None, 5e5],
+        "current_club_id": [10, 10, 20, 20, 10],
+        "current_club_name": ["A", "A", "B", "B", "A"],
+        "current_club_domestic_competition_id": ["GB1", "GB1", "GB1", "GB1", "GB1"],
+        "last_season": [2024, 2024, 2024, 2024, 2019],   # player 5 retired
+    })
+
+
+def test_club_and_league_summaries():
+    """Aggregates match a hand count; only current players are included."""
+    growth = pd.DataFrame({"player_id": [1, 2, 3], "growth_potential_score": [90.0, 50.0, 75.0]})
+    clubs, leagues = squad_aggregates(_players(), growth, reference_date="2024-06-30")
+
+    a = clubs.set_index("club_id").loc[10]
+    assert a["squad_size"] == 2 and a["total_market_value"] == 4e6 and a["top_market_value"] == 3e6
+    assert a["average_growth_score"] == 70.0 and a["breakout_candidates"] == 1
+    assert a["players_u21"] == 1 and a["players_24_26"] == 1
+    b = clubs.set_index("club_id").loc[20]
+    assert b["average_market_value"] == 2e6                    # missing values are skipped
+    assert b["breakout_candidates"] == 1 and b["players_30_plus"] == 1
+
+    league = leagues.set_index("league_id").loc["GB1"]
+    assert league["clubs"] == 2 and league["squad_size"] == 4 and league["breakout_candidates"] == 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        clubs.to_parquet(f"{tmp}/club_aggregates.parquet", index=False)
+        summary = get_summary("clubs", 10, artifacts_dir=tmp)
+        assert summary["club_name"] == "A" and summary["squad_size"] == 2
+        assert summary["age_profile"]["players_by_age_band"]["U21"] == 1
+        assert get_summary("clubs", 99, artifacts_dir=tmp) is None
+
+    print("✓ Club and league aggregates match a hand count")
+
+
+if __name__ == "__main__":
+    test_club_and_league_summaries()
@@ -0,0 +1,72 @@
+"""Test the agents end to end against the local OpenAI stub server."""
+
+import asyncio
+import os
+import sys
+import time
+
+import openai
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from llm_stub import stub_llm  # noqa: E402
+from src.global_configs import ANALYSIS_AGENT_CONFIGS, ANALYSIS_SCHEMA, NEWS_AGENT_CONFIGS, REPORT_SCHEMA  # noqa: E402
+from src.llm.agents.report import AnalysisAgent, NewsAgent  # noqa: E402
+from src.llm.clients import openai_client  # noqa: E402
+from src.llm.stub_server import StubConfig, example_from_schema  # noqa: E402
+
+
+def _conforms(value, schema):
+    """Minimal structural check: types, enums and required keys."""
+    if "enum" in schema:
+        return value in schema["enum"]
+    kind = schema.get("type")
+    if kind == "object":
+        return (isinstance(value, dict) and set(schema.get("required", [])) <= set(value)
+                and all(_conforms(value[k], s) for k, s in schema.get("properties", {}).items() if k in value))
+    if kind == "array":
+        return isinstance(value, list) and len(value) >= schema.get("minItems", 0) and \
+            all(_conforms(v, schema.get("items", {})) for v in value)
+    types = {"string": str, "integer": int, "number": (int, float), "boolean": bool}
+    return kind not in types or isinstance(value, types[kind])
+
+
+def test_agents_against_stub():
+    """Structured outputs conform to the schemas; streams, web search, latency and errors work offline."""
+    import random
+    assert _conforms(example_from_schema(REPORT_SCHEMA, random.Random(0)), REPORT_SCHEMA)
+
+    with stub_llm(StubConfig(ttft_ms=50, tokens_per_second=0, seed=1), cache_entries=64):
+        async def main():
+            analysis = await AnalysisAgent(config=ANALYSIS_AGENT_CONFIGS).analyze({"player_info": {"name": "A"}})
+            assert _conforms(analysis, ANALYSIS_SCHEMA)
+
+            news = await NewsAgent(config=NEWS_AGENT_CONFIGS).fetch_news("Player A", "Club X")
+            assert len(news) == 3 and {"title", "summary", "date", "source", "relevance"} <= set(news[0])
+
+            client = openai_client.OpenAIClient({"model": "gpt-5-mini"})
+            start = time.perf_counter()
+            stream = await client.chat_completion(messages=[{"role": "user", "content": "hi"}], stream=True)
+            first, text = None, ""
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    first = first or time.perf_counter() - start
+                    text += chunk.choices[0].delta.content
+            assert first >= 0.05 and len(text.split()) == 60
+
+        asyncio.run(main())
+
+    # Injected 503s are retried, then surface
+    stub = StubConfig(ttft_ms=0, tokens_per_second=0, error_rate=1.0, error_status=503)
+    with stub_llm(stub):
+        client = openai_client.OpenAIClient({"retry": {"max_attempts": 2, "base_delay": 0.001}})
+        try:
+            asyncio.run(client.chat_completion(messages=[{"role": "user", "content": "hi"}]))
+            raise AssertionError("expected an injected error")
+        except openai.InternalServerError:
+            pass
+    print("✓ Agents run offline against the stub with schema-conforming outputs")
+
+
+if __name__ == "__main__":
+    test_agents_against_stub()
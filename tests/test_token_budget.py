@@ -0,0 +1,61 @@
+"""Test token-budgeted trimming of player_data."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from synthetic_player_data import generate_model_frames, generate_players  # noqa: E402
+from src.global_configs import TOKEN_BUDGET_CONFIGS
+from src.json_generator.build_player_json import build_player_massive_json
+from src.utils.token_budget import TokenBudgeter, count_tokens, last_n, summarize_series, top_k
+
+
+def test_strategies():
+    """last_n, top_k and summarize_series shrink sections as configured."""
+    assert last_n([1, 2, 3, 4], n=2) == [3, 4]
+    features = [{"feature": "a", "shap_value": 0.1}, {"feature": "b", "shap_value": -0.5},
+                {"feature": "c", "shap_value": 0.3}]
+    assert [f["feature"] for f in top_k(features, k=2, by="shap_value")] == ["b", "c"]
+    assert top_k({"x": 0.1, "y": -2.0, "z": 1.0}, k=2) == {"y": -2.0, "z": 1.0}
+
+    series = [{"date": f"2024-{m:02d}-{d:02d}", "score": float(m), "value": 100.0}
+              for m in range(1, 7) for d in (1, 15)]
+    summary = summarize_series(series, period="quarter", keep_last=1)
+    assert summary["summary"]["points"] == 12 and summary["summary"]["score"]["max"] == 6.0
+    assert summary["periods"] == [{"quarter": "2024-Q2", "points": 6, "score": 5.0, "value": 100.0}]
+    assert count_tokens("") == 0 and count_tokens("market_value 1234567") > 3
+    print("✓ Trimming strategies keep the latest / largest items and summarize series")
+
+
+def test_player_data_fits_budget():
+    """A full profile is trimmed least-important-first to fit; small payloads pass through."""
+    players = generate_players(2, games_per_player=400)
+    shap_df, scores_df, mlr_df, players_df = generate_model_frames(players)
+    player_data = build_player_massive_json(1, shap_df, scores_df, mlr_df, players_df)
+    budgeter = TokenBudgeter(TOKEN_BUDGET_CONFIGS["player_data"])
+    full = budgeter.count(player_data)
+
+    unchanged, report = budgeter.fit(player_data, budget=full + 10)
+    assert unchanged is player_data and not report["trimmed"] and not report["dropped"]
+
+    budget = full // 3
+    fitted, report = budgeter.fit(player_data, budget=budget, label="test")
+    assert report["tokens_after"] == budgeter.count(fitted) <= budget
+    assert report["trimmed"][0]["section"] == "performance_time_series"
+    assert "summary" in fitted["performance_time_series"]
+    assert fitted["basic_info"] == player_data["basic_info"]
+    assert isinstance(player_data["performance_time_series"], list)  # input not modified
+
+    # Very small budgets drop optional sections but keep the required ones
+    fitted, report = budgeter.fit(player_data, budget=600)
+    assert "performance_time_series" in report["dropped"]
+    assert {"basic_info", "career_totals", "player_id", "name"} <= set(fitted)
+    assert report["tokens_after"] == budgeter.count(fitted)
+    print(f"✓ player_data trimmed from {full} to {budgeter.count(fitted)} tokens; "
+          f"dropped {', '.join(report['dropped'])}")
+
+
+if __name__ == "__main__":
+    test_strategies()
+    test_player_data_fits_budget()
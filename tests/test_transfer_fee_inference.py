@@ -0,0 +1,144 @@
+"""Test live transfer-fee features, predictions and micro-batching."""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.models.transfer_fee_inference import FEATURE_COLUMNS, TransferFeePredictor
+from src.utils.micro_batcher import MicroBatcher
+
+
+def _tables():
+    players = pd.DataFrame({
+        "player_id": [10, 20],
+        "name": ["A", "B"],
+        "date_of_birth": ["2000-06-30", "1995-01-01"],
+        "contract_expiration_date": ["2026-06-30", None],
+        "height_in_cm": [180.0, 190.0],
+        "market_value_in_eur": [5_000_000.0, 1_000_000.0],
+        "current_club_id": [1, 2],
+        "position": ["Midfield", "Attack"],
+        "sub_position": ["Central Midfield", "Centre-Forward"],
+        "foot": ["left", None],
+    })
+    clubs = pd.DataFrame({
+        "club_id": [1, 2],
+        "total_market_value": [None, None],
+        "squad_size": [25, 30],
+        "average_age": [26.0, 28.0],
+        "foreigners_percentage": [40.0, 60.0],
+    })
+    apps = pd.DataFrame({
+        "player_id": [10, 10, 10, 20],
+        "date": ["2024-01-01", "2024-06-01", "2022-01-01", "2024-05-01"],
+        "minutes_played": [90, 45, 90, 30],
+        "goals": [1, 0, 3, 0],
+        "assists": [0, 1, 0, 0],
+        "yellow_cards": [1, 0, 0, 0],
+        "red_cards": [0, 0, 0, 0],
+    })
+    return players, clubs, apps
+
+
+def test_feature_rows():
+    """Features follow the notebook's definitions; unknown players get zeros."""
+    players, clubs, apps = _tables()
+    predictor = TransferFeePredictor(players, clubs, apps)
+    feats = predictor.build_features([10, 20, 99], to_club_ids=[2, None, None], reference_date="2024-06-30")
+
+    assert list(feats.columns) == FEATURE_COLUMNS
+    a = feats.iloc[0]
+    assert a["age_at_transfer"] == (pd.Timestamp("2024-06-30") - pd.Timestamp("2000-06-30")).days / 365.25
+    assert a["contract_years_left"] == 730 / 365.25
+    assert a["from_squad_size"] == 25 and a["to_squad_size"] == 30
+    assert a["minutes_365"] == 135 and a["games_365"] == 2 and a["goals_365"] == 1
+    assert a["cards_per90"] == 1 / (135 / 90)
+    assert a["position_Midfield"] == 1 and a["sub_position_Central Midfield"] == 1 and a["foot_left"] == 1
+    assert a["log_market_value_in_eur"] == np.float32(np.log1p(5_000_000.0))
+    assert a["transfer_year"] == 2024
+
+    b = feats.iloc[1]
+    assert b["to_squad_size"] == b["from_squad_size"] == 30       # stays at current club
+    assert b["contract_years_left"] == 0                          # missing -> 0, as fillna(0)
+    assert b[["position_Defender", "position_Goalkeeper", "position_Midfield"]].sum() == 0  # Attack was dropped
+    assert b[["foot_both", "foot_left", "foot_right"]].sum() == 0
+
+    assert (feats.iloc[2].drop("transfer_year") == 0).all()
+    print("✓ Feature rows match the notebook definitions")
+
+
+def test_predictions_and_batching():
+    """Booster output matches a direct predict; concurrent submits share batches."""
+    players, clubs, apps = _tables()
+    rng = np.random.default_rng(0)
+    X = rng.random((200, len(FEATURE_COLUMNS))).astype("float32")
+    booster = xgb.train({"max_depth": 2}, xgb.DMatrix(X, label=rng.random(200) * 15), num_boost_round=5)
+    predictor = TransferFeePredictor(players, clubs, apps, booster=booster)
+
+    direct = booster.predict(xgb.DMatrix(predictor.feature_matrix([10, 20], reference_date="2024-06-30")))
+    results = predictor.predict([10, 20], reference_date="2024-06-30")
+    assert np.allclose([r["pred_log_transfer_fee"] for r in results], direct)
+    assert np.allclose(results[0]["pred_transfer_fee"], np.expm1(direct[0]), rtol=1e-6)
+
+    calls = []
+
+    def predict_batch(items):
+        calls.append(len(items))
+        return predictor.predict(items, reference_date="2024-06-30")
+
+    async def burst():
+        batcher = MicroBatcher(predict_batch, max_batch_size=64, max_wait_ms=20)
+        out = await asyncio.gather(*[batcher.submit(pid) for pid in [10, 20] * 50])
+        await batcher.close()
+        return out
+
+    out = asyncio.run(burst())
+    assert [r["player_id"] for r in out] == [10, 20] * 50
+    assert sum(calls) == 100 and len(calls) < 100
+    print(f"✓ 100 requests served in {len(calls)} batches")
+
+
+def test_batch_route_predicts_off_the_event_loop():
+    """POST /api/predictions/transfer-fee runs the model in a worker thread."""
+    from src.api.routes import predictions
+
+    players, clubs, apps = _tables()
+    rng = np.random.default_rng(0)
+    X = rng.random((200, len(FEATURE_COLUMNS))).astype("float32")
+    booster = xgb.train({"max_depth": 2}, xgb.DMatrix(X, label=rng.random(200) * 15), num_boost_round=5)
+    predictor = TransferFeePredictor(players, clubs, apps, booster=booster)
+
+    loops = []
+
+    def predict(*args, **kwargs):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return TransferFeePredictor.predict(predictor, *args, **kwargs)
+
+    predictor.predict = predict
+    app = FastAPI()
+    app.include_router(predictions.router)
+    original, predictions._predictor = predictions._predictor, predictor
+    try:
+        with TestClient(app) as client:
+            response = client.post("/api/predictions/transfer-fee", json={"player_ids": [10, 99, 20]})
+    finally:
+        predictions._predictor = original
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["player_id"] for r in body["predictions"]] == [10, 20] and body["not_found"] == [99]
+    assert loops == [None]
+    print("✓ Batch predictions run outside the event loop")
+
+
+if __name__ == "__main__":
+    test_feature_rows()
+    test_predictions_and_batching()
+    test_batch_route_predicts_off_the_event_loop()
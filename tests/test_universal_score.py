@@ -0,0 +1,134 @@
+"""Test the universal score series against the dual.ipynb computation."""
+
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.models.universal_score import (
+    OUTPUT_NAME, attach_valuations, build_universal_scores, read_player_series, write_universal_scores,
+)
+
+
+def _tables(seed=0):
+    """Small players, games, appearances and valuations frames (every game is in games.csv)."""
+    rng = np.random.default_rng(seed)
+    players = pd.DataFrame({
+        "player_id": [1, 2, 3, 4],
+        "name": ["Ann", "Ben", "Cid", "Dan"],
+        "position": ["Attack", "Midfield", "Defender", "Goalkeeper"],
+    })
+    games = pd.DataFrame({
+        "game_id": np.arange(100, 112),
+        "date": pd.date_range("2024-01-06", periods=12, freq="7D").strftime("%Y-%m-%d"),
+        "home_club_id": 10, "away_club_id": 11,
+        "home_club_goals": rng.integers(0, 4, 12), "away_club_goals": rng.integers(0, 4, 12),
+    })
+    apps = games[["game_id"]].merge(players[["player_id"]], how="cross")
+    apps["player_club_id"] = 10
+    apps["goals"] = rng.poisson(0.4, len(apps))
+    apps["assists"] = rng.poisson(0.3, len(apps))
+    apps["yellow_cards"] = rng.binomial(1, 0.15, len(apps))
+    apps["red_cards"] = rng.binomial(1, 0.03, len(apps))
+    apps["minutes_played"] = rng.integers(0, 91, len(apps))
+    # Player 4 is only valued from March on; player 3 never
+    vals = pd.DataFrame({
+        "player_id": [1, 1, 2, 2, 4],
+        "date": ["2023-12-01", "2024-02-10", "2024-01-01", "2024-03-01", "2024-03-01"],
+        "market_value_in_eur": [1e6, 2e6, 5e5, 7e5, 3e6],
+    })
+    return players, games, apps, vals
+
+
+def _dual_notebook(players, games, apps, vals):
+    """The score, scaling and per-player as-of join exactly as written in dual.ipynb."""
+    apps = apps.copy()
+    games = games.assign(date=pd.to_datetime(games["date"]))
+    vals = vals.assign(date=pd.to_datetime(vals["date"]))
+    mp = apps["minutes_played"].clip(lower=1)
+    raw_score = (4.0 * apps["goals"] * 90.0 / mp + 3.0 * apps["assists"] * 90.0 / mp
+                 - (apps["yellow_cards"] + 3 * apps["red_cards"]) * 90.0 / mp)
+    apps["universal_score"] = raw_score * (apps["minutes_played"] / 30.0).clip(upper=1.0)
+    s = apps["universal_score"]
+    apps["universal_score_100"] = (s - s.min()) / (s.max() - s.min()) * 100.0
+    apps = apps.merge(games[["game_id", "date"]], on="game_id", how="left")
+
+    merged = []
+    for pid, apps_p in apps.sort_values(["player_id", "date"]).groupby("player_id"):
+        vals_p = vals[vals["player_id"] == pid].sort_values("date")
+        if len(vals_p):
+            merged.append(pd.merge_asof(apps_p.sort_values("date"), vals_p[["date", "market_value_in_eur"]],
+                                        on="date", direction="backward"))
+    merged = pd.concat(merged, ignore_index=True).dropna(subset=["market_value_in_eur"])
+    merged = merged.merge(players[["player_id", "name"]], on="player_id", how="left")
+    return merged.rename(columns={"date": "time", "market_value_in_eur": "market_value", "name": "player_name"})
+
+
+def test_universal_mode_matches_dual_notebook():
+    """mode="universal" gives the notebook's score, 0-100 scaling and valuations."""
+    players, games, apps, vals = _tables()
+    expected = _dual_notebook(players, games, apps, vals).sort_values(["player_id", "time"]).reset_index(drop=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, frame in (("players", players), ("games", games), ("appearances", apps),
+                            ("player_valuations", vals)):
+            frame.to_csv(f"{tmp}/{name}.csv", index=False)
+        series, meta = build_universal_scores(tmp, mode="universal", chunksize=10)
+
+    assert meta["profiles_mode"] == "universal" and list(meta["bounds"]) == ["universal"]
+    assert meta["appearances_read"] == len(apps) and meta["rows"] == len(expected)
+    assert (series["profile"] == "universal").all()
+    for col in ("player_id", "game_id", "time", "player_name"):
+        assert series[col].tolist() == expected[col].tolist(), col
+    for col in ("universal_score", "universal_score_100", "market_value"):
+        assert np.allclose(series[col], expected[col]), col
+    assert series["universal_score_100"].min() >= 0 and series["universal_score_100"].max() <= 100
+    print("✓ Universal mode reproduces the dual.ipynb series")
+
+
+def test_asof_join_drops_games_before_first_valuation():
+    """Each game gets the latest valuation on or before it; earlier games and unvalued players are dropped."""
+    apps = pd.DataFrame({
+        "player_id": [1, 1, 1, 2, 2, 3],
+        "game_id": [10, 11, 12, 10, 11, 10],
+        "date": pd.to_datetime(["2024-01-01", "2024-02-01", "2024-03-01", "2024-01-01", "2024-02-01", "2024-01-01"]),
+    })
+    vals = pd.DataFrame({
+        "player_id": [1, 2, 2],
+        "date": pd.to_datetime(["2024-02-01", "2023-06-01", "2024-01-15"]),
+        "market_value_in_eur": [5e6, 1e6, 2e6],
+    })
+    merged = attach_valuations(apps, vals.sort_values("date")).sort_values(["player_id", "game_id"])
+
+    assert list(zip(merged["player_id"], merged["game_id"], merged["market_value"])) == [
+        (1, 11, 5e6), (1, 12, 5e6), (2, 10, 1e6), (2, 11, 2e6),
+    ]
+    print("✓ As-of join keeps only games on or after a player's first valuation")
+
+
+def test_written_series_round_trips():
+    """read_player_series returns exactly one player's rows as written."""
+    players, games, apps, vals = _tables(seed=1)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, frame in (("players", players), ("games", games), ("appearances", apps),
+                            ("player_valuations", vals)):
+            frame.to_csv(f"{tmp}/{name}.csv", index=False)
+        series, meta = build_universal_scores(tmp)
+
+        path = write_universal_scores(series, meta, Path(tmp) / "out")
+        assert path == Path(tmp) / "out" / f"{OUTPUT_NAME}.parquet"
+        assert json.loads((path.parent / f"{OUTPUT_NAME}.meta.json").read_text(encoding="utf-8")) == meta
+
+        for pid in (1, 2, 4):
+            expected = series[series["player_id"] == pid].reset_index(drop=True)
+            pd.testing.assert_frame_equal(read_player_series(path, pid), expected, check_categorical=False)
+        assert read_player_series(path, 3).empty
+    print("✓ Written series read back per player")
+
+
+if __name__ == "__main__":
+    test_universal_mode_matches_dual_notebook()
+    test_asof_join_drops_games_before_first_valuation()
+    test_written_series_round_trips()